@@ -0,0 +1,229 @@
+# benchmarks/bench_sistema.py
+"""
+Benchmarks de fan-out e ingestão do SistemaDeMensagens.
+
+Roda uma grade de cenários (observadores x mensagens x tamanho do
+conteúdo x tipo de observador) e mede vazão, latência por mensagem
+(p50/p95/p99/max) e pico de memória. Execute a partir da raiz do repo:
+
+    python -m benchmarks.bench_sistema --rapido
+    python -m benchmarks.bench_sistema --salvar base.json
+    python -m benchmarks.bench_sistema --comparar base.json --tolerancia 0.15
+
+No modo --comparar o processo termina com código 1 se algum cenário
+regrediu além da tolerância.
+"""
+
+import argparse
+import datetime
+import gc
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    Observer,
+    SistemaDeMensagens,
+    DespachanteSincrono,
+    DespachanteThreadPool,
+    ArmazenamentoEmMemoria
+)
+
+class ObservadorVazio(Observer):
+    """Custo mínimo: mede só o overhead do sistema."""
+    def update(self, mensagem) -> None:
+        pass
+
+class ObservadorCPU(Observer):
+    """Simula renderização de template (trabalho de CPU por mensagem)."""
+    def update(self, mensagem) -> None:
+        texto = f"Nova mensagem de {mensagem.remetente}: {mensagem.conteudo}"
+        sum(ord(c) for c in texto[:256])
+
+class ObservadorIO(Observer):
+    """Simula uma chamada de rede curta."""
+    ATRASO = 0.00005
+
+    def update(self, mensagem) -> None:
+        time.sleep(self.ATRASO)
+
+TIPOS = {
+    'vazio': ObservadorVazio,
+    'cpu': ObservadorCPU,
+    'io': ObservadorIO,
+}
+
+DESPACHANTES = {
+    'sincrono': DespachanteSincrono,
+    'threadpool': DespachanteThreadPool,
+}
+
+@dataclass
+class Cenario:
+    observadores: int
+    mensagens: int
+    tamanho: int
+    tipo: str
+    despachante: str = 'sincrono'
+
+    @property
+    def nome(self) -> str:
+        return (f"obs={self.observadores},msgs={self.mensagens},"
+                f"tamanho={self.tamanho},tipo={self.tipo},despachante={self.despachante}")
+
+def percentil(ordenados: List[float], p: float) -> float:
+    if not ordenados:
+        return 0.0
+    indice = min(len(ordenados) - 1, max(0, int(round(p / 100 * len(ordenados))) - 1))
+    return ordenados[indice]
+
+def _montar(cenario: Cenario):
+    sistema = SistemaDeMensagens(
+        despachante=DESPACHANTES[cenario.despachante](),
+        armazenamento=ArmazenamentoEmMemoria(max_mensagens=max(cenario.mensagens, 1)))
+    # O sistema guarda referências fracas: a lista mantém os observadores vivos
+    observadores = [TIPOS[cenario.tipo]() for _ in range(cenario.observadores)]
+    for observer in observadores:
+        sistema.attach(observer)
+    return sistema, observadores
+
+def executar(cenario: Cenario, medir_memoria: bool = True) -> dict:
+    """Executa um cenário e devolve as medidas (tempos em microssegundos)."""
+    conteudo = "x" * cenario.tamanho
+    destinatarios = [f"usuario{i}" for i in range(64)]
+
+    sistema, observadores = _montar(cenario)
+    latencias = []
+    gc.collect()
+    inicio = time.perf_counter()
+    for i in range(cenario.mensagens):
+        t0 = time.perf_counter()
+        sistema.novaMensagem("remetente", destinatarios[i % 64], conteudo)
+        latencias.append(time.perf_counter() - t0)
+    sistema.flush()
+    duracao = time.perf_counter() - inicio
+    sistema.close()
+    del observadores
+
+    latencias.sort()
+    resultado = {
+        'vazao_msgs_s': cenario.mensagens / duracao if duracao > 0 else 0.0,
+        'latencia_us': {
+            'p50': percentil(latencias, 50) * 1e6,
+            'p95': percentil(latencias, 95) * 1e6,
+            'p99': percentil(latencias, 99) * 1e6,
+            'max': latencias[-1] * 1e6 if latencias else 0.0,
+        },
+    }
+
+    if medir_memoria:
+        # Passada separada: o tracemalloc distorceria a vazão
+        sistema, observadores = _montar(cenario)
+        gc.collect()
+        tracemalloc.start()
+        for i in range(cenario.mensagens):
+            sistema.novaMensagem("remetente", destinatarios[i % 64], conteudo)
+        sistema.flush()
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        sistema.close()
+        resultado['pico_memoria_kb'] = pico / 1024
+
+    return resultado
+
+def grade(observadores: List[int], mensagens: List[int], tamanhos: List[int],
+          tipos: List[str], despachantes: List[str]) -> List[Cenario]:
+    return [Cenario(*valores) for valores in
+            itertools.product(observadores, mensagens, tamanhos, tipos, despachantes)]
+
+def comparar(base: dict, atual: dict, tolerancia: float = 0.10) -> List[str]:
+    """
+    Compara dois resultados (no formato salvo por --salvar) e devolve uma
+    descrição de cada regressão acima de 'tolerancia' (fração, ex: 0.10):
+    queda de vazão ou aumento de p99 ou de pico de memória.
+    """
+    regressoes = []
+    for nome, medidas in atual['cenarios'].items():
+        anterior = base['cenarios'].get(nome)
+        if anterior is None:
+            continue
+        checagens = [
+            ('vazao_msgs_s', anterior['vazao_msgs_s'], medidas['vazao_msgs_s'], False),
+            ('latencia p99', anterior['latencia_us']['p99'], medidas['latencia_us']['p99'], True),
+        ]
+        if 'pico_memoria_kb' in anterior and 'pico_memoria_kb' in medidas:
+            checagens.append(('pico_memoria_kb', anterior['pico_memoria_kb'],
+                              medidas['pico_memoria_kb'], True))
+        for metrica, antes, depois, maior_e_pior in checagens:
+            if antes <= 0:
+                continue
+            variacao = (depois - antes) / antes
+            if (variacao > tolerancia) if maior_e_pior else (variacao < -tolerancia):
+                regressoes.append(f"{nome}: {metrica} {antes:.1f} -> {depois:.1f} ({variacao:+.1%})")
+    return regressoes
+
+def _lista(tipo):
+    return lambda texto: [tipo(v) for v in texto.split(',') if v]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--observadores', type=_lista(int), default=[1, 10, 50])
+    parser.add_argument('--mensagens', type=_lista(int), default=[2000])
+    parser.add_argument('--tamanhos', type=_lista(int), default=[32, 1024])
+    parser.add_argument('--tipos', type=_lista(str), default=list(TIPOS))
+    parser.add_argument('--despachantes', type=_lista(str), default=['sincrono'])
+    parser.add_argument('--rapido', action='store_true',
+                        help="grade reduzida para uma checagem rápida")
+    parser.add_argument('--sem-memoria', action='store_true',
+                        help="não mede o pico de memória (metade do tempo)")
+    parser.add_argument('--salvar', metavar='ARQUIVO', help="salva o resultado em JSON")
+    parser.add_argument('--comparar', metavar='ARQUIVO', help="compara com um JSON salvo")
+    parser.add_argument('--tolerancia', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    if args.rapido:
+        args.observadores, args.mensagens, args.tamanhos = [1, 10], [500], [32]
+
+    cenarios = grade(args.observadores, args.mensagens, args.tamanhos,
+                     args.tipos, args.despachantes)
+    resultado: Dict[str, dict] = {
+        'meta': {
+            'python': sys.version.split()[0],
+            'plataforma': platform.platform(),
+            'data': datetime.datetime.now().isoformat(timespec='seconds'),
+        },
+        'cenarios': {},
+    }
+    for cenario in cenarios:
+        medidas = executar(cenario, medir_memoria=not args.sem_memoria)
+        resultado['cenarios'][cenario.nome] = medidas
+        memoria = (f"  pico {medidas['pico_memoria_kb']:9.1f} KB"
+                   if 'pico_memoria_kb' in medidas else "")
+        print(f"{cenario.nome:<70} {medidas['vazao_msgs_s']:>11.0f} msg/s"
+              f"  p50 {medidas['latencia_us']['p50']:8.1f}us"
+              f"  p99 {medidas['latencia_us']['p99']:8.1f}us{memoria}")
+
+    if args.salvar:
+        with open(args.salvar, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, indent=2)
+        print(f"Resultado salvo em {args.salvar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            base = json.load(arquivo)
+        regressoes = comparar(base, resultado, args.tolerancia)
+        if regressoes:
+            print(f"\n{len(regressoes)} regressão(ões) acima de {args.tolerancia:.0%}:")
+            for linha in regressoes:
+                print(f"  REGRESSÃO {linha}")
+            return 1
+        print(f"\nNenhuma regressão acima de {args.tolerancia:.0%}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 # main.py
 
+import logging
+
 # Como este script está fora da pasta 'src', importamos
 # as classes do pacote 'src.correio_digital'
 from src.Comportamentais.correio_digital_observer.correio_digital import (
@@ -11,6 +13,10 @@ from src.Comportamentais.correio_digital_observer.correio_digital import (
 
 if __name__ == "__main__":
     
+    # O sistema e os notificadores usam logging; em DEBUG a simulação
+    # mostra também as mensagens internas do Subject.
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
     print("="*50)
     print("Iniciando Simulação do Correio Digital...")
     print("="*50)
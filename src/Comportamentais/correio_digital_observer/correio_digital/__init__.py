@@ -1,16 +1,68 @@
 # src/correio_digital/__init__.py
 
-from .models import Mensagem
-from .observer_pattern import Observer, Subject
+from .models import Mensagem, MensagemCompacta
+from .armazenamento import ArmazenamentoDeMensagens, ArmazenamentoEmMemoria
+from .log_segmentado import ArmazenamentoEmDisco
+from .serializacao import RegistroCorrompidoError
+from .instantaneo import Instantaneos
+from .observer_pattern import Observer, AsyncObserver, Subject, Prioridade
 from .sistema import SistemaDeMensagens
-from .notificadores import NotificadorWeb, NotificadorEmail, NotificadorMobile
+from .indices import ResultadoBusca
+from .consumo import LoteDeConsumo
+from .sistema_async import SistemaDeMensagensAsync
+from .despacho import (
+    Despachante,
+    DespachanteSincrono,
+    DespachanteThreadPool,
+    PoliticaBackpressure,
+    FilaCheiaError
+)
+from .agendamento import DespachantePrioritario
+from .resiliencia import DespachanteResiliente, MensagensMortas, EntregaFalha
+from .temporizador import Temporizador, temporizador_padrao
+from .agrupamento import ObservadorAgrupado
+from .limitacao import BaldeDeTokens, ObservadorLimitado
+from .particionamento import SistemaParticionado
+from .barramento import PublicadorDoBarramento, ConsumidorDoBarramento
+from .renderizacao import Modelo
+from .notificadores import NotificadorComModelo, NotificadorWeb, NotificadorEmail, NotificadorMobile
 
 # Expondo as classes principais do pacote
 __all__ = [
     'Mensagem',
+    'MensagemCompacta',
+    'ArmazenamentoDeMensagens',
+    'ArmazenamentoEmMemoria',
+    'ArmazenamentoEmDisco',
+    'RegistroCorrompidoError',
+    'Instantaneos',
     'Observer',
+    'AsyncObserver',
     'Subject',
+    'Prioridade',
     'SistemaDeMensagens',
+    'ResultadoBusca',
+    'LoteDeConsumo',
+    'SistemaDeMensagensAsync',
+    'Despachante',
+    'DespachanteSincrono',
+    'DespachanteThreadPool',
+    'PoliticaBackpressure',
+    'FilaCheiaError',
+    'DespachantePrioritario',
+    'DespachanteResiliente',
+    'MensagensMortas',
+    'EntregaFalha',
+    'Temporizador',
+    'temporizador_padrao',
+    'ObservadorAgrupado',
+    'BaldeDeTokens',
+    'ObservadorLimitado',
+    'SistemaParticionado',
+    'PublicadorDoBarramento',
+    'ConsumidorDoBarramento',
+    'Modelo',
+    'NotificadorComModelo',
     'NotificadorWeb',
     'NotificadorEmail',
     'NotificadorMobile'
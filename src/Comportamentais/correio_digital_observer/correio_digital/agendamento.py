@@ -0,0 +1,150 @@
+# src/correio_digital/agendamento.py
+
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from .models import Mensagem
+from .observer_pattern import Observer
+from .despacho import Despachante
+
+logger = logging.getLogger(__name__)
+
+class _Tarefa:
+    """Entrega de um lote a um observador, com o instante limite (monotonic)."""
+    __slots__ = ('observer', 'mensagens', 'em_lote', 'limite')
+
+    def __init__(self, observer: Observer, mensagens: List[Mensagem],
+                 em_lote: bool, limite: float):
+        self.observer = observer
+        self.mensagens = mensagens
+        self.em_lote = em_lote
+        self.limite = limite
+
+# (prioridade, limite, sequência, tarefa)
+_Entrada = Tuple[int, float, int, _Tarefa]
+
+class DespachantePrioritario(Despachante):
+    """
+    Despachante que entrega primeiro os canais mais urgentes.
+
+    Cada observador declara 'prioridade' (ver Prioridade) e 'prazo' em
+    segundos. As entregas entram em um heap ordenado por prioridade e,
+    dentro da mesma prioridade, pelo prazo mais próximo; 'max_workers'
+    threads consomem o heap. Assim um push mobile não espera atrás da
+    fila de e-mails, só (no pior caso) da entrega que já está em curso.
+
+    Entregas retiradas do heap depois do prazo são descartadas e contadas
+    em 'expiradas', em vez de chegarem atrasadas. O prazo conta a partir
+    do momento em que a mensagem foi despachada.
+
+    Um observador nunca recebe duas entregas ao mesmo tempo e a ordem
+    das suas mensagens é preservada.
+    """
+    def __init__(self, max_workers: int = 2):
+        """
+        Args:
+            max_workers: Número de threads que consomem o heap
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers deve ser maior que zero")
+        self._heap: List[_Entrada] = []
+        self._sequencia = itertools.count()
+        # Observadores em entrega -> entradas deles que esperam a vez
+        self._ocupados: Dict[int, Deque[_Entrada]] = {}
+        self._expiradas = 0
+        self._cond = threading.Condition()
+        self._fechado = False
+        self._threads = [
+            threading.Thread(target=self._executar, name=f"prioritario-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def despachar(self, observers: Iterable[Observer], mensagem: Mensagem) -> None:
+        self._agendar(observers, [mensagem], em_lote=False)
+
+    def despachar_lote(self, observers: Iterable[Observer], mensagens: List[Mensagem]) -> None:
+        self._agendar(observers, mensagens, em_lote=True)
+
+    def _agendar(self, observers: Iterable[Observer], mensagens: List[Mensagem],
+                 em_lote: bool) -> None:
+        agora = time.monotonic()
+        with self._cond:
+            if self._fechado:
+                raise RuntimeError("Despachante já foi fechado")
+            for observer in observers:
+                limite = agora + observer.prazo if observer.prazo is not None else math.inf
+                tarefa = _Tarefa(observer, mensagens, em_lote, limite)
+                heapq.heappush(self._heap, (int(observer.prioridade), limite,
+                                            next(self._sequencia), tarefa))
+            self._cond.notify_all()
+
+    def _proxima(self) -> Optional[_Tarefa]:
+        """
+        Retira a próxima tarefa entregável, descartando as expiradas.
+        Retorna None quando o despachante foi fechado e o heap esvaziou.
+        Requer self._cond.
+        """
+        while True:
+            while not self._heap:
+                if self._fechado:
+                    return None
+                self._cond.wait()
+            entrada = heapq.heappop(self._heap)
+            tarefa = entrada[3]
+            if tarefa.limite < time.monotonic():
+                self._expiradas += 1
+                logger.debug("[Despachante] Entrega para %s expirou e foi descartada",
+                             tarefa.observer.__class__.__name__)
+                self._cond.notify_all()
+                continue
+            adiadas = self._ocupados.get(id(tarefa.observer))
+            if adiadas is not None:
+                adiadas.append(entrada)
+                continue
+            self._ocupados[id(tarefa.observer)] = deque()
+            return tarefa
+
+    def _executar(self) -> None:
+        while True:
+            with self._cond:
+                tarefa = self._proxima()
+            if tarefa is None:
+                return
+            self._entregar_isolado(tarefa.observer, tarefa.mensagens, tarefa.em_lote)
+            with self._cond:
+                # Devolve ao heap o que ficou esperando este observador
+                for entrada in self._ocupados.pop(id(tarefa.observer)):
+                    heapq.heappush(self._heap, entrada)
+                self._cond.notify_all()
+
+    def expiradas(self) -> int:
+        """Total de entregas descartadas por terem passado do prazo."""
+        with self._cond:
+            return self._expiradas
+
+    def estatisticas(self) -> dict:
+        with self._cond:
+            return {
+                'pendentes': len(self._heap) + sum(len(a) for a in self._ocupados.values()),
+                'expiradas': self._expiradas,
+            }
+
+    def flush(self) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: not self._heap and not self._ocupados)
+
+    def close(self) -> None:
+        with self._cond:
+            if self._fechado:
+                return
+            self._fechado = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
@@ -0,0 +1,112 @@
+# src/correio_digital/agrupamento.py
+
+import threading
+from typing import Dict, List, Optional
+from .models import Mensagem
+from .observer_pattern import Observer
+from .temporizador import Agendamento, Temporizador, temporizador_padrao
+
+def resumir(mensagens: List[Mensagem]) -> Mensagem:
+    """
+    Junta várias mensagens para o mesmo destinatário em uma única
+    mensagem de resumo, ex: "3 novas mensagens de alice".
+    """
+    ultima = mensagens[-1]
+    remetentes = list(dict.fromkeys(m.remetente for m in mensagens))
+    if len(remetentes) == 1:
+        origem = remetentes[0]
+    elif len(remetentes) == 2:
+        origem = f"{remetentes[0]} e {remetentes[1]}"
+    else:
+        origem = f"{remetentes[0]}, {remetentes[1]} e mais {len(remetentes) - 2}"
+
+    return Mensagem(
+        remetente=ultima.remetente,
+        destinatario=ultima.destinatario,
+        conteudo=f"{len(mensagens)} novas mensagens de {origem}",
+        timestamp=ultima.timestamp
+    )
+
+class ObservadorAgrupado(Observer):
+    """
+    Decorator de um Observer que agrupa rajadas de mensagens.
+
+    A primeira mensagem para um destinatário abre uma janela de 'janela'
+    segundos; as que chegarem nesse intervalo ficam acumuladas e, ao fim
+    da janela, o observador decorado recebe um único update: a própria
+    mensagem, se só chegou uma, ou um resumo (ver resumir()).
+
+    As janelas de todos os destinatários são disparadas por um único
+    Temporizador (heap + uma thread), não por uma thread por chave; por
+    padrão é o temporizador_padrao(), compartilhado por todos os decorators.
+    Como o SistemaDeMensagens guarda apenas referências fracas, quem cria
+    o ObservadorAgrupado precisa mantê-lo vivo.
+    """
+    def __init__(self, observer: Observer, janela: float = 2.0,
+                 temporizador: Optional[Temporizador] = None):
+        """
+        Args:
+            observer: Observador que receberá as atualizações agrupadas
+            janela: Duração da janela de agrupamento em segundos
+            temporizador: Temporizador a usar (padrão: temporizador_padrao());
+                quem o passa é responsável por fechá-lo
+        """
+        self._observer = observer
+        self._janela = janela
+        self._temporizador = temporizador or temporizador_padrao()
+        self._pendentes: Dict[str, List[Mensagem]] = {}
+        self._agendamentos: Dict[str, Agendamento] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def observer(self) -> Observer:
+        return self._observer
+
+    @property
+    def prioridade(self):
+        return self._observer.prioridade
+
+    @property
+    def prazo(self):
+        return self._observer.prazo
+
+    def preparar(self) -> None:
+        self._observer.preparar()
+
+    def update(self, mensagem: Mensagem) -> None:
+        destinatario = mensagem.destinatario
+        with self._lock:
+            fila = self._pendentes.get(destinatario)
+            if fila is not None:
+                fila.append(mensagem)
+                return
+            fila = self._pendentes[destinatario] = [mensagem]
+            # O callback identifica a janela pela lista: se ela já foi
+            # emitida (flush), ele não encurta a próxima janela
+            self._agendamentos[destinatario] = self._temporizador.agendar(
+                self._janela, lambda: self._emitir(destinatario, fila))
+
+    def _emitir(self, destinatario: str, fila: Optional[List[Mensagem]] = None) -> None:
+        with self._lock:
+            mensagens = self._pendentes.get(destinatario)
+            if not mensagens or (fila is not None and mensagens is not fila):
+                return
+            del self._pendentes[destinatario]
+            agendamento = self._agendamentos.pop(destinatario, None)
+            if agendamento is not None:
+                agendamento.cancelar()
+        if len(mensagens) == 1:
+            self._observer.update(mensagens[0])
+        else:
+            self._observer.update(resumir(mensagens))
+
+    def flush(self) -> None:
+        """Emite imediatamente todas as janelas abertas."""
+        with self._lock:
+            destinatarios = list(self._pendentes)
+        for destinatario in destinatarios:
+            self._emitir(destinatario)
+
+    def close(self) -> None:
+        """Emite o que estiver pendente (o temporizador é compartilhado e continua)."""
+        self.flush()
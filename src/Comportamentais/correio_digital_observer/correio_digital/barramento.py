@@ -0,0 +1,264 @@
+# src/correio_digital/barramento.py
+
+import logging
+import multiprocessing
+import struct
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import List, Optional
+from .models import Mensagem, MensagemCompacta
+from .observer_pattern import Observer
+from .serializacao import CABECALHO, RegistroCorrompidoError, codificar, decodificar, validar
+
+logger = logging.getLogger(__name__)
+
+# Layout da memória compartilhada:
+#
+#   [0, 64)   cabeçalho: assinatura | capacidade | bytes escritos | registros
+#             escritos | bytes reservados
+#   [64, ...) dados: buffer circular de 'capacidade' bytes com registros no
+#             formato de serializacao.py
+#
+# 'bytes escritos' é uma posição lógica que só cresce; a posição física é
+# escritos % capacidade. Um registro nunca é partido no fim do buffer: o
+# publicador marca o resto com PREENCHIMENTO (ou deixa menos de um
+# cabeçalho livre) e volta para o início.
+#
+# 'bytes reservados' é atualizado antes de cada escrita e 'bytes escritos'
+# depois: o consumidor lê os dados em [cursor, escritos) e, depois de
+# copiar, confere em 'reservados' se o publicador não alcançou a região.
+_ESTADO = struct.Struct('<8sQQQQ')
+_RESERVADOS = struct.Struct('<Q')
+_POSICAO_RESERVADOS = 32
+_ASSINATURA = b'CDBUS001'
+_DADOS = 64
+PREENCHIMENTO = 0xFFFFFFFF
+
+# Segmentos criados por este processo
+_criados = set()
+
+def _abrir(nome: str) -> shared_memory.SharedMemory:
+    """Abre um segmento existente sem que este processo passe a ser dono dele."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nome, track=False)
+    memoria = shared_memory.SharedMemory(name=nome)
+    if nome not in _criados and multiprocessing.parent_process() is None:
+        # Antes do 3.13 o resource_tracker de um processo independente
+        # apagaria o segmento quando o consumidor terminasse; só o publicador
+        # deve fazê-lo. Processos filhos (fork ou spawn) compartilham o
+        # resource_tracker do pai e não precisam disso.
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(memoria._name, 'shared_memory')
+    return memoria
+
+class PublicadorDoBarramento(Observer):
+    """
+    Observer que publica as mensagens em um buffer circular de memória
+    compartilhada, para que notificadores rodem em outros processos.
+
+    Há um único publicador; cada consumidor (ConsumidorDoBarramento) lê
+    o mesmo buffer com o seu próprio cursor, então a mensagem é
+    serializada uma vez só, não uma vez por consumidor. O publicador não
+    espera os consumidores: quem ficar mais de 'capacidade' bytes para trás
+    perde as mensagens sobrescritas (e isso é contado em 'perdidas').
+
+    A posição de escrita é publicada depois dos bytes do registro, então
+    o consumidor nunca vê um registro pela metade; o CRC de cada registro
+    é conferido na leitura mesmo assim.
+    """
+    def __init__(self, capacidade: int = 16 * 1024 * 1024, nome: Optional[str] = None):
+        """
+        Args:
+            capacidade: Tamanho do buffer circular em bytes
+            nome: Nome do segmento de memória (gerado se omitido)
+        """
+        self._memoria = shared_memory.SharedMemory(name=nome, create=True,
+                                                   size=_DADOS + capacidade)
+        _criados.add(self._memoria.name)
+        self._buffer = self._memoria.buf
+        self._capacidade = capacidade
+        self._escritos = 0
+        self._registros = 0
+        self._lock = threading.Lock()
+        self._publicar()
+
+    @property
+    def nome(self) -> str:
+        """Nome do segmento, a ser passado para os consumidores."""
+        return self._memoria.name
+
+    def _publicar(self) -> None:
+        _ESTADO.pack_into(self._buffer, 0, _ASSINATURA, self._capacidade,
+                          self._escritos, self._registros, self._escritos)
+
+    def _escrever(self, registro: bytes) -> None:
+        """Copia o registro para o buffer (sem publicar). Requer self._lock."""
+        tamanho = len(registro)
+        if tamanho > self._capacidade:
+            raise ValueError(f"Registro de {tamanho} bytes não cabe no barramento")
+        posicao = self._escritos % self._capacidade
+        resto = self._capacidade - posicao
+        fim = self._escritos + (resto if resto < tamanho else 0) + tamanho
+        _RESERVADOS.pack_into(self._buffer, _POSICAO_RESERVADOS, fim)
+        if resto < tamanho:
+            if resto >= CABECALHO.size:
+                CABECALHO.pack_into(self._buffer, _DADOS + posicao, PREENCHIMENTO, 0)
+            self._escritos += resto
+            posicao = 0
+        self._buffer[_DADOS + posicao:_DADOS + posicao + tamanho] = registro
+        self._escritos += tamanho
+        self._registros += 1
+
+    def update(self, mensagem: Mensagem) -> None:
+        registro = codificar(MensagemCompacta.de_mensagem(mensagem))
+        with self._lock:
+            self._escrever(registro)
+            self._publicar()
+
+    def update_batch(self, mensagens: List[Mensagem]) -> None:
+        """Escreve o lote inteiro e publica a nova posição uma única vez."""
+        registros = [codificar(MensagemCompacta.de_mensagem(m)) for m in mensagens]
+        with self._lock:
+            for registro in registros:
+                self._escrever(registro)
+            self._publicar()
+
+    def close(self) -> None:
+        """Libera e remove o segmento; consumidores abertos param de receber."""
+        self._buffer = None
+        self._memoria.close()
+        self._memoria.unlink()
+        _criados.discard(self._memoria.name)
+
+class ConsumidorDoBarramento:
+    """
+    Lê as mensagens publicadas por um PublicadorDoBarramento, normalmente
+    em outro processo. Cada consumidor tem o próprio cursor; por padrão
+    começa no ponto atual do barramento (só mensagens novas).
+    """
+    def __init__(self, nome: str, do_inicio: bool = False):
+        """
+        Args:
+            nome: Nome do segmento (PublicadorDoBarramento.nome)
+            do_inicio: Começa da primeira mensagem publicada, se o buffer
+                ainda não deu a volta
+        """
+        self._memoria = _abrir(nome)
+        self._buffer = self._memoria.buf
+        assinatura, self._capacidade, escritos, registros, _ = _ESTADO.unpack_from(self._buffer, 0)
+        if assinatura != _ASSINATURA:
+            self._memoria.close()
+            raise ValueError(f"'{nome}' não é um barramento do correio digital")
+        if do_inicio and escritos <= self._capacidade:
+            self._cursor, self._sequencia = 0, 0
+        else:
+            # Sem um índice não dá para achar o início de um registro no meio
+            # de um buffer que já deu a volta: começa do ponto atual.
+            self._cursor, self._sequencia = escritos, registros
+        self._perdidas = 0
+        self._corrompidas = 0
+
+    @property
+    def perdidas(self) -> int:
+        """Mensagens sobrescritas antes que este consumidor as lesse."""
+        return self._perdidas
+
+    @property
+    def corrompidas(self) -> int:
+        """Cópias que o publicador sobrescreveu no meio da leitura (CRC inválido)."""
+        return self._corrompidas
+
+    def atrasadas(self) -> int:
+        """Mensagens publicadas que este consumidor ainda não leu."""
+        return _ESTADO.unpack_from(self._buffer, 0)[3] - self._sequencia
+
+    def _ultrapassado(self, reservados: int) -> bool:
+        return reservados - self._cursor > self._capacidade
+
+    def _pular_para(self, escritos: int, registros: int) -> None:
+        """O publicador deu a volta sobre o cursor: retoma do ponto atual."""
+        self._perdidas += registros - self._sequencia
+        logger.warning("[Barramento] Consumidor ficou para trás; %d mensagens perdidas",
+                       registros - self._sequencia)
+        self._cursor = escritos
+        self._sequencia = registros
+
+    def ler(self, max_itens: int = 1000) -> List[Mensagem]:
+        """Devolve até 'max_itens' mensagens novas, sem bloquear."""
+        _, _, escritos, registros, reservados = _ESTADO.unpack_from(self._buffer, 0)
+        if self._ultrapassado(reservados):
+            self._pular_para(escritos, registros)
+            return []
+
+        mensagens: List[Mensagem] = []
+        while self._cursor < escritos and len(mensagens) < max_itens:
+            posicao = self._cursor % self._capacidade
+            resto = self._capacidade - posicao
+            if resto < CABECALHO.size:
+                self._cursor += resto
+                continue
+            tamanho, _ = CABECALHO.unpack_from(self._buffer, _DADOS + posicao)
+            if tamanho == PREENCHIMENTO or CABECALHO.size + tamanho > resto:
+                self._cursor += resto
+                continue
+            inicio = _DADOS + posicao
+            dados = bytes(self._buffer[inicio:inicio + CABECALHO.size + tamanho])
+
+            # A cópia só vale se o publicador não sobrescreveu a região enquanto copiávamos
+            _, _, agora, registros_agora, reservados = _ESTADO.unpack_from(self._buffer, 0)
+            if self._ultrapassado(reservados):
+                self._pular_para(agora, registros_agora)
+                break
+            try:
+                validar(dados, 0)
+            except RegistroCorrompidoError:
+                # O publicador sobrescreveu a região entre a conferência acima e
+                # o fim da cópia: é o mesmo caso de ter sido ultrapassado
+                self._corrompidas += 1
+                _, _, agora, registros_agora, _ = _ESTADO.unpack_from(self._buffer, 0)
+                self._pular_para(agora, registros_agora)
+                break
+            registro, _ = decodificar(dados, 0)
+            mensagens.append(registro.para_mensagem())
+            self._cursor += len(dados)
+            self._sequencia += 1
+        return mensagens
+
+    def aguardar(self, max_itens: int = 1000, timeout: Optional[float] = None,
+                 intervalo: float = 0.001) -> List[Mensagem]:
+        """
+        Como ler(), mas espera (por polling a cada 'intervalo' segundos)
+        até haver mensagens ou o 'timeout' expirar.
+        """
+        limite = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            mensagens = self.ler(max_itens)
+            if mensagens or (limite is not None and time.monotonic() >= limite):
+                return mensagens
+            time.sleep(intervalo)
+
+    def executar(self, observer: Observer, parar: threading.Event,
+                 max_itens: int = 1000, intervalo: float = 0.001) -> None:
+        """
+        Laço de um processo notificador: entrega ao 'observer' (via
+        update_batch) tudo o que for publicado, até 'parar' ser sinalizado.
+        Uma falha na leitura ou no observador é registrada e o laço continua.
+        """
+        observer.preparar()
+        while not parar.is_set():
+            try:
+                mensagens = self.aguardar(max_itens, timeout=0.1, intervalo=intervalo)
+            except Exception:
+                logger.exception("[Barramento] Falha ao ler o barramento")
+                continue
+            if mensagens:
+                try:
+                    observer.update_batch(mensagens)
+                except Exception:
+                    logger.exception("[Barramento] Falha em %s", observer.__class__.__name__)
+
+    def close(self) -> None:
+        self._buffer = None
+        self._memoria.close()
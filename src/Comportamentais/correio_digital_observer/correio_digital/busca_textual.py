@@ -0,0 +1,272 @@
+# src/correio_digital/busca_textual.py
+
+import heapq
+import math
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+_PALAVRA = re.compile(r"\w+")
+
+# Palavras muito comuns em português que só inflariam as listas invertidas
+PALAVRAS_VAZIAS = frozenset(
+    "a o as os de da do das dos e em no na nos nas um uma uns umas "
+    "para por com que se ao aos é".split()
+)
+
+def normalizar(texto: str) -> str:
+    """Minúsculas e sem acentos: "Atenção" -> "atencao"."""
+    if texto.isascii():
+        return texto.lower()
+    decomposto = unicodedata.normalize('NFKD', texto.casefold())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+def tokenizar(texto: str) -> List[str]:
+    """Termos normalizados do texto, sem palavras vazias."""
+    return [t for t in _PALAVRA.findall(normalizar(texto)) if t not in PALAVRAS_VAZIAS]
+
+def codificar_cursor_textual(pontuacao: float, offset: int) -> str:
+    """Cursor opaco que aponta para depois de (pontuacao, offset) no ranking."""
+    return f"{pontuacao!r}:{offset}"
+
+def decodificar_cursor_textual(cursor: str) -> Tuple[float, int]:
+    try:
+        pontuacao, offset = cursor.rsplit(":", 1)
+        return float(pontuacao), int(offset)
+    except ValueError:
+        raise ValueError(f"Cursor inválido: {cursor!r}") from None
+
+class _ListaInvertida:
+    """Offsets (crescentes) das mensagens que contêm um termo e a frequência nelas."""
+    __slots__ = ('offsets', 'frequencias')
+
+    def __init__(self):
+        self.offsets = array('Q')
+        self.frequencias = array('H')
+
+    def frequencia(self, offset: int) -> int:
+        """Frequência do termo na mensagem 'offset' (0 se não contém). O(log n)."""
+        i = bisect_left(self.offsets, offset)
+        if i < len(self.offsets) and self.offsets[i] == offset:
+            return self.frequencias[i]
+        return 0
+
+class IndiceTextual:
+    """
+    Índice invertido sobre o conteúdo das mensagens.
+
+    Cada termo normalizado aponta para a lista crescente de offsets das
+    mensagens que o contêm. Como os offsets do armazenamento só crescem,
+    indexar é um append por termo. Uma consulta percorre apenas a lista
+    do termo mais raro e confere os demais por busca binária, então o
+    custo depende de quantas mensagens casam, não de quantas existem.
+
+    Também guarda, por offset, o destinatário (como um id inteiro) e, por
+    destinatário, a lista crescente dos offsets da caixa de entrada. Uma
+    busca filtrada percorre a menor entre essa lista e a do termo mais
+    raro, então procurar um termo comum numa caixa pequena é barato.
+
+    Cada página pontua os candidatos de novo e guarda só os 'limite'
+    melhores que vêm depois do cursor (heap limitado), sem cache de
+    rankings: a memória não depende de quantas mensagens casam.
+    """
+    def __init__(self):
+        self._listas: Dict[str, _ListaInvertida] = {}
+        self._ids_destinatario: Dict[str, int] = {}
+        self._destinos = array('I')
+        self._base = 0          # offset correspondente a _destinos[0]
+        self._entradas = 0
+        self._caixas: Dict[int, array] = {}   # id do destinatário -> offsets
+
+    def adicionar(self, offset: int, destinatario: str, conteudo: str) -> None:
+        """Indexa uma mensagem. Offsets devem ser crescentes."""
+        if not self._destinos:
+            self._base = offset
+        # Lacunas (ex: mensagens já descartadas no reload) ficam sem destinatário
+        while self._base + len(self._destinos) < offset:
+            self._destinos.append(0)
+        id_destinatario = self._ids_destinatario.setdefault(
+            destinatario, len(self._ids_destinatario) + 1)
+        self._destinos.append(id_destinatario)
+        caixa = self._caixas.get(id_destinatario)
+        if caixa is None:
+            caixa = self._caixas[id_destinatario] = array('Q')
+        caixa.append(offset)
+
+        for termo, frequencia in Counter(tokenizar(conteudo)).items():
+            lista = self._listas.get(termo)
+            if lista is None:
+                lista = self._listas[termo] = _ListaInvertida()
+            lista.offsets.append(offset)
+            lista.frequencias.append(min(frequencia, 0xFFFF))
+            self._entradas += 1
+
+    def entradas(self) -> int:
+        return self._entradas
+
+    def compactar(self, primeiro_offset: int) -> None:
+        """Descarta entradas de mensagens anteriores a 'primeiro_offset'."""
+        for termo in list(self._listas):
+            lista = self._listas[termo]
+            corte = bisect_left(lista.offsets, primeiro_offset)
+            if corte == len(lista.offsets):
+                del self._listas[termo]
+            elif corte:
+                del lista.offsets[:corte]
+                del lista.frequencias[:corte]
+        self._entradas = sum(len(l.offsets) for l in self._listas.values())
+        for id_destinatario in list(self._caixas):
+            caixa = self._caixas[id_destinatario]
+            corte = bisect_left(caixa, primeiro_offset)
+            if corte == len(caixa):
+                del self._caixas[id_destinatario]
+            elif corte:
+                del caixa[:corte]
+        corte = max(0, min(primeiro_offset - self._base, len(self._destinos)))
+        del self._destinos[:corte]
+        self._base += corte
+
+    def estado(self) -> dict:
+        """Cópia do conteúdo do índice, para um instantâneo (ver IndiceDeMensagens.estado)."""
+        return {
+            'destinatarios': sorted(self._ids_destinatario, key=self._ids_destinatario.get),
+            'base': self._base,
+            'destinos': array('I', self._destinos),
+            'listas': {termo: (array('Q', l.offsets), array('H', l.frequencias))
+                       for termo, l in self._listas.items()},
+        }
+
+    def estado_adiado(self) -> Callable[[], dict]:
+        """
+        Como estado(), mas em duas etapas: agora anota só o tamanho de cada
+        lista (O(termos)); a função retornada copia os arrays até esses
+        tamanhos quando chamada, ex: na thread que grava o instantâneo.
+        Enquanto isso o índice pode receber mensagens (são appends depois
+        dos tamanhos anotados), mas não pode ser compactado.
+        """
+        destinatarios = sorted(self._ids_destinatario, key=self._ids_destinatario.get)
+        base, destinos, total = self._base, self._destinos, len(self._destinos)
+        listas = [(termo, l.offsets, l.frequencias, len(l.offsets))
+                  for termo, l in self._listas.items()]
+
+        def copiar() -> dict:
+            return {
+                'destinatarios': destinatarios,
+                'base': base,
+                'destinos': destinos[:total],
+                'listas': {termo: (offsets[:n], frequencias[:n])
+                           for termo, offsets, frequencias, n in listas},
+            }
+        return copiar
+
+    def restaurar(self, estado: dict) -> None:
+        """Substitui o conteúdo do índice pelo de estado()."""
+        self._ids_destinatario = {d: i for i, d in enumerate(estado['destinatarios'], start=1)}
+        self._base = estado['base']
+        self._destinos = estado['destinos']
+        self._listas = {}
+        for termo, (offsets, frequencias) in estado['listas'].items():
+            lista = self._listas[termo] = _ListaInvertida()
+            lista.offsets, lista.frequencias = offsets, frequencias
+        self._entradas = sum(len(l.offsets) for l in self._listas.values())
+        # As caixas são derivadas de _destinos (não vão no instantâneo)
+        self._caixas = {}
+        for i, id_destinatario in enumerate(self._destinos):
+            if id_destinatario:
+                caixa = self._caixas.get(id_destinatario)
+                if caixa is None:
+                    caixa = self._caixas[id_destinatario] = array('Q')
+                caixa.append(self._base + i)
+
+    def _destinatario_ok(self, offset: int, id_destinatario: Optional[int]) -> bool:
+        if id_destinatario is None:
+            return True
+        i = offset - self._base
+        return 0 <= i < len(self._destinos) and self._destinos[i] == id_destinatario
+
+    def buscar(self, todos: Iterable[str] = (), algum: Iterable[str] = (),
+               destinatario: Optional[str] = None, primeiro_offset: int = 0,
+               limite: int = 20, apos: Optional[Tuple[float, int]] = None
+               ) -> List[Tuple[float, int]]:
+        """
+        Retorna até 'limite' pares (pontuacao, offset) em ordem de relevância
+        (e, no empate, das mais novas para as mais antigas).
+
+        Args:
+            todos: Termos que a mensagem precisa conter (AND)
+            algum: Se informado, a mensagem precisa conter ao menos um (OR)
+            destinatario: Apenas mensagens para este destinatário
+            primeiro_offset: Ignora mensagens já descartadas pela retenção
+            limite: Máximo de resultados
+            apos: Último (pontuacao, offset) da página anterior
+        """
+        termos_todos = sorted({t for texto in todos for t in tokenizar(texto)})
+        termos_algum = sorted({t for texto in algum for t in tokenizar(texto)})
+        if not termos_todos and not termos_algum:
+            return []
+
+        id_destinatario = None
+        if destinatario is not None:
+            id_destinatario = self._ids_destinatario.get(destinatario)
+            if id_destinatario is None:
+                return []
+
+        listas_todos = [self._listas.get(t) for t in termos_todos]
+        if any(lista is None for lista in listas_todos):
+            return []
+        listas_algum = [l for l in (self._listas.get(t) for t in termos_algum) if l is not None]
+        if termos_algum and not listas_algum:
+            return []
+
+        # Peso de um termo: quanto mais raro, mais relevante (idf)
+        total = max(1, len(self._destinos))
+        pesos_todos = [(l, math.log(1 + total / len(l.offsets))) for l in listas_todos]
+        pesos_algum = [(l, math.log(1 + total / len(l.offsets))) for l in listas_algum]
+
+        if listas_todos:
+            guia = min(listas_todos, key=lambda l: len(l.offsets)).offsets
+            tamanho_guia = len(guia)
+        else:
+            guia = None
+            tamanho_guia = sum(len(l.offsets) for l in listas_algum)
+
+        # Caixa de entrada menor que a lista guia: ela conduz a busca e os
+        # termos são conferidos por busca binária
+        caixa = self._caixas.get(id_destinatario) if id_destinatario is not None else None
+        if id_destinatario is not None and caixa is None:
+            return []
+        if caixa is not None and len(caixa) <= tamanho_guia:
+            candidatos = caixa[bisect_left(caixa, primeiro_offset):]
+            id_destinatario = None  # todos já são da caixa
+        elif guia is not None:
+            candidatos = guia[bisect_left(guia, primeiro_offset):]
+        else:
+            unidos = set()
+            for lista in listas_algum:
+                unidos.update(lista.offsets[bisect_left(lista.offsets, primeiro_offset):])
+            candidatos = unidos
+
+        def pontuados():
+            for offset in candidatos:
+                if not self._destinatario_ok(offset, id_destinatario):
+                    continue
+                pontuacao = 0.0
+                for lista, peso in pesos_todos:
+                    frequencia = lista.frequencia(offset)
+                    if not frequencia:
+                        break
+                    pontuacao += (1 + math.log(frequencia)) * peso
+                else:
+                    casou_algum = not pesos_algum
+                    for lista, peso in pesos_algum:
+                        frequencia = lista.frequencia(offset)
+                        if frequencia:
+                            casou_algum = True
+                            pontuacao += (1 + math.log(frequencia)) * peso
+                    if casou_algum and (apos is None or (pontuacao, offset) < apos):
+                        yield pontuacao, offset
+
+        return heapq.nlargest(limite, pontuados())
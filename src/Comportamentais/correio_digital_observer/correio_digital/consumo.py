@@ -0,0 +1,130 @@
+# src/correio_digital/consumo.py
+
+import threading
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, List, Optional
+from .armazenamento import ArmazenamentoDeMensagens
+from .models import Mensagem
+
+@dataclass
+class LoteDeConsumo:
+    """
+    Resultado de SistemaDeMensagens.buscar_desde.
+
+    Atributos:
+        mensagens: Mensagens do lote, em ordem de offset
+        primeiro_offset: Offset da primeira mensagem do lote
+        proximo_offset: Offset a confirmar depois de processar o lote
+        perdidas: Mensagens descartadas pela retenção antes de serem lidas
+    """
+    mensagens: List[Mensagem] = field(default_factory=list)
+    primeiro_offset: int = 0
+    proximo_offset: int = 0
+    perdidas: int = 0
+
+class _Cursor:
+    __slots__ = ('posicao', 'confirmado', 'perdidas', 'lidas')
+
+    def __init__(self, offset: int):
+        self.posicao = offset       # próximo offset a ser lido
+        self.confirmado = offset    # tudo antes dele já foi processado
+        self.perdidas = 0
+        self.lidas = 0
+
+class Cursores:
+    """
+    Cursores nomeados do modelo pull: cada consumidor lê o armazenamento
+    no próprio ritmo, por offset, em vez de receber cada mensagem via
+    update(). A leitura avança a posição; a confirmação é explícita, e é
+    ela que define o atraso reportado e o ponto de retomada depois de
+    reposicionar() ou de um restart (via instantâneo).
+
+    Cada cursor deve ser usado por um consumidor de cada vez.
+    """
+    def __init__(self, armazenamento: ArmazenamentoDeMensagens):
+        self._armazenamento = armazenamento
+        self._cursores: Dict[str, _Cursor] = {}
+        self._lock = threading.Lock()
+
+    def _cursor(self, nome: str) -> _Cursor:
+        cursor = self._cursores.get(nome)
+        if cursor is None:
+            raise KeyError(f"Cursor não registrado: '{nome}'")
+        return cursor
+
+    def registrar(self, nome: str, do_inicio: bool = False) -> None:
+        """Cria o cursor, se ainda não existir, no fim (ou no início) do armazenamento."""
+        with self._lock:
+            if nome not in self._cursores:
+                self._cursores[nome] = _Cursor(self._armazenamento.primeiro_offset if do_inicio
+                                               else self._armazenamento.proximo_offset)
+
+    def remover(self, nome: str) -> None:
+        with self._lock:
+            self._cursores.pop(nome, None)
+
+    def ler(self, nome: str, max_itens: int) -> LoteDeConsumo:
+        with self._lock:
+            cursor = self._cursor(nome)
+            desde = cursor.posicao
+        lote = LoteDeConsumo()
+        primeiro_retido = self._armazenamento.primeiro_offset
+        if desde < primeiro_retido:
+            lote.perdidas = primeiro_retido - desde
+            desde = primeiro_retido
+
+        # registros() percorre o armazenamento em sequência (no log em disco,
+        # direto do arquivo mapeado), então um lote grande custa pouco por item.
+        offset = desde
+        for offset, registro in islice(self._armazenamento.registros(desde), max_itens):
+            lote.mensagens.append(registro.para_mensagem())
+        lote.primeiro_offset = desde
+        lote.proximo_offset = offset + 1 if lote.mensagens else desde
+
+        with self._lock:
+            cursor.posicao = lote.proximo_offset
+            cursor.perdidas += lote.perdidas
+            cursor.lidas += len(lote.mensagens)
+        return lote
+
+    def confirmar(self, nome: str, offset: Optional[int] = None) -> None:
+        with self._lock:
+            cursor = self._cursor(nome)
+            if offset is None:
+                offset = cursor.posicao
+            elif offset > cursor.posicao:
+                raise ValueError(f"Offset {offset} ainda não foi lido pelo cursor '{nome}' "
+                                 f"(posição {cursor.posicao})")
+            cursor.confirmado = offset
+
+    def reposicionar(self, nome: str, offset: Optional[int] = None) -> None:
+        with self._lock:
+            cursor = self._cursor(nome)
+            cursor.posicao = cursor.confirmado if offset is None else offset
+
+    def atrasos(self) -> Dict[str, dict]:
+        """Por cursor: offsets, mensagens ainda não confirmadas, lidas e perdidas."""
+        primeiro = self._armazenamento.primeiro_offset
+        proximo = self._armazenamento.proximo_offset
+        with self._lock:
+            return {
+                nome: {
+                    'confirmado': c.confirmado,
+                    'posicao': c.posicao,
+                    'atraso': proximo - max(c.confirmado, primeiro),
+                    'lidas': c.lidas,
+                    'perdidas': c.perdidas,
+                }
+                for nome, c in self._cursores.items()
+            }
+
+    def estado(self) -> Dict[str, int]:
+        """Offsets confirmados, para um instantâneo."""
+        with self._lock:
+            return {nome: c.confirmado for nome, c in self._cursores.items()}
+
+    def restaurar(self, confirmados: Dict[str, int]) -> None:
+        """Recria os cursores a partir do último offset confirmado de cada um."""
+        with self._lock:
+            self._cursores = {nome: _Cursor(offset) for nome, offset in confirmados.items()}
@@ -0,0 +1,272 @@
+# src/correio_digital/despacho.py
+
+import abc
+import enum
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, List, Optional
+from .models import Mensagem
+from .observer_pattern import Observer
+from .metricas import Metricas
+
+logger = logging.getLogger(__name__)
+
+class FilaCheiaError(Exception):
+    """
+    Lançada quando a fila de um observador está cheia e a política
+    de backpressure é REJEITAR (ou o tempo de espera em BLOQUEAR expirou).
+    """
+    pass
+
+class PoliticaBackpressure(enum.Enum):
+    """
+    O que fazer quando a fila de um observador atinge a capacidade máxima.
+    """
+    BLOQUEAR = "bloquear"                # quem publica espera abrir espaço
+    DESCARTAR_ANTIGO = "descartar_antigo"  # descarta a mensagem mais antiga da fila
+    REJEITAR = "rejeitar"                # lança FilaCheiaError
+
+class Despachante(metaclass=abc.ABCMeta):
+    """
+    Estratégia de entrega usada pelo SistemaDeMensagens para levar uma
+    mensagem até os observadores.
+    """
+    _metricas: Optional[Metricas] = None
+
+    def instrumentar(self, metricas: Metricas) -> None:
+        """Passa a registrar entregas, falhas e latências em 'metricas'."""
+        self._metricas = metricas
+
+    def _entregar(self, observer: Observer, mensagens: List[Mensagem],
+                  em_lote: bool = True) -> None:
+        """
+        Chama update_batch (ou update, se em_lote=False) medindo a latência.
+        Exceções do observador são contabilizadas e propagadas.
+        """
+        inicio = time.perf_counter()
+        try:
+            if em_lote:
+                observer.update_batch(mensagens)
+            else:
+                observer.update(mensagens[0])
+        except Exception:
+            if self._metricas is not None:
+                self._metricas.registrar_falha(observer, len(mensagens))
+            raise
+        if self._metricas is not None:
+            self._metricas.registrar_entrega(observer, len(mensagens),
+                                             time.perf_counter() - inicio)
+
+    def _entregar_isolado(self, observer: Observer, mensagens: List[Mensagem],
+                          em_lote: bool = True) -> bool:
+        """
+        Como _entregar, mas a falha de um observador não interrompe a
+        entrega aos demais: ela é repassada a _tratar_falha.
+        """
+        try:
+            self._entregar(observer, mensagens, em_lote)
+        except Exception as erro:
+            self._tratar_falha(observer, mensagens, em_lote, erro)
+            return False
+        return True
+
+    def _tratar_falha(self, observer: Observer, mensagens: List[Mensagem],
+                      em_lote: bool, erro: Exception) -> None:
+        """Ponto de extensão para falhas de entrega. Por padrão só registra no log."""
+        logger.error("[Despachante] Falha em %s", observer.__class__.__name__,
+                     exc_info=(type(erro), erro, erro.__traceback__))
+
+    @abc.abstractmethod
+    def despachar(self, observers: Iterable[Observer], mensagem: Mensagem) -> None:
+        """Entrega (ou agenda a entrega de) uma mensagem aos observadores."""
+        pass
+
+    def despachar_lote(self, observers: Iterable[Observer], mensagens: List[Mensagem]) -> None:
+        """Entrega um lote de mensagens, usando update_batch de cada observador."""
+        for observer in observers:
+            self._entregar_isolado(observer, mensagens)
+
+    def estatisticas(self) -> dict:
+        """Estado interno do despachante (filas, retentativas...)."""
+        return {}
+
+    def flush(self) -> None:
+        """Aguarda até que todas as entregas pendentes tenham terminado."""
+        pass
+
+    def close(self) -> None:
+        """Drena as entregas pendentes e libera os recursos do despachante."""
+        pass
+
+class DespachanteSincrono(Despachante):
+    """
+    Despachante padrão: chama observer.update na própria thread de quem
+    publicou a mensagem, um observador após o outro. A exceção de um
+    observador é registrada e não impede a entrega aos seguintes.
+    """
+    def despachar(self, observers: Iterable[Observer], mensagem: Mensagem) -> None:
+        lote = [mensagem]
+        for observer in observers:
+            self._entregar_isolado(observer, lote, em_lote=False)
+
+class _FilaObservador:
+    """
+    Fila limitada de um único observador. Apenas uma tarefa por vez
+    drena a fila, o que preserva a ordem das mensagens para o observador.
+    """
+    def __init__(self, observer: Observer, capacidade: int):
+        self.observer = observer
+        self.capacidade = capacidade
+        self.itens: Deque[Mensagem] = deque()
+        self.agendada = False
+
+class DespachanteThreadPool(Despachante):
+    """
+    Despachante que dá a cada observador a sua própria fila limitada,
+    drenada por um pool de threads compartilhado. 'despachar' retorna
+    assim que a mensagem é enfileirada, então a ingestão deixa de ficar
+    limitada pelo notificador mais lento.
+    """
+    def __init__(self,
+                 max_workers: int = 4,
+                 capacidade_fila: int = 1000,
+                 politica: PoliticaBackpressure = PoliticaBackpressure.BLOQUEAR,
+                 timeout_bloqueio: Optional[float] = None,
+                 lote: int = 64):
+        """
+        Args:
+            max_workers: Número de threads do pool compartilhado
+            capacidade_fila: Máximo de mensagens pendentes por observador
+            politica: Comportamento quando a fila de um observador enche
+            timeout_bloqueio: Tempo máximo de espera na política BLOQUEAR
+                (None espera indefinidamente)
+            lote: Máximo de mensagens entregues por tarefa antes de devolver
+                a thread ao pool (evita que um observador monopolize o pool)
+        """
+        if capacidade_fila < 1:
+            raise ValueError("capacidade_fila deve ser maior que zero")
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="despachante")
+        self._capacidade = capacidade_fila
+        self._politica = politica
+        self._timeout_bloqueio = timeout_bloqueio
+        self._lote = lote
+        # Só existem filas para observadores com entregas pendentes, assim o
+        # despachante não mantém vivas sessões que já foram abandonadas.
+        self._filas: Dict[int, _FilaObservador] = {}
+        self._descartadas = 0
+        self._cond = threading.Condition()
+        self._fechado = False
+
+    def despachar(self, observers: Iterable[Observer], mensagem: Mensagem) -> None:
+        self.despachar_lote(observers, [mensagem])
+
+    def despachar_lote(self, observers: Iterable[Observer], mensagens: List[Mensagem]) -> None:
+        with self._cond:
+            if self._fechado:
+                raise RuntimeError("Despachante já foi fechado")
+            for observer in observers:
+                for mensagem in mensagens:
+                    self._enfileirar(observer, mensagem)
+
+    def _fila_de(self, observer: Observer) -> _FilaObservador:
+        """Fila atual do observador, criada se não houver. Requer self._cond."""
+        fila = self._filas.get(id(observer))
+        if fila is None or fila.observer is not observer:
+            fila = self._filas[id(observer)] = _FilaObservador(observer, self._capacidade)
+        return fila
+
+    def _enfileirar(self, observer: Observer, mensagem: Mensagem) -> None:
+        """Aplica a política de backpressure e agenda a drenagem. Requer self._cond."""
+        fila = self._fila_de(observer)
+        if len(fila.itens) >= fila.capacidade:
+            if self._politica is PoliticaBackpressure.REJEITAR:
+                raise FilaCheiaError(
+                    f"Fila de {fila.observer.__class__.__name__} está cheia")
+            if self._politica is PoliticaBackpressure.DESCARTAR_ANTIGO:
+                fila.itens.popleft()
+                self._descartadas += 1
+            else:
+                fila = self._esperar_espaco(observer, fila)
+        fila.itens.append(mensagem)
+        if not fila.agendada:
+            fila.agendada = True
+            self._executor.submit(self._drenar, fila)
+
+    def _esperar_espaco(self, observer: Observer, fila: _FilaObservador) -> _FilaObservador:
+        """
+        Política BLOQUEAR: espera a fila do observador ter espaço. Requer self._cond.
+
+        O wait libera o lock, e nesse meio tempo _drenar pode esvaziar e
+        remover a fila e outro publicador criar uma nova. Por isso a fila é
+        resolvida de novo a cada volta: usar a antiga criaria um segundo
+        drenador para o mesmo observador.
+        """
+        prazo = (None if self._timeout_bloqueio is None
+                 else time.monotonic() + self._timeout_bloqueio)
+        while len(fila.itens) >= fila.capacidade:
+            restante = None if prazo is None else prazo - time.monotonic()
+            if restante is not None and restante <= 0 or not self._cond.wait_for(
+                    lambda: len(fila.itens) < fila.capacidade
+                    or self._filas.get(id(observer)) is not fila,
+                    timeout=restante):
+                raise FilaCheiaError(
+                    f"Tempo esgotado esperando a fila de {observer.__class__.__name__}")
+            fila = self._fila_de(observer)
+        return fila
+
+    def _drenar(self, fila: _FilaObservador) -> None:
+        """
+        Retira até 'lote' mensagens da fila, entrega todas com um único
+        update_batch e se reagenda se ainda houver itens.
+        """
+        with self._cond:
+            n = min(self._lote, len(fila.itens))
+            mensagens = [fila.itens.popleft() for _ in range(n)]
+            self._cond.notify_all()
+
+        if mensagens:
+            self._entregar_isolado(fila.observer, mensagens)
+
+        with self._cond:
+            if fila.itens:
+                self._executor.submit(self._drenar, fila)
+            else:
+                fila.agendada = False
+                if self._filas.get(id(fila.observer)) is fila:
+                    del self._filas[id(fila.observer)]
+                self._cond.notify_all()
+
+    def pendentes(self) -> int:
+        """Total de mensagens aguardando entrega em todas as filas."""
+        with self._cond:
+            return sum(len(f.itens) for f in self._filas.values())
+
+    def descartadas(self) -> int:
+        """Total de mensagens descartadas pela política DESCARTAR_ANTIGO."""
+        with self._cond:
+            return self._descartadas
+
+    def estatisticas(self) -> dict:
+        with self._cond:
+            return {
+                'pendentes': sum(len(f.itens) for f in self._filas.values()),
+                'descartadas': self._descartadas,
+            }
+
+    def flush(self) -> None:
+        with self._cond:
+            self._cond.wait_for(
+                lambda: all(not f.agendada for f in self._filas.values()))
+
+    def close(self) -> None:
+        with self._cond:
+            if self._fechado:
+                return
+            self._fechado = True
+        self.flush()
+        self._executor.shutdown(wait=True)
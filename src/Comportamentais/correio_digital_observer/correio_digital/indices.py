@@ -0,0 +1,177 @@
+# src/correio_digital/indices.py
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+from .models import Mensagem
+
+@dataclass
+class ResultadoBusca:
+    """
+    Uma página de resultados de SistemaDeMensagens.buscar (ou buscar_texto).
+
+    Atributos:
+        mensagens: Mensagens da página, em ordem cronológica (ou de
+            relevância, em buscar_texto)
+        proximo_cursor: Cursor para pedir a página seguinte (None se acabou)
+    """
+    mensagens: List[Mensagem] = field(default_factory=list)
+    proximo_cursor: Optional[str] = None
+
+def codificar_cursor(epoch_us: int, offset: int) -> str:
+    """Cursor opaco que aponta para logo depois de (epoch_us, offset)."""
+    return f"{epoch_us}:{offset}"
+
+def decodificar_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        epoch_us, offset = cursor.split(":")
+        return int(epoch_us), int(offset)
+    except ValueError:
+        raise ValueError(f"Cursor inválido: {cursor!r}") from None
+
+class _Postagens:
+    """
+    Lista de (timestamp, offset) ordenada, em dois arrays paralelos.
+    Mensagens chegam quase sempre em ordem de tempo, então a inserção
+    normalmente é um append; fora de ordem cai no insort.
+    """
+    __slots__ = ('tempos', 'offsets')
+
+    def __init__(self):
+        self.tempos = array('q')
+        self.offsets = array('Q')
+
+    def adicionar(self, epoch_us: int, offset: int) -> None:
+        if not self.tempos or epoch_us >= self.tempos[-1]:
+            self.tempos.append(epoch_us)
+            self.offsets.append(offset)
+        else:
+            # O offset novo é o maior de todos, então vai depois dos empates
+            i = bisect_right(self.tempos, epoch_us)
+            self.tempos.insert(i, epoch_us)
+            self.offsets.insert(i, offset)
+
+    def intervalo(self, desde_us: Optional[int], ate_us: Optional[int]) -> Tuple[int, int]:
+        """Índices [inicio, fim) das entradas com desde_us <= tempo <= ate_us."""
+        inicio = 0 if desde_us is None else bisect_left(self.tempos, desde_us)
+        fim = len(self.tempos) if ate_us is None else bisect_right(self.tempos, ate_us)
+        return inicio, fim
+
+    def posicao_apos(self, epoch_us: int, offset: int) -> int:
+        """Índice da primeira entrada estritamente depois de (epoch_us, offset)."""
+        # Entre timestamps iguais os offsets estão em ordem crescente
+        inicio = bisect_left(self.tempos, epoch_us)
+        fim = bisect_right(self.tempos, epoch_us, inicio)
+        return bisect_right(self.offsets, offset, inicio, fim)
+
+    def compactar(self, primeiro_offset: int) -> None:
+        """Remove as entradas de mensagens que não estão mais retidas."""
+        vivos = [i for i, o in enumerate(self.offsets) if o >= primeiro_offset]
+        self.tempos = array('q', (self.tempos[i] for i in vivos))
+        self.offsets = array('Q', (self.offsets[i] for i in vivos))
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def copia(self) -> Tuple[array, array]:
+        return array('q', self.tempos), array('Q', self.offsets)
+
+    @classmethod
+    def de_arrays(cls, tempos: array, offsets: array) -> "_Postagens":
+        postagens = cls()
+        postagens.tempos, postagens.offsets = tempos, offsets
+        return postagens
+
+class IndiceDeMensagens:
+    """
+    Índices secundários sobre as mensagens armazenadas, mantidos de forma
+    incremental a cada mensagem nova:
+
+    - por remetente e por destinatário (dict -> lista ordenada por tempo);
+    - por tempo (lista global ordenada, consultada com bisect).
+
+    Os índices guardam apenas (timestamp, offset); a mensagem em si é lida
+    do armazenamento. Entradas de mensagens já descartadas pela retenção
+    são ignoradas nas buscas e removidas periodicamente por compactar().
+    """
+    def __init__(self):
+        self._por_remetente: Dict[str, _Postagens] = {}
+        self._por_destinatario: Dict[str, _Postagens] = {}
+        self._por_tempo = _Postagens()
+
+    def adicionar(self, offset: int, remetente: str, destinatario: str, epoch_us: int) -> None:
+        postagens = self._por_remetente.get(remetente)
+        if postagens is None:
+            postagens = self._por_remetente[remetente] = _Postagens()
+        postagens.adicionar(epoch_us, offset)
+
+        postagens = self._por_destinatario.get(destinatario)
+        if postagens is None:
+            postagens = self._por_destinatario[destinatario] = _Postagens()
+        postagens.adicionar(epoch_us, offset)
+
+        self._por_tempo.adicionar(epoch_us, offset)
+
+    def entradas(self) -> int:
+        """Quantidade de mensagens indexadas (vivas ou já descartadas)."""
+        return len(self._por_tempo)
+
+    def compactar(self, primeiro_offset: int) -> None:
+        """Descarta as entradas com offset < primeiro_offset."""
+        for indice in (self._por_remetente, self._por_destinatario):
+            for chave in list(indice):
+                indice[chave].compactar(primeiro_offset)
+                if not indice[chave]:
+                    del indice[chave]
+        self._por_tempo.compactar(primeiro_offset)
+
+    def estado(self) -> dict:
+        """
+        Cópia do conteúdo dos índices (arrays copiados de uma vez), para
+        ser gravada em um instantâneo sem bloquear novas inserções.
+        """
+        return {
+            'remetente': {k: p.copia() for k, p in self._por_remetente.items()},
+            'destinatario': {k: p.copia() for k, p in self._por_destinatario.items()},
+            'tempo': self._por_tempo.copia(),
+        }
+
+    def restaurar(self, estado: dict) -> None:
+        """Substitui o conteúdo dos índices pelo de estado()."""
+        self._por_remetente = {k: _Postagens.de_arrays(*v) for k, v in estado['remetente'].items()}
+        self._por_destinatario = {k: _Postagens.de_arrays(*v)
+                                  for k, v in estado['destinatario'].items()}
+        self._por_tempo = _Postagens.de_arrays(*estado['tempo'])
+
+    def candidatos(self, remetente: Optional[str], destinatario: Optional[str],
+                   desde_us: Optional[int], ate_us: Optional[int],
+                   apos: Optional[Tuple[int, int]]) -> Iterator[Tuple[int, int]]:
+        """
+        Percorre, em ordem de (tempo, offset), os pares (epoch_us, offset)
+        da menor lista que satisfaz os filtros indexados. Quem chama ainda
+        precisa conferir o outro filtro quando remetente e destinatario
+        são informados juntos.
+        """
+        listas = []
+        if remetente is not None:
+            listas.append(self._por_remetente.get(remetente))
+        if destinatario is not None:
+            listas.append(self._por_destinatario.get(destinatario))
+        if not listas:
+            listas.append(self._por_tempo)
+        if any(lista is None for lista in listas):
+            return
+
+        # Usa o menor intervalo entre as listas candidatas
+        melhor, melhor_intervalo = None, None
+        for lista in listas:
+            inicio, fim = lista.intervalo(desde_us, ate_us)
+            if apos is not None:
+                inicio = max(inicio, lista.posicao_apos(*apos))
+            if melhor is None or fim - inicio < melhor_intervalo[1] - melhor_intervalo[0]:
+                melhor, melhor_intervalo = lista, (inicio, fim)
+
+        tempos, offsets = melhor.tempos, melhor.offsets
+        for i in range(*melhor_intervalo):
+            yield tempos[i], offsets[i]
@@ -0,0 +1,308 @@
+# src/correio_digital/instantaneo.py
+
+import logging
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Dict, List, Optional, Union
+from .models import MensagemCompacta
+from .serializacao import RegistroCorrompidoError, codificar, decodificar, tamanho_total
+
+logger = logging.getLogger(__name__)
+
+# Formato de um instantâneo:
+#
+#   assinatura (8 bytes) | ordem dos bytes (1 byte) | primeiro_offset (uint64)
+#   | proximo_offset (uint64) | índices secundários | índice textual
+#   | cursores de consumo | mensagens (opcional) | crc32 (uint32)
+#
+# Inteiros e prefixos são little-endian. Strings têm prefixo de tamanho
+# (uint32) e arrays são gravados como quantidade (uint64) seguida dos bytes
+# crus na ordem nativa de quem gravou ('<' ou '>' no cabeçalho), então
+# carregar é um frombytes por lista, mais um byteswap se a máquina que lê
+# tiver a outra ordem. O CRC cobre o arquivo inteiro.
+#
+# A versão anterior (CDSNAP02) não tinha o byte de ordem; seus arrays são
+# lidos na ordem nativa.
+_ASSINATURA = b'CDSNAP03'
+_ASSINATURA_V2 = b'CDSNAP02'
+_ORDEM_NATIVA = b'<' if sys.byteorder == 'little' else b'>'
+_EXTENSAO = ".snap"
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+
+@dataclass
+class Captura:
+    """
+    Estado do SistemaDeMensagens em um instante: índices copiados e, para
+    armazenamentos em memória, os registros retidos. Cobre os offsets em
+    [primeiro_offset, proximo_offset).
+
+    'indice_textual' pode ser uma função que produz o estado do índice
+    textual (ver IndiceTextual.estado_adiado); gravar() a chama na thread
+    de gravação.
+    """
+    primeiro_offset: int
+    proximo_offset: int
+    indice: dict
+    indice_textual: Union[dict, Callable[[], dict]]
+    registros: Optional[List[MensagemCompacta]] = None
+    cursores: Dict[str, int] = field(default_factory=dict)
+
+class _Escritor:
+    """Grava os campos do instantâneo calculando o CRC do que foi escrito."""
+    def __init__(self, arquivo: BinaryIO):
+        self._arquivo = arquivo
+        self.crc = 0
+
+    def bytes(self, dados) -> None:
+        self._arquivo.write(dados)
+        self.crc = zlib.crc32(dados, self.crc)
+
+    def inteiro(self, valor: int) -> None:
+        self.bytes(_U64.pack(valor))
+
+    def texto(self, valor: str) -> None:
+        dados = valor.encode('utf-8')
+        self.bytes(_U32.pack(len(dados)) + dados)
+
+    def array(self, valores: array) -> None:
+        self.inteiro(len(valores))
+        self.bytes(valores.tobytes())
+
+class _Leitor:
+    """Lê os campos de um instantâneo já carregado em memória."""
+    def __init__(self, dados: bytes, trocar_ordem: bool = False):
+        self._dados = memoryview(dados)
+        self._trocar_ordem = trocar_ordem
+        self.posicao = 0
+
+    def bytes(self, tamanho: int) -> memoryview:
+        fim = self.posicao + tamanho
+        if fim > len(self._dados):
+            raise RegistroCorrompidoError("Instantâneo truncado")
+        trecho = self._dados[self.posicao:fim]
+        self.posicao = fim
+        return trecho
+
+    def inteiro(self) -> int:
+        return _U64.unpack(self.bytes(_U64.size))[0]
+
+    def texto(self) -> str:
+        tamanho = _U32.unpack(self.bytes(_U32.size))[0]
+        return str(self.bytes(tamanho), 'utf-8')
+
+    def array(self, tipo: str) -> array:
+        valores = array(tipo)
+        quantidade = self.inteiro()
+        valores.frombytes(self.bytes(quantidade * valores.itemsize))
+        if self._trocar_ordem:
+            valores.byteswap()
+        return valores
+
+def _gravar_postagens(escritor: _Escritor, postagens: dict) -> None:
+    escritor.inteiro(len(postagens))
+    for chave, (tempos, offsets) in postagens.items():
+        escritor.texto(chave)
+        escritor.array(tempos)
+        escritor.array(offsets)
+
+def _ler_postagens(leitor: _Leitor) -> dict:
+    return {leitor.texto(): (leitor.array('q'), leitor.array('Q'))
+            for _ in range(leitor.inteiro())}
+
+def gravar(captura: Captura, caminho: str) -> None:
+    """
+    Grava o instantâneo de forma atômica: escreve em um arquivo temporário,
+    faz fsync e só então o renomeia para 'caminho'.
+    """
+    temporario = caminho + ".tmp"
+    with open(temporario, 'wb') as arquivo:
+        escritor = _Escritor(arquivo)
+        escritor.bytes(_ASSINATURA)
+        escritor.bytes(_ORDEM_NATIVA)
+        escritor.inteiro(captura.primeiro_offset)
+        escritor.inteiro(captura.proximo_offset)
+
+        indice = captura.indice
+        _gravar_postagens(escritor, indice['remetente'])
+        _gravar_postagens(escritor, indice['destinatario'])
+        escritor.array(indice['tempo'][0])
+        escritor.array(indice['tempo'][1])
+
+        textual = captura.indice_textual
+        if callable(textual):
+            textual = textual()
+        escritor.inteiro(len(textual['destinatarios']))
+        for destinatario in textual['destinatarios']:
+            escritor.texto(destinatario)
+        escritor.inteiro(textual['base'])
+        escritor.array(textual['destinos'])
+        escritor.inteiro(len(textual['listas']))
+        for termo, (offsets, frequencias) in textual['listas'].items():
+            escritor.texto(termo)
+            escritor.array(offsets)
+            escritor.array(frequencias)
+
+        escritor.inteiro(len(captura.cursores))
+        for nome, offset in captura.cursores.items():
+            escritor.texto(nome)
+            escritor.inteiro(offset)
+
+        if captura.registros is None:
+            escritor.inteiro(0)
+        else:
+            escritor.inteiro(1)
+            escritor.inteiro(len(captura.registros))
+            for registro in captura.registros:
+                escritor.bytes(codificar(registro))
+
+        arquivo.write(_U32.pack(escritor.crc))
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+def carregar(caminho: str) -> Captura:
+    """Lê um instantâneo gravado por gravar(), conferindo o CRC."""
+    with open(caminho, 'rb') as arquivo:
+        dados = arquivo.read()
+    if len(dados) < len(_ASSINATURA) + 1 + _U32.size or not (
+            dados.startswith(_ASSINATURA) or dados.startswith(_ASSINATURA_V2)):
+        raise RegistroCorrompidoError(f"{caminho} não é um instantâneo válido")
+    (crc,) = _U32.unpack_from(dados, len(dados) - _U32.size)
+    corpo = memoryview(dados)[:len(dados) - _U32.size]
+    if zlib.crc32(corpo) != crc:
+        raise RegistroCorrompidoError(f"CRC inválido em {caminho}")
+
+    ordem = _ORDEM_NATIVA
+    if dados.startswith(_ASSINATURA):
+        ordem = bytes(corpo[len(_ASSINATURA):len(_ASSINATURA) + 1])
+        if ordem not in (b'<', b'>'):
+            raise RegistroCorrompidoError(f"Ordem de bytes inválida em {caminho}")
+    leitor = _Leitor(corpo, trocar_ordem=ordem != _ORDEM_NATIVA)
+    leitor.bytes(len(_ASSINATURA) + (1 if dados.startswith(_ASSINATURA) else 0))
+    primeiro_offset = leitor.inteiro()
+    proximo_offset = leitor.inteiro()
+
+    indice = {
+        'remetente': _ler_postagens(leitor),
+        'destinatario': _ler_postagens(leitor),
+        'tempo': (leitor.array('q'), leitor.array('Q')),
+    }
+    textual = {'destinatarios': [leitor.texto() for _ in range(leitor.inteiro())]}
+    textual['base'] = leitor.inteiro()
+    textual['destinos'] = leitor.array('I')
+    textual['listas'] = {leitor.texto(): (leitor.array('Q'), leitor.array('H'))
+                         for _ in range(leitor.inteiro())}
+    cursores = {leitor.texto(): leitor.inteiro() for _ in range(leitor.inteiro())}
+
+    registros = None
+    if leitor.inteiro():
+        registros = []
+        for _ in range(leitor.inteiro()):
+            tamanho = tamanho_total(corpo, leitor.posicao)
+            registro, _ = decodificar(leitor.bytes(tamanho))
+            registros.append(registro)
+
+    return Captura(primeiro_offset, proximo_offset, indice, textual, registros, cursores)
+
+class Instantaneos:
+    """
+    Instantâneos periódicos do SistemaDeMensagens em um diretório.
+
+    A cada 'a_cada' mensagens o sistema captura o estado na própria
+    thread de ingestão, que fica parada durante a captura: copia os arrays
+    dos índices por remetente, destinatário e tempo (um memcpy por lista)
+    e, para armazenamento em memória, a lista de referências aos
+    registros. Do índice textual, que costuma ser o maior, só anota o
+    tamanho de cada lista; como elas só crescem por append, os arrays são
+    copiados depois, na thread de gravação, junto com a codificação, a
+    escrita e o fsync. Enquanto o instantâneo anterior está sendo gravado
+    o sistema não captura nem compacta nada; o novo fica para a próxima vez.
+
+    Ao abrir, o sistema carrega o instantâneo mais recente válido e só
+    reindexa as mensagens posteriores a ele, então o tempo de partida
+    depende do tamanho do instantâneo e da cauda, não do histórico todo.
+    """
+    def __init__(self, diretorio: str, a_cada: int = 100_000, manter: int = 2):
+        """
+        Args:
+            diretorio: Pasta onde os instantâneos são gravados
+            a_cada: Mensagens novas entre dois instantâneos
+            manter: Quantos instantâneos antigos manter no diretório
+        """
+        if a_cada < 1 or manter < 1:
+            raise ValueError("a_cada e manter devem ser maiores que zero")
+        self._diretorio = diretorio
+        self._a_cada = a_cada
+        self._manter = manter
+        self._ultimo_offset = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho(self, proximo_offset: int) -> str:
+        return os.path.join(self._diretorio, f"{proximo_offset:020d}{_EXTENSAO}")
+
+    def _arquivos(self) -> List[str]:
+        return sorted(n for n in os.listdir(self._diretorio) if n.endswith(_EXTENSAO))
+
+    def carregar_ultimo(self) -> Optional[Captura]:
+        """O instantâneo mais recente que está íntegro, ou None."""
+        for nome in reversed(self._arquivos()):
+            caminho = os.path.join(self._diretorio, nome)
+            try:
+                captura = carregar(caminho)
+            except (OSError, RegistroCorrompidoError, UnicodeDecodeError) as erro:
+                logger.warning("[Instantâneo] Ignorando %s: %s", nome, erro)
+                continue
+            self._ultimo_offset = captura.proximo_offset
+            return captura
+        return None
+
+    def em_andamento(self) -> bool:
+        """Se há um instantâneo sendo gravado agora."""
+        with self._lock:
+            return self._thread is not None and self._thread.is_alive()
+
+    def devido(self, proximo_offset: int) -> bool:
+        """Se já chegaram 'a_cada' mensagens desde o último instantâneo."""
+        return proximo_offset - self._ultimo_offset >= self._a_cada
+
+    def gravar_em_segundo_plano(self, captura: Captura) -> bool:
+        """
+        Grava a captura em outra thread. Retorna False (sem gravar) se o
+        instantâneo anterior ainda está em andamento.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._ultimo_offset = captura.proximo_offset
+            self._thread = threading.Thread(target=self._gravar, args=(captura,),
+                                            name="instantaneo", daemon=True)
+            self._thread.start()
+        return True
+
+    def _gravar(self, captura: Captura) -> None:
+        try:
+            gravar(captura, self._caminho(captura.proximo_offset))
+            logger.debug("[Instantâneo] Gravado até o offset %d.", captura.proximo_offset)
+            self._podar()
+        except Exception:
+            logger.exception("[Instantâneo] Falha ao gravar o instantâneo")
+
+    def _podar(self) -> None:
+        """Apaga os instantâneos mais antigos além de 'manter'."""
+        for nome in self._arquivos()[:-self._manter]:
+            os.remove(os.path.join(self._diretorio, nome))
+
+    def aguardar(self) -> None:
+        """Espera a gravação em andamento terminar."""
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join()
@@ -0,0 +1,273 @@
+# src/correio_digital/limitacao.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+from .models import Mensagem
+from .observer_pattern import Observer
+from .temporizador import Temporizador, temporizador_padrao
+
+class BaldeDeTokens:
+    """
+    Limitador token bucket: acumula 'taxa' tokens por segundo até
+    'capacidade' (o tamanho máximo de uma rajada). É thread-safe, então
+    um mesmo balde pode limitar vários observadores (ex: a cota de um
+    provedor de e-mail compartilhada por vários notificadores).
+    """
+    __slots__ = ('taxa', 'capacidade', 'tokens', 'atualizado', '_relogio', '_lock')
+
+    def __init__(self, taxa: float, capacidade: Optional[float] = None,
+                 relogio: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            taxa: Tokens repostos por segundo
+            capacidade: Máximo de tokens acumulados (padrão: 'taxa', ou seja,
+                no máximo um segundo de rajada)
+            relogio: Fonte de tempo em segundos (útil para testes)
+        """
+        if taxa <= 0:
+            raise ValueError("taxa deve ser maior que zero")
+        self.taxa = taxa
+        self.capacidade = capacidade if capacidade is not None else max(taxa, 1.0)
+        self.tokens = self.capacidade
+        self._relogio = relogio
+        self.atualizado = relogio()
+        self._lock = threading.Lock()
+
+    def _repor(self) -> None:
+        """Requer self._lock."""
+        agora = self._relogio()
+        self.tokens = min(self.capacidade, self.tokens + (agora - self.atualizado) * self.taxa)
+        self.atualizado = agora
+
+    def disponivel(self, n: float = 1) -> bool:
+        with self._lock:
+            self._repor()
+            return self.tokens >= n
+
+    def consumir(self, n: float = 1) -> bool:
+        """Consome 'n' tokens se houver; retorna se conseguiu."""
+        return self.consumir_ou_esperar(n) == 0
+
+    def consumir_ou_esperar(self, n: float = 1) -> float:
+        """
+        Consome 'n' tokens se houver, atomicamente. Retorna 0 se conseguiu,
+        ou quantos segundos faltam para haver 'n' tokens.
+        """
+        with self._lock:
+            self._repor()
+            if self.tokens < n:
+                return (n - self.tokens) / self.taxa
+            self.tokens -= n
+            return 0.0
+
+    def tempo_ate(self, n: float = 1) -> float:
+        """Segundos até haver 'n' tokens disponíveis (0 se já houver)."""
+        with self._lock:
+            self._repor()
+            return max(0.0, (n - self.tokens) / self.taxa)
+
+    @property
+    def cheio(self) -> bool:
+        with self._lock:
+            self._repor()
+            return self.tokens >= self.capacidade
+
+class ObservadorLimitado(Observer):
+    """
+    Decorator de um Observer que limita a taxa de envios por canal (todas
+    as mensagens deste observador) e por destinatário.
+
+    Enquanto há tokens, cada mensagem é entregue normalmente. Quando um
+    dos limites é atingido, as mensagens daquele destinatário ficam
+    acumuladas e, assim que os tokens voltam, são entregues de uma vez
+    como um resumo, consumindo um único token. Por padrão o resumo é um
+    update_batch (para o NotificadorEmail, um único envio ao provedor);
+    passe 'agrupar=resumir' para transformar o lote em uma só mensagem.
+
+    Nenhuma mensagem é descartada: o limite só muda quantos envios são
+    feitos. Como em ObservadorAgrupado, os reenvios são disparados por um
+    único Temporizador e quem cria o decorator precisa mantê-lo vivo.
+
+    Para que vários decorators dividam a mesma cota (ex: um e-mail e um
+    SMS que saem pelo mesmo provedor), passe o mesmo 'balde_canal' a todos.
+    """
+    def __init__(self, observer: Observer,
+                 taxa_canal: Optional[float] = None,
+                 capacidade_canal: Optional[float] = None,
+                 balde_canal: Optional[BaldeDeTokens] = None,
+                 taxa_destinatario: Optional[float] = None,
+                 capacidade_destinatario: Optional[float] = None,
+                 agrupar: Optional[Callable[[List[Mensagem]], Mensagem]] = None,
+                 temporizador: Optional[Temporizador] = None,
+                 max_destinatarios: int = 10_000,
+                 relogio: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            observer: Observador que fará os envios
+            taxa_canal: Envios por segundo do canal inteiro (None = sem limite)
+            capacidade_canal: Rajada máxima do canal
+            balde_canal: Balde do canal compartilhado com outros decorators
+                (no lugar de taxa_canal/capacidade_canal)
+            taxa_destinatario: Envios por segundo para cada destinatário
+            capacidade_destinatario: Rajada máxima por destinatário
+            agrupar: Função que junta as mensagens acumuladas em uma só
+                (por padrão o lote vai inteiro para update_batch)
+            temporizador: Temporizador a usar (padrão: temporizador_padrao());
+                quem o passa é responsável por fechá-lo
+            max_destinatarios: Máximo de baldes por destinatário mantidos
+                em memória (os menos usados e já cheios são liberados)
+            relogio: Fonte de tempo dos baldes (útil para testes)
+        """
+        if balde_canal is not None and (taxa_canal is not None or capacidade_canal is not None):
+            raise ValueError("Informe taxa_canal/capacidade_canal ou balde_canal, não os dois")
+        self._observer = observer
+        self._relogio = relogio
+        if balde_canal is not None:
+            self._canal = balde_canal
+        else:
+            self._canal = (BaldeDeTokens(taxa_canal, capacidade_canal, relogio)
+                           if taxa_canal is not None else None)
+        self._taxa_destinatario = taxa_destinatario
+        self._capacidade_destinatario = capacidade_destinatario
+        self._baldes: "OrderedDict[str, BaldeDeTokens]" = OrderedDict()
+        self._max_destinatarios = max_destinatarios
+        self._agrupar = agrupar
+        self._temporizador = temporizador or temporizador_padrao()
+        self._pendentes: Dict[str, List[Mensagem]] = {}
+        self._lock = threading.Lock()
+        self._entregues = 0
+        self._resumos = 0
+        self._adiadas = 0
+
+    @property
+    def observer(self) -> Observer:
+        return self._observer
+
+    @property
+    def prioridade(self):
+        return self._observer.prioridade
+
+    @property
+    def prazo(self):
+        return self._observer.prazo
+
+    def preparar(self) -> None:
+        self._observer.preparar()
+
+    def _balde_de(self, destinatario: str) -> Optional[BaldeDeTokens]:
+        """Balde do destinatário, criado sob demanda. Requer self._lock."""
+        if self._taxa_destinatario is None:
+            return None
+        balde = self._baldes.get(destinatario)
+        if balde is None:
+            if len(self._baldes) >= self._max_destinatarios:
+                self._liberar_baldes()
+            balde = self._baldes[destinatario] = BaldeDeTokens(
+                self._taxa_destinatario, self._capacidade_destinatario, self._relogio)
+        else:
+            self._baldes.move_to_end(destinatario)
+        return balde
+
+    def _liberar_baldes(self) -> None:
+        """
+        Remove os baldes mais antigos que já estão cheios: recriá-los depois
+        dá o mesmo resultado. Requer self._lock.
+        """
+        for destinatario in list(self._baldes):
+            if len(self._baldes) < self._max_destinatarios:
+                break
+            if destinatario not in self._pendentes and self._baldes[destinatario].cheio:
+                del self._baldes[destinatario]
+
+    def _consumir(self, destinatario: str) -> float:
+        """
+        Consome um token do canal e do destinatário se ambos tiverem.
+        Retorna 0 se conseguiu, ou quantos segundos esperar. Requer self._lock.
+
+        O balde do canal pode ser compartilhado com outros decorators, então
+        o token dele é consumido atomicamente (consumir_ou_esperar) e só
+        depois que o do destinatário, protegido por self._lock, está garantido.
+        """
+        balde = self._balde_de(destinatario)
+        espera = balde.tempo_ate() if balde is not None else 0.0
+        if espera > 0:
+            if self._canal is not None:
+                espera = max(espera, self._canal.tempo_ate())
+            return espera
+        if self._canal is not None:
+            espera = self._canal.consumir_ou_esperar()
+            if espera > 0:
+                return espera
+        if balde is not None:
+            balde.consumir()
+        return 0.0
+
+    def update(self, mensagem: Mensagem) -> None:
+        destinatario = mensagem.destinatario
+        with self._lock:
+            fila = self._pendentes.get(destinatario)
+            if fila is not None:
+                # Já há um resumo agendado: preserva a ordem
+                fila.append(mensagem)
+                self._adiadas += 1
+                return
+            espera = self._consumir(destinatario)
+            if espera > 0:
+                self._pendentes[destinatario] = [mensagem]
+                self._adiadas += 1
+            else:
+                self._entregues += 1
+
+        if espera > 0:
+            self._temporizador.agendar(espera, lambda: self._tentar_resumo(destinatario))
+        else:
+            self._observer.update(mensagem)
+
+    def _tentar_resumo(self, destinatario: str) -> None:
+        with self._lock:
+            if destinatario not in self._pendentes:
+                return
+            espera = self._consumir(destinatario)
+            if espera == 0:
+                mensagens = self._pendentes.pop(destinatario)
+        if espera > 0:
+            self._temporizador.agendar(espera, lambda: self._tentar_resumo(destinatario))
+            return
+        self._enviar_resumo(mensagens)
+
+    def _enviar_resumo(self, mensagens: List[Mensagem]) -> None:
+        with self._lock:
+            if len(mensagens) > 1:
+                self._resumos += 1
+            else:
+                self._entregues += 1
+        if len(mensagens) == 1:
+            self._observer.update(mensagens[0])
+        elif self._agrupar is not None:
+            self._observer.update(self._agrupar(mensagens))
+        else:
+            self._observer.update_batch(mensagens)
+
+    def estatisticas(self) -> dict:
+        """Entregas imediatas, resumos enviados e mensagens adiadas/pendentes."""
+        with self._lock:
+            return {
+                'entregues': self._entregues,
+                'resumos': self._resumos,
+                'adiadas': self._adiadas,
+                'pendentes': sum(len(f) for f in self._pendentes.values()),
+            }
+
+    def flush(self) -> None:
+        """Envia imediatamente os resumos pendentes, ignorando os limites."""
+        with self._lock:
+            pendentes = list(self._pendentes.values())
+            self._pendentes.clear()
+        for mensagens in pendentes:
+            self._enviar_resumo(mensagens)
+
+    def close(self) -> None:
+        """Envia o que estiver pendente (o temporizador é compartilhado e continua)."""
+        self.flush()
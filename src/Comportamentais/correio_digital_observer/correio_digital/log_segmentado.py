@@ -0,0 +1,373 @@
+# src/correio_digital/log_segmentado.py
+
+import datetime
+import mmap
+import os
+import threading
+from array import array
+from typing import Iterator, List, Optional, Tuple
+from .armazenamento import ArmazenamentoDeMensagens
+from .models import Mensagem, MensagemCompacta, de_epoch_us, para_epoch_us
+from .serializacao import (
+    RegistroCorrompidoError,
+    codificar,
+    decodificar,
+    ler_epoch_us,
+    tamanho_total,
+    validar
+)
+from .temporizador import Agendamento, Temporizador
+
+_EXTENSAO = ".log"
+
+class _Segmento:
+    """
+    Um arquivo do log. O nome é o offset da primeira mensagem que ele
+    contém; 'posicoes' guarda a posição em bytes de cada registro.
+    """
+    __slots__ = ('base', 'caminho', 'posicoes', 'tamanho',
+                 'primeiro_epoch_us', 'ultimo_epoch_us', '_mmap')
+
+    def __init__(self, base: int, caminho: str):
+        self.base = base
+        self.caminho = caminho
+        self.posicoes = array('Q')
+        self.tamanho = 0
+        self.primeiro_epoch_us: Optional[int] = None
+        self.ultimo_epoch_us: Optional[int] = None
+        self._mmap: Optional[mmap.mmap] = None
+
+    @property
+    def proximo_offset(self) -> int:
+        return self.base + len(self.posicoes)
+
+    def mapear(self) -> Optional[mmap.mmap]:
+        """Mapeia o arquivo em memória (somente leitura). Reaproveita o mapa."""
+        if self._mmap is None or len(self._mmap) != self.tamanho:
+            self.desmapear()
+            if self.tamanho == 0:
+                return None
+            with open(self.caminho, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), self.tamanho, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def desmapear(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+class ArmazenamentoEmDisco(ArmazenamentoDeMensagens):
+    """
+    Armazenamento durável: log append-only dividido em segmentos.
+
+    - Cada registro tem prefixo de tamanho e CRC (ver serializacao.py);
+    - as escritas são agrupadas e o fsync é feito a cada 'lote_fsync'
+      registros ou, pelo Temporizador, 'intervalo_fsync' segundos depois
+      da primeira escrita pendente (group commit), além de sincronizar()
+      e close(); criar ou rotacionar um segmento também sincroniza o
+      diretório, para que o arquivo novo sobreviva a uma queda;
+    - a leitura usa mmap: ao abrir, apenas os cabeçalhos são percorridos
+      para montar o índice de posições, e replay() decodifica um registro
+      por vez sem carregar os arquivos inteiros;
+    - o segmento ativo é rotacionado por tamanho ou idade e os segmentos
+      antigos são apagados por expirar() conforme a retenção.
+
+    Um registro incompleto no fim do último segmento (queda no meio de uma
+    escrita) é descartado ao abrir.
+    """
+    def __init__(self, diretorio: str,
+                 max_bytes_segmento: int = 64 * 1024 * 1024,
+                 max_idade_segmento: Optional[datetime.timedelta] = None,
+                 retencao_bytes: Optional[int] = None,
+                 retencao_idade: Optional[datetime.timedelta] = None,
+                 lote_fsync: int = 100,
+                 intervalo_fsync: float = 0.05,
+                 temporizador: Optional[Temporizador] = None):
+        """
+        Args:
+            diretorio: Pasta onde os segmentos são gravados
+            max_bytes_segmento: Tamanho a partir do qual um novo segmento é aberto
+            max_idade_segmento: Diferença máxima entre a primeira e a última
+                mensagem de um segmento antes da rotação (opcional)
+            retencao_bytes: Tamanho total máximo do log (opcional)
+            retencao_idade: Idade máxima de um segmento fechado (opcional)
+            lote_fsync: Registros pendentes que disparam um fsync
+            intervalo_fsync: Segundos máximos entre uma escrita e o fsync dela
+            temporizador: Temporizador compartilhado (por padrão, um próprio)
+        """
+        self._diretorio = diretorio
+        self._max_bytes_segmento = max_bytes_segmento
+        self._max_idade_segmento = max_idade_segmento
+        self._retencao_bytes = retencao_bytes
+        self._retencao_idade = retencao_idade
+        self._lote_fsync = lote_fsync
+        self._intervalo_fsync = intervalo_fsync
+        self._temporizador = temporizador or Temporizador("fsync")
+        self._temporizador_proprio = temporizador is None
+        self._fsync_agendado: Optional[Agendamento] = None
+        # Protege o arquivo ativo: o fsync agendado roda na thread do temporizador
+        self._lock = threading.RLock()
+
+        os.makedirs(diretorio, exist_ok=True)
+        self._segmentos: List[_Segmento] = self._recuperar()
+        if not self._segmentos:
+            self._segmentos.append(self._novo_segmento(0))
+
+        self._arquivo = open(self._segmentos[-1].caminho, 'ab')
+        self._pendentes = 0
+        self._ultima: Optional[Mensagem] = None
+
+    # ----------------------------------------------------------------
+    # Abertura e recuperação
+    # ----------------------------------------------------------------
+
+    def _caminho(self, base: int) -> str:
+        return os.path.join(self._diretorio, f"{base:020d}{_EXTENSAO}")
+
+    def _novo_segmento(self, base: int) -> _Segmento:
+        segmento = _Segmento(base, self._caminho(base))
+        open(segmento.caminho, 'ab').close()
+        self._sincronizar_diretorio()
+        return segmento
+
+    def _sincronizar_diretorio(self) -> None:
+        """Grava no disco a entrada de diretório de arquivos criados ou apagados."""
+        if os.name != 'posix':
+            return  # Windows não permite abrir um diretório para fsync
+        fd = os.open(self._diretorio, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _recuperar(self) -> List[_Segmento]:
+        nomes = sorted(n for n in os.listdir(self._diretorio) if n.endswith(_EXTENSAO))
+        segmentos = [_Segmento(int(n[:-len(_EXTENSAO)]), os.path.join(self._diretorio, n))
+                     for n in nomes]
+        for i, segmento in enumerate(segmentos):
+            # Segmentos fechados já passaram por fsync; só o último pode ter
+            # uma escrita interrompida, então só ele tem o CRC conferido.
+            self._indexar(segmento, conferir_crc=(i == len(segmentos) - 1))
+        return segmentos
+
+    def _indexar(self, segmento: _Segmento, conferir_crc: bool) -> None:
+        """Monta o índice de posições lendo apenas os cabeçalhos via mmap."""
+        segmento.tamanho = os.path.getsize(segmento.caminho)
+        mapa = segmento.mapear()
+        if mapa is None:
+            return
+
+        posicao = 0
+        medir = validar if conferir_crc else tamanho_total
+        try:
+            while posicao < len(mapa):
+                total = medir(mapa, posicao)
+                segmento.posicoes.append(posicao)
+                posicao += total
+        except RegistroCorrompidoError:
+            pass
+
+        if segmento.posicoes:
+            segmento.primeiro_epoch_us = ler_epoch_us(mapa, segmento.posicoes[0])
+            segmento.ultimo_epoch_us = ler_epoch_us(mapa, segmento.posicoes[-1])
+
+        if posicao < segmento.tamanho:
+            # Descarta a cauda incompleta
+            segmento.desmapear()
+            os.truncate(segmento.caminho, posicao)
+            segmento.tamanho = posicao
+
+    # ----------------------------------------------------------------
+    # Escrita
+    # ----------------------------------------------------------------
+
+    def adicionar(self, mensagem: Mensagem) -> int:
+        registro = MensagemCompacta.de_mensagem(mensagem)
+        with self._lock:
+            return self._adicionar(mensagem, registro)
+
+    def _adicionar(self, mensagem: Mensagem, registro: MensagemCompacta) -> int:
+        self._rotacionar_se_necessario(registro.epoch_us)
+
+        ativo = self._segmentos[-1]
+        offset = ativo.proximo_offset
+        dados = codificar(registro)
+        self._arquivo.write(dados)
+        ativo.posicoes.append(ativo.tamanho)
+        ativo.tamanho += len(dados)
+        if ativo.primeiro_epoch_us is None:
+            ativo.primeiro_epoch_us = registro.epoch_us
+        ativo.ultimo_epoch_us = registro.epoch_us
+        self._ultima = mensagem
+
+        self._pendentes += 1
+        if self._pendentes >= self._lote_fsync:
+            self.sincronizar()
+        elif self._fsync_agendado is None:
+            # Sem novas escritas, o fsync ainda acontece no prazo
+            self._fsync_agendado = self._temporizador.agendar(
+                self._intervalo_fsync, self._sincronizar_agendado)
+        return offset
+
+    def sincronizar(self) -> None:
+        """Grava no disco (fsync) tudo o que foi escrito até agora."""
+        with self._lock:
+            if self._fsync_agendado is not None:
+                self._fsync_agendado.cancelar()
+                self._fsync_agendado = None
+            if self._arquivo.closed:
+                return
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+            self._pendentes = 0
+
+    def _sincronizar_agendado(self) -> None:
+        with self._lock:
+            self._fsync_agendado = None
+            if self._pendentes:
+                self.sincronizar()
+
+    def _rotacionar_se_necessario(self, epoch_us: int) -> None:
+        ativo = self._segmentos[-1]
+        if not ativo.posicoes:
+            return
+        por_tamanho = ativo.tamanho >= self._max_bytes_segmento
+        por_idade = (self._max_idade_segmento is not None
+                     and epoch_us - ativo.primeiro_epoch_us
+                     >= self._max_idade_segmento // datetime.timedelta(microseconds=1))
+        if por_tamanho or por_idade:
+            self.sincronizar()
+            self._arquivo.close()
+            novo = self._novo_segmento(ativo.proximo_offset)
+            self._segmentos.append(novo)
+            self._arquivo = open(novo.caminho, 'ab')
+            # A idade é medida pelos timestamps das mensagens
+            self.expirar(de_epoch_us(epoch_us))
+
+    def expirar(self, agora: Optional[datetime.datetime] = None) -> int:
+        """
+        Apaga segmentos fechados que passaram da retenção por idade ou
+        que fazem o log ultrapassar a retenção por tamanho.
+
+        Returns:
+            Quantidade de segmentos apagados
+        """
+        with self._lock:
+            limite_us = None
+            if self._retencao_idade is not None:
+                limite_us = para_epoch_us((agora or datetime.datetime.now()) - self._retencao_idade)
+            total_bytes = sum(s.tamanho for s in self._segmentos)
+
+            apagados = 0
+            while len(self._segmentos) > 1:
+                antigo = self._segmentos[0]
+                vencido = (limite_us is not None and antigo.ultimo_epoch_us is not None
+                           and antigo.ultimo_epoch_us < limite_us)
+                excedente = self._retencao_bytes is not None and total_bytes > self._retencao_bytes
+                if not (vencido or excedente):
+                    break
+                antigo.desmapear()
+                os.remove(antigo.caminho)
+                total_bytes -= antigo.tamanho
+                self._segmentos.pop(0)
+                apagados += 1
+            if apagados:
+                # Como na criação de um segmento: a remoção só é durável
+                # depois do fsync do diretório
+                self._sincronizar_diretorio()
+            return apagados
+
+    def close(self) -> None:
+        """Sincroniza e fecha os arquivos e o temporizador próprio."""
+        with self._lock:
+            if self._arquivo.closed:
+                return
+            self.sincronizar()
+            self._arquivo.close()
+            for segmento in self._segmentos:
+                segmento.desmapear()
+        # Fora do lock: o fsync agendado pode estar esperando por ele
+        if self._temporizador_proprio:
+            self._temporizador.close()
+
+    # ----------------------------------------------------------------
+    # Leitura
+    # ----------------------------------------------------------------
+
+    def _mapa(self, segmento: _Segmento) -> Optional[mmap.mmap]:
+        if segmento is self._segmentos[-1]:
+            with self._lock:
+                if not self._arquivo.closed:
+                    self._arquivo.flush()
+        return segmento.mapear()
+
+    def _segmento_de(self, offset: int) -> Optional[_Segmento]:
+        if not self.primeiro_offset <= offset < self.proximo_offset:
+            return None
+        # Busca binária pelo último segmento com base <= offset
+        baixo, alto = 0, len(self._segmentos) - 1
+        while baixo < alto:
+            meio = (baixo + alto + 1) // 2
+            if self._segmentos[meio].base <= offset:
+                baixo = meio
+            else:
+                alto = meio - 1
+        return self._segmentos[baixo]
+
+    def obter(self, offset: int) -> Optional[Mensagem]:
+        with self._lock:
+            segmento = self._segmento_de(offset)
+            if segmento is None:
+                return None
+            registro, _ = decodificar(self._mapa(segmento),
+                                      segmento.posicoes[offset - segmento.base])
+        return registro.para_mensagem()
+
+    def replay(self, desde: int = 0) -> Iterator[MensagemCompacta]:
+        """
+        Percorre os registros a partir do offset 'desde', um por vez,
+        direto do arquivo mapeado em memória.
+
+        Cada registro é lido sob o lock: se expirar() apagar o segmento no
+        meio da leitura, a iteração termina ali (as mensagens seguintes
+        aparecem como perdidas pela retenção na próxima leitura).
+        """
+        with self._lock:
+            desde = max(desde, self.primeiro_offset)
+            segmentos = list(self._segmentos)
+        for segmento in segmentos:
+            if segmento.proximo_offset <= desde:
+                continue
+            with self._lock:
+                if segmento not in self._segmentos:
+                    return
+                mapa = self._mapa(segmento)
+            if mapa is None:
+                continue
+            n = len(segmento.posicoes)
+            posicao = segmento.posicoes[max(0, desde - segmento.base)]
+            for _ in range(max(0, desde - segmento.base), n):
+                with self._lock:
+                    if mapa.closed:
+                        # Desmapeado por expirar() ou remapeado porque o segmento cresceu
+                        if segmento not in self._segmentos:
+                            return
+                        mapa = self._mapa(segmento)
+                    registro, posicao = decodificar(mapa, posicao)
+                yield registro
+
+    def registros(self, desde: int = 0) -> Iterator[Tuple[int, MensagemCompacta]]:
+        return enumerate(self.replay(desde), start=max(desde, self.primeiro_offset))
+
+    def ultima(self) -> Optional[Mensagem]:
+        if self._ultima is None and len(self):
+            self._ultima = self.obter(self.proximo_offset - 1)
+        return self._ultima
+
+    @property
+    def primeiro_offset(self) -> int:
+        return self._segmentos[0].base
+
+    @property
+    def proximo_offset(self) -> int:
+        return self._segmentos[-1].proximo_offset
@@ -0,0 +1,105 @@
+# src/correio_digital/metricas.py
+
+import math
+import threading
+from typing import Dict, List
+
+class HistogramaLatencia:
+    """
+    Histograma de latências com baldes em escala logarítmica (4 baldes por
+    potência de 2, erro relativo < 19%). Registrar é O(1) e a memória é fixa,
+    independente da quantidade de amostras.
+    """
+    _BALDES_POR_OITAVA = 4
+    _TOTAL_BALDES = 40 * _BALDES_POR_OITAVA   # até ~2^40 us (~12 dias)
+
+    def __init__(self):
+        self._baldes: List[int] = [0] * self._TOTAL_BALDES
+        self.contagem = 0
+        self.soma_s = 0.0
+        self.maximo_s = 0.0
+
+    def registrar(self, segundos: float) -> None:
+        micros = segundos * 1e6
+        if micros < 1:
+            indice = 0
+        else:
+            indice = min(int(math.log2(micros) * self._BALDES_POR_OITAVA) + 1,
+                         self._TOTAL_BALDES - 1)
+        self._baldes[indice] += 1
+        self.contagem += 1
+        self.soma_s += segundos
+        if segundos > self.maximo_s:
+            self.maximo_s = segundos
+
+    def percentil(self, p: float) -> float:
+        """Limite superior (em segundos) do balde que contém o percentil p (0-100)."""
+        if not self.contagem:
+            return 0.0
+        alvo = math.ceil(self.contagem * p / 100)
+        acumulado = 0
+        for indice, quantidade in enumerate(self._baldes):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                limite_us = 2 ** (indice / self._BALDES_POR_OITAVA)
+                return min(limite_us / 1e6, self.maximo_s)
+        return self.maximo_s
+
+    def resumo(self) -> dict:
+        """Contagem e latências (em milissegundos)."""
+        return {
+            'contagem': self.contagem,
+            'media_ms': (self.soma_s / self.contagem * 1e3) if self.contagem else 0.0,
+            'p50_ms': self.percentil(50) * 1e3,
+            'p95_ms': self.percentil(95) * 1e3,
+            'p99_ms': self.percentil(99) * 1e3,
+            'max_ms': self.maximo_s * 1e3,
+        }
+
+class Metricas:
+    """
+    Contadores e histogramas do SistemaDeMensagens. Seguro para uso por
+    várias threads (ex: DespachanteThreadPool).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.mensagens_recebidas = 0
+        self.notificacoes_enviadas = 0
+        self.notificacoes_falhas = 0
+        self._latencias: Dict[str, HistogramaLatencia] = {}
+
+    def registrar_recebidas(self, quantidade: int = 1) -> None:
+        with self._lock:
+            self.mensagens_recebidas += quantidade
+
+    def registrar_entrega(self, observer: object, quantidade: int, segundos: float) -> None:
+        """Uma chamada de update/update_batch bem-sucedida com 'quantidade' mensagens."""
+        nome = observer.__class__.__name__
+        with self._lock:
+            self.notificacoes_enviadas += quantidade
+            histograma = self._latencias.get(nome)
+            if histograma is None:
+                histograma = self._latencias[nome] = HistogramaLatencia()
+            histograma.registrar(segundos)
+
+    def registrar_falha(self, observer: object, quantidade: int) -> None:
+        with self._lock:
+            self.notificacoes_falhas += quantidade
+
+    def snapshot(self) -> dict:
+        """
+        Cópia dos contadores, a taxa de sucesso das tentativas de entrega
+        e o resumo das latências por classe de observador.
+        """
+        with self._lock:
+            tentativas = self.notificacoes_enviadas + self.notificacoes_falhas
+            return {
+                'mensagens_recebidas': self.mensagens_recebidas,
+                'notificacoes_enviadas': self.notificacoes_enviadas,
+                'notificacoes_falhas': self.notificacoes_falhas,
+                'taxa_sucesso': self.notificacoes_enviadas / tentativas if tentativas else 1.0,
+                'latencia_por_observador': {
+                    nome: histograma.resumo()
+                    for nome, histograma in self._latencias.items()
+                },
+            }
@@ -1,7 +1,15 @@
 # src/correio_digital/models.py
 
 import datetime
+import functools
+import sys
 from dataclasses import dataclass
+from .renderizacao import Renderizacao
+
+# Referência para converter timestamps em inteiros (microssegundos). Os
+# timestamps do sistema são "naive", então a conversão preserva o fuso original.
+_EPOCA = datetime.datetime(1970, 1, 1)
+_MICROSSEGUNDO = datetime.timedelta(microseconds=1)
 
 @dataclass
 class Mensagem:
@@ -12,3 +20,45 @@ class Mensagem:
     destinatario: str
     conteudo: str
     timestamp: datetime.datetime
+
+    @functools.cached_property
+    def renderizacao(self) -> Renderizacao:
+        """Prévia, assunto e resumo, calculados uma vez e compartilhados."""
+        return Renderizacao(self.remetente, self.destinatario, self.conteudo)
+
+def para_epoch_us(timestamp: datetime.datetime) -> int:
+    """Converte um datetime em microssegundos desde 1970 (inteiro exato)."""
+    return (timestamp - _EPOCA) // _MICROSSEGUNDO
+
+def de_epoch_us(epoch_us: int) -> datetime.datetime:
+    """Inverso de para_epoch_us."""
+    return _EPOCA + datetime.timedelta(microseconds=epoch_us)
+
+class MensagemCompacta:
+    """
+    Representação compacta de uma Mensagem para armazenamento.
+
+    Usa __slots__ (sem __dict__ por instância), interna remetente e
+    destinatário (os mesmos usuários se repetem em milhares de mensagens)
+    e guarda o timestamp como inteiro em vez de um objeto datetime.
+    """
+    __slots__ = ('remetente', 'destinatario', 'conteudo', 'epoch_us')
+
+    def __init__(self, remetente: str, destinatario: str, conteudo: str, epoch_us: int):
+        self.remetente = sys.intern(remetente)
+        self.destinatario = sys.intern(destinatario)
+        self.conteudo = conteudo
+        self.epoch_us = epoch_us
+
+    @classmethod
+    def de_mensagem(cls, mensagem: Mensagem) -> 'MensagemCompacta':
+        return cls(mensagem.remetente, mensagem.destinatario,
+                   mensagem.conteudo, para_epoch_us(mensagem.timestamp))
+
+    def para_mensagem(self) -> Mensagem:
+        return Mensagem(
+            remetente=self.remetente,
+            destinatario=self.destinatario,
+            conteudo=self.conteudo,
+            timestamp=de_epoch_us(self.epoch_us)
+        )
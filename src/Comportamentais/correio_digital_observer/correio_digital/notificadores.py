@@ -1,27 +1,76 @@
 # src/correio_digital/notificadores.py
 
-from .observer_pattern import Observer
+import logging
+from typing import List, Optional
+from .observer_pattern import Observer, Prioridade
 from .models import Mensagem
+from .renderizacao import Modelo
 
-class NotificadorWeb(Observer):
+logger = logging.getLogger(__name__)
+
+class NotificadorComModelo(Observer):
+    """
+    Base dos notificadores: o texto vem de MODELO, compilado uma vez no
+    attach (preparar) e renderizado uma vez por mensagem, mesmo quando
+    vários notificadores usam o mesmo modelo.
+
+    Os notificadores de exemplo só registram o texto no log, então só
+    renderizam quando o nível INFO está ativo.
+    """
+    MODELO = "{resumo}"
+    _modelo: Optional[Modelo] = None
+
+    def preparar(self) -> None:
+        self._modelo = Modelo.compilar(self.MODELO)
+
+    def renderizar(self, mensagem: Mensagem) -> str:
+        if self._modelo is None:
+            self.preparar()
+        return self._modelo.renderizar(mensagem)
+
+class NotificadorWeb(NotificadorComModelo):
     """
     Um observador concreto que simula o envio de uma notificação
     para a interface web.
     """
+    MODELO = "{resumo}"
+    prioridade = Prioridade.ALTA
+    prazo = 30.0
+
     def update(self, mensagem: Mensagem) -> None:
-        print(f"  [WEB] Notificação Push: 'Nova mensagem de {mensagem.remetente}: {mensagem.conteudo[:20]}...'")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("  [WEB] Notificação Push: '%s'", self.renderizar(mensagem))
 
-class NotificadorEmail(Observer):
+class NotificadorEmail(NotificadorComModelo):
     """
     Um observador concreto que simula o envio de um e-mail.
     """
+    MODELO = "Assunto: {assunto}"
+    prioridade = Prioridade.BAIXA
+
     def update(self, mensagem: Mensagem) -> None:
-        print(f"  [EMAIL] Enviando e-mail para {mensagem.destinatario}: 'Assunto: Nova mensagem de {mensagem.remetente}'")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("  [EMAIL] Enviando e-mail para %s: '%s'",
+                        mensagem.destinatario, self.renderizar(mensagem))
 
-class NotificadorMobile(Observer):
+    def update_batch(self, mensagens: List[Mensagem]) -> None:
+        """
+        Envia todo o lote em uma única chamada ao provedor de e-mail,
+        em vez de um envio por mensagem.
+        """
+        destinatarios = {m.destinatario for m in mensagens}
+        logger.info("  [EMAIL] Enviando lote de %d e-mails para %d destinatários",
+                    len(mensagens), len(destinatarios))
+
+class NotificadorMobile(NotificadorComModelo):
     """
     Um observador concreto que simula o envio de uma notificação
     para um dispositivo móvel.
     """
+    MODELO = "{remetente} disse: {previa:15}..."
+    prioridade = Prioridade.URGENTE
+    prazo = 10.0
+
     def update(self, mensagem: Mensagem) -> None:
-        print(f"  [MOBILE] Notificação (Pling!): '{mensagem.remetente} disse: {mensagem.conteudo[:15]}...'")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("  [MOBILE] Notificação (Pling!): '%s'", self.renderizar(mensagem))
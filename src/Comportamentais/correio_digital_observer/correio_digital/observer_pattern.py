@@ -1,18 +1,62 @@
 # src/correio_digital/observer_pattern.py
 
 import abc
+import enum
+from typing import List, Optional
 from .models import Mensagem  # Importação relativa
 
+class Prioridade(enum.IntEnum):
+    """
+    Classe de prioridade de um observador. Valores menores são entregues
+    primeiro pelo DespachantePrioritario.
+    """
+    URGENTE = 0
+    ALTA = 10
+    NORMAL = 50
+    BAIXA = 100
+
 class Observer(metaclass=abc.ABCMeta):
     """
     Interface do Observer. Define o método update que os
     observadores concretos devem implementar.
+
+    'prioridade' e 'prazo' (segundos para a entrega ainda fazer sentido;
+    None = sem prazo) só são usados pelo DespachantePrioritario.
     """
+    prioridade: Prioridade = Prioridade.NORMAL
+    prazo: Optional[float] = None
+
     @abc.abstractmethod
     def update(self, mensagem: Mensagem) -> None:
         """Recebe a atualização do Subject (push model)."""
         pass
 
+    def preparar(self) -> None:
+        """
+        Chamado pelo Subject no attach. Observadores podem sobrescrever
+        para fazer trabalho único, como compilar modelos de texto.
+        """
+        pass
+
+    def update_batch(self, mensagens: List[Mensagem]) -> None:
+        """
+        Recebe várias mensagens de uma só vez (ingestão em lote).
+        Por padrão chama update para cada uma; observadores que conseguem
+        enviar em lote (ex: e-mail) podem sobrescrever este método.
+        """
+        for mensagem in mensagens:
+            self.update(mensagem)
+
+class AsyncObserver(metaclass=abc.ABCMeta):
+    """
+    Variante assíncrona do Observer. Usada pelo SistemaDeMensagensAsync
+    para entregar a mensagem a todos os observadores concorrentemente.
+    """
+    @abc.abstractmethod
+    async def update(self, mensagem: Mensagem) -> None:
+        """Recebe a atualização do Subject (push model) sem bloquear o loop."""
+        pass
+
 class Subject(metaclass=abc.ABCMeta):
     """
     Interface do Subject. Define os métodos para anexar,
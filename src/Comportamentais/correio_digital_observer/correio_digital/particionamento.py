@@ -0,0 +1,269 @@
+# src/correio_digital/particionamento.py
+
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .armazenamento import ArmazenamentoDeMensagens
+from .observer_pattern import Observer
+from .sistema import SistemaDeMensagens
+from .temporizador import Temporizador
+
+logger = logging.getLogger(__name__)
+
+FabricaDeArmazenamento = Callable[[int], ArmazenamentoDeMensagens]
+
+def _executar_particao(indice: int, entrada, saida,
+                       fabrica: Optional[FabricaDeArmazenamento]) -> None:
+    """
+    Laço de um processo de partição. Ele é dono do seu próprio
+    SistemaDeMensagens, observadores e armazenamento.
+    """
+    armazenamento = fabrica(indice) if fabrica is not None else None
+    sistema = SistemaDeMensagens(armazenamento=armazenamento)
+    # O sistema guarda só referências fracas; aqui ficam as fortes
+    observadores: Dict[int, Observer] = {}
+
+    while True:
+        comando, *argumentos = entrada.get()
+        if comando == 'mensagens':
+            sistema.novasMensagens(argumentos[0])
+        elif comando == 'attach':
+            token, observer, destinatario = argumentos
+            # O mesmo observador anexado de novo (outro destinatário) chega
+            # como outra cópia: reaproveita a que já está assinada
+            observer = observadores.setdefault(token, observer)
+            sistema.attach(observer, destinatario=destinatario)
+        elif comando == 'detach':
+            observer = observadores.pop(argumentos[0], None)
+            if observer is not None:
+                sistema.detach(observer)
+        elif comando == 'metricas':
+            saida.put(sistema.metricas())
+        elif comando == 'sincronizar':
+            sistema.flush()
+            saida.put(True)
+        elif comando == 'parar':
+            sistema.close()
+            saida.put(True)
+            return
+
+class SistemaParticionado:
+    """
+    Front end que distribui o SistemaDeMensagens entre N processos.
+
+    Cada destinatário é mapeado para uma partição por um hash estável
+    (crc32), então todas as mensagens de uma caixa de entrada são
+    processadas, armazenadas e notificadas pelo mesmo processo, sem
+    disputar o GIL com as demais partições.
+
+    A API segue a do SistemaDeMensagens (novaMensagem, novasMensagens,
+    attach, detach). As mensagens são enviadas aos processos em lotes
+    (até 'tamanho_lote_ipc' mensagens ou 'atraso_max_ipc' segundos),
+    o que dilui o custo de serialização e da fila entre processos.
+
+    Os observadores são serializados (pickle) e recriados dentro das
+    partições: um observador curinga ganha uma cópia em cada partição.
+    """
+    # Intervalo (segundos) entre verificações de que a partição está viva
+    INTERVALO_VERIFICACAO = 0.5
+
+    def __init__(self, num_particoes: Optional[int] = None,
+                 tamanho_lote_ipc: int = 256,
+                 atraso_max_ipc: float = 0.005,
+                 fabrica_armazenamento: Optional[FabricaDeArmazenamento] = None):
+        """
+        Args:
+            num_particoes: Quantidade de processos (padrão: número de CPUs)
+            tamanho_lote_ipc: Mensagens acumuladas antes de enviar à partição
+            atraso_max_ipc: Tempo máximo que uma mensagem espera no lote
+            fabrica_armazenamento: Função que recebe o índice da partição e
+                cria o armazenamento dela (deve poder ser serializada)
+        """
+        self._num_particoes = num_particoes or os.cpu_count() or 1
+        self._tamanho_lote = tamanho_lote_ipc
+        self._atraso_max = atraso_max_ipc
+
+        contexto = multiprocessing.get_context()
+        self._entradas = [contexto.Queue() for _ in range(self._num_particoes)]
+        self._saidas = [contexto.Queue() for _ in range(self._num_particoes)]
+        self._processos = [
+            contexto.Process(
+                target=_executar_particao,
+                args=(i, self._entradas[i], self._saidas[i], fabrica_armazenamento),
+                name=f"particao-{i}",
+                daemon=True
+            )
+            for i in range(self._num_particoes)
+        ]
+        for processo in self._processos:
+            processo.start()
+
+        self._lotes: List[List[Tuple[str, str, str]]] = [[] for _ in range(self._num_particoes)]
+        self._lock = threading.Lock()
+        self._temporizador = Temporizador("particionamento")
+        self._tokens = itertools.count()
+        # id(observer) -> (observer, token, partições onde foi anexado)
+        self._anexados: Dict[int, Tuple[Observer, int, List[int]]] = {}
+        self._fechado = False
+
+    @property
+    def num_particoes(self) -> int:
+        return self._num_particoes
+
+    def particao_de(self, destinatario: str) -> int:
+        """Partição responsável pelo destinatário (estável entre execuções)."""
+        return zlib.crc32(destinatario.encode('utf-8')) % self._num_particoes
+
+    # ----------------------------------------------------------------
+    # Observadores
+    # ----------------------------------------------------------------
+
+    def attach(self, observer: Observer, destinatario: Optional[str] = None) -> None:
+        """
+        Anexa o observador às partições relevantes: todas, se for curinga,
+        ou apenas a dona do destinatário.
+        """
+        particoes = (list(range(self._num_particoes)) if destinatario is None
+                     else [self.particao_de(destinatario)])
+        with self._lock:
+            anterior = self._anexados.get(id(observer))
+            if anterior is not None:
+                token, ja_anexado = anterior[1], anterior[2]
+            else:
+                token, ja_anexado = next(self._tokens), []
+            self._anexados[id(observer)] = (observer, token,
+                                            sorted(set(ja_anexado) | set(particoes)))
+            for particao in particoes:
+                self._enviar_antes_de_comando(particao, ('attach', token, observer, destinatario))
+        logger.debug("[Particionado] %s foi anexado em %d partições.",
+                     observer.__class__.__name__, len(particoes))
+
+    def detach(self, observer: Observer) -> None:
+        with self._lock:
+            anexado = self._anexados.pop(id(observer), None)
+            if anexado is not None:
+                _, token, particoes = anexado
+                for particao in particoes:
+                    self._enviar_antes_de_comando(particao, ('detach', token))
+        if anexado is None:
+            logger.warning("[Particionado] %s não está na lista.", observer.__class__.__name__)
+            return
+        logger.debug("[Particionado] %s foi desanexado.", observer.__class__.__name__)
+
+    # ----------------------------------------------------------------
+    # Ingestão
+    # ----------------------------------------------------------------
+
+    def novaMensagem(self, remetente: str, destinatario: str, conteudo: str) -> None:
+        """Encaminha a mensagem (em lote) para a partição do destinatário."""
+        particao = self.particao_de(destinatario)
+        with self._lock:
+            if self._fechado:
+                raise RuntimeError("Sistema particionado já foi fechado")
+            lote = self._lotes[particao]
+            lote.append((remetente, destinatario, conteudo))
+            if len(lote) >= self._tamanho_lote:
+                self._enviar(particao)
+                return
+            if len(lote) == 1:
+                # Sob o lock: close() não fecha o temporizador no meio do caminho
+                self._temporizador.agendar(self._atraso_max,
+                                           lambda: self._enviar_com_lock(particao))
+
+    def novasMensagens(self, mensagens: Iterable[Tuple[str, str, str]]) -> int:
+        """Ingestão em lote; retorna a quantidade de mensagens encaminhadas."""
+        total = 0
+        for remetente, destinatario, conteudo in mensagens:
+            self.novaMensagem(remetente, destinatario, conteudo)
+            total += 1
+        return total
+
+    def _enviar(self, particao: int) -> None:
+        """Envia o lote acumulado da partição. Requer self._lock."""
+        lote = self._lotes[particao]
+        if lote:
+            self._lotes[particao] = []
+            self._entradas[particao].put(('mensagens', lote))
+
+    def _enviar_antes_de_comando(self, particao: int, comando: tuple) -> None:
+        """
+        Envia o lote pendente e depois o comando (attach/detach), para que o
+        comando valha exatamente a partir das mensagens publicadas depois
+        dele. Requer self._lock.
+        """
+        self._enviar(particao)
+        self._entradas[particao].put(comando)
+
+    def _enviar_com_lock(self, particao: int) -> None:
+        with self._lock:
+            self._enviar(particao)
+
+    def _receber(self, particao: int):
+        """
+        Resposta da partição. Não espera para sempre: se o processo morreu,
+        levanta RuntimeError em vez de travar quem chamou.
+        """
+        while True:
+            try:
+                return self._saidas[particao].get(timeout=self.INTERVALO_VERIFICACAO)
+            except queue.Empty:
+                processo = self._processos[particao]
+                if not processo.is_alive():
+                    raise RuntimeError(f"Partição {particao} terminou inesperadamente "
+                                       f"(exitcode {processo.exitcode})") from None
+
+    def flush(self) -> None:
+        """Envia os lotes pendentes e espera todas as partições processarem."""
+        with self._lock:
+            for particao in range(self._num_particoes):
+                self._enviar(particao)
+        for entrada in self._entradas:
+            entrada.put(('sincronizar',))
+        for particao in range(self._num_particoes):
+            self._receber(particao)
+
+    def metricas(self) -> dict:
+        """
+        Métricas somadas de todas as partições, mais o snapshot de cada
+        uma em 'particoes'.
+        """
+        self.flush()
+        for entrada in self._entradas:
+            entrada.put(('metricas',))
+        por_particao = [self._receber(particao) for particao in range(self._num_particoes)]
+        chaves = ('mensagens_recebidas', 'notificacoes_enviadas', 'notificacoes_falhas')
+        total = {chave: sum(m[chave] for m in por_particao) for chave in chaves}
+        total['particoes'] = por_particao
+        return total
+
+    def close(self) -> None:
+        """
+        Entrega o que estiver pendente e encerra os processos. Se alguma
+        partição morreu, as demais são encerradas e então RuntimeError é levantado.
+        """
+        with self._lock:
+            if self._fechado:
+                return
+            self._fechado = True
+            for particao in range(self._num_particoes):
+                self._enviar(particao)
+        self._temporizador.close()
+        for entrada in self._entradas:
+            entrada.put(('parar',))
+        mortas = []
+        for particao in range(self._num_particoes):
+            try:
+                self._receber(particao)
+            except RuntimeError as erro:
+                # Encerra as demais mesmo assim e avisa no final
+                logger.error("[Particionado] %s", erro)
+                mortas.append(particao)
+        for processo in self._processos:
+            processo.join()
+        if mortas:
+            raise RuntimeError(f"Partições terminaram inesperadamente: {mortas}")
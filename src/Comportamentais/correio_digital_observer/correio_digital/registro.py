@@ -0,0 +1,86 @@
+# src/correio_digital/registro.py
+
+import weakref
+from typing import Any, Dict, List, Tuple
+from .observer_pattern import Observer
+
+class _Referencia(weakref.ref):
+    """Referência fraca que lembra a chave (id) sob a qual foi registrada."""
+    __slots__ = ('chave', 'valor')
+
+class RegistroDeObservadores:
+    """
+    Registro de observadores ordenado por inserção e indexado por identidade.
+
+    - attach/detach custam O(1) (dict por id(observer), sem varrer listas);
+    - guarda apenas referências fracas: uma sessão descartada sem detach é
+      coletada normalmente e removida do registro automaticamente;
+    - snapshot() devolve uma tupla estável, para que o notify itere sem
+      ser afetado por attach/detach feitos durante a entrega. A tupla não
+      é guardada em cache: ela manteria os observadores vivos.
+
+    Cada observador pode carregar um valor associado (ex: as chaves
+    das suas assinaturas).
+    """
+    def __init__(self):
+        self._refs: Dict[int, _Referencia] = {}
+        self._mortas: List[_Referencia] = []
+
+    def _ao_coletar(self, ref: _Referencia) -> None:
+        # Chamado pelo coletor de lixo: apenas anota, a remoção é feita
+        # na próxima operação para não mexer no dict durante uma iteração.
+        self._mortas.append(ref)
+
+    def _podar(self) -> None:
+        while self._mortas:
+            ref = self._mortas.pop()
+            if self._refs.get(ref.chave) is ref:
+                del self._refs[ref.chave]
+
+    def adicionar(self, observer: Observer, valor: Any = None) -> bool:
+        """Registra o observador. Retorna False se ele já estava registrado."""
+        self._podar()
+        chave = id(observer)
+        atual = self._refs.get(chave)
+        if atual is not None and atual() is observer:
+            return False
+
+        ref = _Referencia(observer, self._ao_coletar)
+        ref.chave = chave
+        ref.valor = valor
+        self._refs[chave] = ref
+        return True
+
+    def remover(self, observer: Observer) -> bool:
+        """Remove o observador. Retorna False se ele não estava registrado."""
+        self._podar()
+        chave = id(observer)
+        atual = self._refs.get(chave)
+        if atual is None or atual() is not observer:
+            return False
+        del self._refs[chave]
+        return True
+
+    def valor(self, observer: Observer, padrao: Any = None) -> Any:
+        """Valor associado ao observador no registro."""
+        atual = self._refs.get(id(observer))
+        if atual is None or atual() is not observer:
+            return padrao
+        return atual.valor
+
+    def snapshot(self) -> Tuple[Observer, ...]:
+        """Observadores vivos, na ordem em que foram registrados."""
+        self._podar()
+        vivos = (ref() for ref in list(self._refs.values()))
+        return tuple(obs for obs in vivos if obs is not None)
+
+    def __contains__(self, observer: Observer) -> bool:
+        atual = self._refs.get(id(observer))
+        return atual is not None and atual() is observer
+
+    def __len__(self) -> int:
+        self._podar()
+        return len(self._refs)
+
+    def __iter__(self):
+        return iter(self.snapshot())
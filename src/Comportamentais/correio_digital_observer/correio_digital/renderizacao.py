@@ -0,0 +1,100 @@
+# src/correio_digital/renderizacao.py
+
+import functools
+import string
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .models import Mensagem
+
+class Renderizacao:
+    """
+    Textos derivados de uma mensagem, calculados sob demanda e guardados
+    para que todos os notificadores compartilhem o mesmo trabalho:
+    prévias do conteúdo, assunto, resumo e os textos dos modelos já
+    renderizados para esta mensagem.
+
+    Guarda só os campos que os modelos usam, não a mensagem: uma referência
+    de volta formaria um ciclo (Mensagem -> Renderizacao -> Mensagem) em
+    cada mensagem renderizada, liberado apenas pelo coletor cíclico.
+    """
+    __slots__ = ('remetente', 'destinatario', 'conteudo',
+                 '_previas', '_assunto', '_resumo', '_textos')
+
+    def __init__(self, remetente: str, destinatario: str, conteudo: str):
+        self.remetente = remetente
+        self.destinatario = destinatario
+        self.conteudo = conteudo
+        self._previas: Dict[int, str] = {}
+        self._assunto: Optional[str] = None
+        self._resumo: Optional[str] = None
+        self._textos: Dict["Modelo", str] = {}
+
+    def previa(self, tamanho: int = 20) -> str:
+        """Os primeiros 'tamanho' caracteres do conteúdo."""
+        texto = self._previas.get(tamanho)
+        if texto is None:
+            texto = self._previas[tamanho] = self.conteudo[:tamanho]
+        return texto
+
+    @property
+    def assunto(self) -> str:
+        if self._assunto is None:
+            self._assunto = f"Nova mensagem de {self.remetente}"
+        return self._assunto
+
+    @property
+    def resumo(self) -> str:
+        if self._resumo is None:
+            self._resumo = f"{self.assunto}: {self.previa(20)}..."
+        return self._resumo
+
+class Modelo:
+    """
+    Modelo de texto de notificação, compilado uma única vez.
+
+    Aceita os campos {remetente}, {destinatario}, {conteudo}, {assunto},
+    {resumo} e {previa:N} (os N primeiros caracteres do conteúdo). A
+    compilação transforma o texto em uma lista de partes, então renderizar
+    não precisa interpretar o modelo de novo; o resultado fica guardado na
+    Renderizacao da mensagem e é reaproveitado por outros notificadores
+    que usem o mesmo modelo.
+
+    Use Modelo.compilar(texto): modelos iguais são o mesmo objeto.
+    """
+    __slots__ = ('texto', '_partes')
+
+    def __init__(self, texto: str):
+        self.texto = texto
+        self._partes: List[Tuple[str, Callable[[Renderizacao], str]]] = [
+            (literal, self._campo(nome, especificacao) if nome is not None else None)
+            for literal, nome, especificacao, _ in string.Formatter().parse(texto)
+        ]
+
+    @staticmethod
+    def _campo(nome: str, especificacao: str) -> Callable[[Renderizacao], str]:
+        if nome == 'previa':
+            tamanho = int(especificacao) if especificacao else 20
+            return lambda r: r.previa(tamanho)
+        if especificacao:
+            raise ValueError(f"Campo '{nome}' não aceita especificação de formato")
+        if nome in ('assunto', 'resumo', 'remetente', 'destinatario', 'conteudo'):
+            return lambda r: getattr(r, nome)
+        raise ValueError(f"Campo desconhecido no modelo: '{nome}'")
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def compilar(cls, texto: str) -> "Modelo":
+        return cls(texto)
+
+    def renderizar(self, mensagem: "Mensagem") -> str:
+        renderizacao = mensagem.renderizacao
+        texto = renderizacao._textos.get(self)
+        if texto is None:
+            texto = "".join(literal + (campo(renderizacao) if campo is not None else "")
+                            for literal, campo in self._partes)
+            renderizacao._textos[self] = texto
+        return texto
+
+    def __repr__(self) -> str:
+        return f"Modelo({self.texto!r})"
@@ -0,0 +1,249 @@
+# src/correio_digital/resiliencia.py
+
+import datetime
+import logging
+import random
+import threading
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional
+from .models import Mensagem
+from .observer_pattern import Observer
+from .despacho import DespachanteSincrono
+from .temporizador import Agendamento, Temporizador
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class EntregaFalha:
+    """Uma entrega que esgotou as tentativas e foi para as mensagens mortas."""
+    observador: str
+    mensagens: List[Mensagem]
+    tentativas: int
+    erro: str
+    em_lote: bool = True
+    quando: datetime.datetime = field(default_factory=datetime.datetime.now)
+    # Referência fraca: a fila de mensagens mortas não mantém sessões vivas
+    _observer: Optional[weakref.ref] = field(default=None, repr=False, compare=False)
+
+    @property
+    def observer(self) -> Optional[Observer]:
+        """O observador original, ou None se ele já foi coletado."""
+        return self._observer() if self._observer is not None else None
+
+class MensagensMortas:
+    """
+    Armazena as entregas que falharam definitivamente, para inspeção
+    e reprocessamento. É limitada: acima de 'capacidade' as entradas mais
+    antigas são descartadas (e contadas em 'descartadas').
+    """
+    def __init__(self, capacidade: int = 10_000):
+        self._itens: Deque[EntregaFalha] = deque(maxlen=capacidade)
+        self._descartadas = 0
+        self._lock = threading.Lock()
+
+    def adicionar(self, entrega: EntregaFalha) -> None:
+        with self._lock:
+            if len(self._itens) == self._itens.maxlen:
+                self._descartadas += 1
+            self._itens.append(entrega)
+
+    def listar(self, observador: Optional[str] = None) -> List[EntregaFalha]:
+        """Cópia das entradas, opcionalmente só as de uma classe de observador."""
+        with self._lock:
+            return [e for e in self._itens
+                    if observador is None or e.observador == observador]
+
+    def retirar(self, filtro: Optional[Callable[[EntregaFalha], bool]] = None) -> List[EntregaFalha]:
+        """Remove e devolve as entradas que satisfazem 'filtro' (todas, por padrão)."""
+        with self._lock:
+            retiradas = [e for e in self._itens if filtro is None or filtro(e)]
+            if retiradas:
+                self._itens = deque((e for e in self._itens
+                                     if not (filtro is None or filtro(e))),
+                                    maxlen=self._itens.maxlen)
+            return retiradas
+
+    @property
+    def descartadas(self) -> int:
+        with self._lock:
+            return self._descartadas
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._itens)
+
+class _Retentativa:
+    """Uma entrega aguardando nova tentativa no temporizador."""
+    __slots__ = ('observer', 'mensagens', 'em_lote', 'tentativa', 'agendamento')
+
+    def __init__(self, observer: Observer, mensagens: List[Mensagem],
+                 em_lote: bool, tentativa: int):
+        self.observer = observer
+        self.mensagens = mensagens
+        self.em_lote = em_lote
+        self.tentativa = tentativa
+        self.agendamento: Optional[Agendamento] = None
+
+class DespachanteResiliente(DespachanteSincrono):
+    """
+    Despachante síncrono com isolamento de falhas e retentativas.
+
+    Quando um observador lança exceção, os demais continuam recebendo a
+    mensagem normalmente e a entrega que falhou é reagendada com backoff
+    exponencial e jitter ("equal jitter": metade do atraso é fixa e a outra
+    metade aleatória, para que observadores que falharam juntos não tentem
+    de novo todos no mesmo instante). Todas as retentativas rodam na
+    thread de um único Temporizador.
+
+    Depois de 'max_tentativas' a entrega vai para MensagensMortas, de onde
+    pode ser inspecionada e reprocessada com reprocessar_mortas().
+
+    Retentativas podem chegar depois de mensagens mais novas, então a
+    ordem só é garantida para entregas que não falharam.
+    """
+    def __init__(self,
+                 max_tentativas: int = 5,
+                 atraso_base: float = 0.1,
+                 atraso_max: float = 30.0,
+                 mensagens_mortas: Optional[MensagensMortas] = None,
+                 temporizador: Optional[Temporizador] = None,
+                 aleatorio: Optional[random.Random] = None):
+        """
+        Args:
+            max_tentativas: Total de tentativas por entrega, incluindo a primeira
+            atraso_base: Atraso antes da primeira retentativa (segundos)
+            atraso_max: Teto do backoff exponencial (segundos)
+            mensagens_mortas: Onde guardar as entregas que esgotaram as tentativas
+            temporizador: Temporizador compartilhado (por padrão, um próprio)
+            aleatorio: Gerador usado no jitter (útil para testes)
+        """
+        if max_tentativas < 1:
+            raise ValueError("max_tentativas deve ser maior que zero")
+        self._max_tentativas = max_tentativas
+        self._atraso_base = atraso_base
+        self._atraso_max = atraso_max
+        self._mortas = mensagens_mortas if mensagens_mortas is not None else MensagensMortas()
+        self._temporizador = temporizador or Temporizador("retentativas")
+        self._temporizador_proprio = temporizador is None
+        self._aleatorio = aleatorio or random.Random()
+        self._pendentes: Dict[int, _Retentativa] = {}
+        self._sequencia = 0
+        self._recuperadas = 0
+        self._lock = threading.Lock()
+        self._fechado = False
+
+    @property
+    def mensagens_mortas(self) -> MensagensMortas:
+        return self._mortas
+
+    def atraso(self, tentativa: int) -> float:
+        """Atraso antes da retentativa número 'tentativa' (1, 2, ...)."""
+        teto = min(self._atraso_max, self._atraso_base * (2 ** (tentativa - 1)))
+        return teto / 2 + self._aleatorio.uniform(0, teto / 2)
+
+    def _tratar_falha(self, observer: Observer, mensagens: List[Mensagem],
+                      em_lote: bool, erro: Exception) -> None:
+        self._reagendar(_Retentativa(observer, mensagens, em_lote, 1), erro)
+
+    def _reagendar(self, retentativa: _Retentativa, erro: Exception) -> None:
+        nome = retentativa.observer.__class__.__name__
+        with self._lock:
+            # Registrar e agendar sob o lock: close() não pode enterrar a
+            # retentativa no meio do caminho, e depois dele nada é agendado
+            fechado = self._fechado
+            esgotou = retentativa.tentativa >= self._max_tentativas
+            if not (fechado or esgotou):
+                atraso = self.atraso(retentativa.tentativa)
+                self._sequencia += 1
+                chave = self._sequencia
+                try:
+                    retentativa.agendamento = self._temporizador.agendar(
+                        atraso, lambda: self._tentar_novamente(chave))
+                except RuntimeError:
+                    # Temporizador compartilhado já fechado por outro dono
+                    fechado = True
+                else:
+                    self._pendentes[chave] = retentativa
+
+        if fechado:
+            logger.error("[Despachante] Falha em %s depois do fechamento; entrega movida "
+                         "para mensagens mortas: %r", nome, erro)
+            self._enterrar(retentativa, repr(erro))
+            return
+        if esgotou:
+            logger.error("[Despachante] %s falhou %d vezes; entrega movida para mensagens mortas: %r",
+                         nome, retentativa.tentativa, erro)
+            self._enterrar(retentativa, repr(erro))
+            return
+
+        logger.warning("[Despachante] Falha em %s (tentativa %d/%d): %r; nova tentativa em %.2fs",
+                       nome, retentativa.tentativa, self._max_tentativas, erro, atraso)
+
+    def _tentar_novamente(self, chave: int) -> None:
+        with self._lock:
+            retentativa = self._pendentes.pop(chave, None)
+        if retentativa is None:
+            return
+        try:
+            self._entregar(retentativa.observer, retentativa.mensagens, retentativa.em_lote)
+        except Exception as erro:
+            retentativa.tentativa += 1
+            self._reagendar(retentativa, erro)
+            return
+        with self._lock:
+            self._recuperadas += 1
+        logger.info("[Despachante] %s recuperado na tentativa %d",
+                    retentativa.observer.__class__.__name__, retentativa.tentativa + 1)
+
+    def _enterrar(self, retentativa: _Retentativa, erro: str) -> None:
+        self._mortas.adicionar(EntregaFalha(
+            observador=retentativa.observer.__class__.__name__,
+            mensagens=retentativa.mensagens,
+            tentativas=retentativa.tentativa,
+            erro=erro,
+            em_lote=retentativa.em_lote,
+            _observer=weakref.ref(retentativa.observer)
+        ))
+
+    def reprocessar_mortas(self, filtro: Optional[Callable[[EntregaFalha], bool]] = None) -> int:
+        """
+        Tenta entregar de novo as mensagens mortas que satisfazem 'filtro'.
+        Cada uma recomeça a contagem de tentativas; entradas cujo observador
+        já foi coletado são descartadas. Retorna quantas foram reenviadas.
+        """
+        reenviadas = 0
+        for entrega in self._mortas.retirar(filtro):
+            observer = entrega.observer
+            if observer is None:
+                continue
+            self._entregar_isolado(observer, entrega.mensagens, entrega.em_lote)
+            reenviadas += 1
+        return reenviadas
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                'retentativas_pendentes': len(self._pendentes),
+                'recuperadas': self._recuperadas,
+                'mensagens_mortas': len(self._mortas),
+            }
+
+    def close(self) -> None:
+        """
+        Para o temporizador. Retentativas ainda não executadas vão direto
+        para as mensagens mortas, para não se perderem em silêncio.
+        """
+        with self._lock:
+            if self._fechado:
+                return
+            self._fechado = True
+            pendentes = list(self._pendentes.values())
+            self._pendentes.clear()
+        for retentativa in pendentes:
+            if retentativa.agendamento is not None:
+                retentativa.agendamento.cancelar()
+            self._enterrar(retentativa, "despachante fechado")
+        if self._temporizador_proprio:
+            self._temporizador.close()
@@ -0,0 +1,76 @@
+# src/correio_digital/serializacao.py
+
+import struct
+import zlib
+from typing import Tuple
+from .models import MensagemCompacta
+
+# Formato binário de um registro (little-endian):
+#
+#   cabeçalho: tamanho do corpo (uint32) | crc32 do corpo (uint32)
+#   corpo:     epoch_us (int64) | len remetente (uint16) | len destinatario (uint16)
+#              | len conteudo (uint32) | remetente | destinatario | conteudo (UTF-8)
+CABECALHO = struct.Struct('<II')
+_CAMPOS = struct.Struct('<qHHI')
+
+class RegistroCorrompidoError(Exception):
+    """
+    Lançada quando um registro binário está truncado ou com CRC inválido
+    (ex: o processo morreu no meio de uma escrita).
+    """
+    pass
+
+def codificar(registro: MensagemCompacta) -> bytes:
+    """Serializa o registro no formato com prefixo de tamanho."""
+    remetente = registro.remetente.encode('utf-8')
+    destinatario = registro.destinatario.encode('utf-8')
+    conteudo = registro.conteudo.encode('utf-8')
+    corpo = b''.join((
+        _CAMPOS.pack(registro.epoch_us, len(remetente), len(destinatario), len(conteudo)),
+        remetente, destinatario, conteudo
+    ))
+    return CABECALHO.pack(len(corpo), zlib.crc32(corpo)) + corpo
+
+def tamanho_total(buffer, posicao: int) -> int:
+    """
+    Tamanho (cabeçalho incluído) do registro que começa em 'posicao',
+    lendo apenas o cabeçalho. Não valida o CRC.
+    """
+    if posicao + CABECALHO.size > len(buffer):
+        raise RegistroCorrompidoError(f"Cabeçalho truncado na posição {posicao}")
+    tamanho, _ = CABECALHO.unpack_from(buffer, posicao)
+    fim = posicao + CABECALHO.size + tamanho
+    if fim > len(buffer):
+        raise RegistroCorrompidoError(f"Registro truncado na posição {posicao}")
+    return fim - posicao
+
+def validar(buffer, posicao: int) -> int:
+    """Como tamanho_total, mas também confere o CRC do corpo."""
+    total = tamanho_total(buffer, posicao)
+    tamanho, crc = CABECALHO.unpack_from(buffer, posicao)
+    inicio = posicao + CABECALHO.size
+    if zlib.crc32(buffer[inicio:inicio + tamanho]) != crc:
+        raise RegistroCorrompidoError(f"CRC inválido na posição {posicao}")
+    return total
+
+def ler_epoch_us(buffer, posicao: int) -> int:
+    """Lê apenas o timestamp do registro, sem decodificar as strings."""
+    return _CAMPOS.unpack_from(buffer, posicao + CABECALHO.size)[0]
+
+def decodificar(buffer, posicao: int = 0) -> Tuple[MensagemCompacta, int]:
+    """
+    Decodifica o registro que começa em 'posicao'.
+
+    Returns:
+        O registro e a posição do próximo registro no buffer
+    """
+    fim = posicao + tamanho_total(buffer, posicao)
+    inicio = posicao + CABECALHO.size
+    epoch_us, n_rem, n_dest, n_cont = _CAMPOS.unpack_from(buffer, inicio)
+    p = inicio + _CAMPOS.size
+    remetente = bytes(buffer[p:p + n_rem]).decode('utf-8')
+    p += n_rem
+    destinatario = bytes(buffer[p:p + n_dest]).decode('utf-8')
+    p += n_dest
+    conteudo = bytes(buffer[p:p + n_cont]).decode('utf-8')
+    return MensagemCompacta(remetente, destinatario, conteudo, epoch_us), fim
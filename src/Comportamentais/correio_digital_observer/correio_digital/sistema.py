@@ -1,59 +1,451 @@
 # src/correio_digital/sistema.py
 
 import datetime
-from typing import List
-from .models import Mensagem
+import logging
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+from .models import Mensagem, para_epoch_us
+from .armazenamento import ArmazenamentoDeMensagens, ArmazenamentoEmMemoria
 from .observer_pattern import Subject, Observer
+from .despacho import Despachante, DespachanteSincrono
+from .registro import RegistroDeObservadores
+from .indices import IndiceDeMensagens, ResultadoBusca, codificar_cursor, decodificar_cursor
+from .busca_textual import IndiceTextual, codificar_cursor_textual, decodificar_cursor_textual
+from .metricas import Metricas
+from .instantaneo import Captura, Instantaneos
+from .consumo import Cursores, LoteDeConsumo
+
+logger = logging.getLogger(__name__)
 
 class SistemaDeMensagens(Subject):
     """
     O Subject Concreto. Mantém o estado (mensagens) e notifica
     os observadores quando uma nova mensagem chega.
     """
-    def __init__(self):
-        self._observers: List[Observer] = []
-        self._mensagens: List[Mensagem] = []
+    def __init__(self, despachante: Optional[Despachante] = None,
+                 armazenamento: Optional[ArmazenamentoDeMensagens] = None,
+                 instantaneos: Optional[Instantaneos] = None):
+        """
+        Args:
+            despachante: Estratégia de entrega aos observadores. Por padrão
+                as notificações são feitas na mesma thread (DespachanteSincrono);
+                use DespachanteThreadPool para não bloquear a ingestão.
+            armazenamento: Onde as mensagens ficam retidas. Por padrão um
+                buffer circular em memória (ArmazenamentoEmMemoria).
+            instantaneos: Se informado, o estado é gravado periodicamente
+                e a partida carrega o último instantâneo em vez de
+                reindexar todo o histórico.
+        """
+        # Observadores curinga recebem todas as mensagens; os demais ficam
+        # indexados pelo destinatário que assinaram. Os registros guardam
+        # apenas referências fracas (sessões abandonadas são removidas sozinhas).
+        self._curingas = RegistroDeObservadores()
+        self._por_destinatario: Dict[str, RegistroDeObservadores] = {}
+        # observer -> conjunto de destinatários assinados
+        self._assinaturas = RegistroDeObservadores()
+        self._mensagens = armazenamento if armazenamento is not None else ArmazenamentoEmMemoria()
+        self._despachante = despachante or DespachanteSincrono()
+        self._metricas = Metricas()
+        self._despachante.instrumentar(self._metricas)
+        self._cursores = Cursores(self._mensagens)
 
-    def attach(self, observer: Observer) -> None:
-        if observer not in self._observers:
-            print(f"[Sistema] {observer.__class__.__name__} foi anexado.")
-            self._observers.append(observer)
+        # Índices secundários para buscar(); reconstruídos a partir do que
+        # o armazenamento já tinha (ex: log em disco reaberto), partindo do
+        # último instantâneo quando houver um.
+        self._indice = IndiceDeMensagens()
+        self._indice_textual = IndiceTextual()
+        self._instantaneos = instantaneos
+        desde = self._restaurar_instantaneo() if instantaneos is not None else 0
+        for offset, registro in self._mensagens.registros(desde):
+            self._indice.adicionar(offset, registro.remetente,
+                                   registro.destinatario, registro.epoch_us)
+            self._indice_textual.adicionar(offset, registro.destinatario, registro.conteudo)
+
+    def _restaurar_instantaneo(self) -> int:
+        """
+        Carrega o último instantâneo e retorna o offset a partir do qual
+        as mensagens ainda precisam ser indexadas (a cauda).
+        """
+        captura = self._instantaneos.carregar_ultimo()
+        if captura is None:
+            return 0
+        if (captura.registros is not None and len(self._mensagens) == 0
+                and isinstance(self._mensagens, ArmazenamentoEmMemoria)):
+            self._mensagens.restaurar(captura.primeiro_offset, captura.registros)
+        if self._mensagens.proximo_offset < captura.proximo_offset:
+            # O armazenamento tem menos do que o instantâneo (ex: outro log)
+            logger.warning("[Sistema] Instantâneo até o offset %d ignorado: o armazenamento "
+                           "termina em %d.", captura.proximo_offset, self._mensagens.proximo_offset)
+            return 0
+        self._indice.restaurar(captura.indice)
+        self._indice_textual.restaurar(captura.indice_textual)
+        self._cursores.restaurar(captura.cursores)
+        logger.debug("[Sistema] Instantâneo carregado até o offset %d.", captura.proximo_offset)
+        return captura.proximo_offset
+
+    def attach(self, observer: Observer, destinatario: Optional[str] = None) -> None:
+        """
+        Anexa um observador em O(1). Sem 'destinatario' o observador é curinga
+        e recebe todas as mensagens; com 'destinatario' recebe apenas as
+        mensagens endereçadas a ele (pode ser chamado para vários destinatários).
+
+        O sistema não mantém o observador vivo: quem o criou deve guardar
+        uma referência enquanto quiser receber notificações.
+        """
+        if observer in self._curingas:
+            return
+        observer.preparar()
+
+        if destinatario is None:
+            # Virar curinga torna as assinaturas específicas redundantes
+            for chave in self._assinaturas.valor(observer, ()):
+                self._remover_do_indice(observer, chave)
+            self._assinaturas.remover(observer)
+            self._curingas.adicionar(observer)
+            logger.debug("[Sistema] %s foi anexado.", observer.__class__.__name__)
+            return
+
+        chaves = self._assinaturas.valor(observer)
+        if chaves is None:
+            chaves = set()
+            self._assinaturas.adicionar(observer, chaves)
+        if destinatario not in chaves:
+            chaves.add(destinatario)
+            inscritos = self._por_destinatario.get(destinatario)
+            if inscritos is None:
+                inscritos = self._por_destinatario[destinatario] = RegistroDeObservadores()
+            inscritos.adicionar(observer)
+            logger.debug("[Sistema] %s foi anexado para %s.", observer.__class__.__name__, destinatario)
 
     def detach(self, observer: Observer) -> None:
-        try:
-            self._observers.remove(observer)
-            print(f"[Sistema] {observer.__class__.__name__} foi desanexado.")
-        except ValueError:
-            print(f"[Sistema] {observer.__class__.__name__} não está na lista.")
+        """Remove todas as assinaturas do observador em O(1) por assinatura."""
+        if self._curingas.remover(observer):
+            pass
+        elif observer in self._assinaturas:
+            for chave in self._assinaturas.valor(observer):
+                self._remover_do_indice(observer, chave)
+            self._assinaturas.remover(observer)
+        else:
+            logger.warning("[Sistema] %s não está na lista.", observer.__class__.__name__)
+            return
+        logger.debug("[Sistema] %s foi desanexado.", observer.__class__.__name__)
+
+    def _remover_do_indice(self, observer: Observer, destinatario: str) -> None:
+        inscritos = self._por_destinatario.get(destinatario)
+        if inscritos is None:
+            return
+        inscritos.remover(observer)
+        if not len(inscritos):
+            del self._por_destinatario[destinatario]
+
+    def _observadores_de(self, destinatario: str) -> Tuple[Observer, ...]:
+        """
+        Snapshot dos curingas mais os assinantes do destinatário,
+        sem varrer os demais.
+        """
+        curingas = self._curingas.snapshot()
+        inscritos = self._por_destinatario.get(destinatario)
+        if inscritos is None:
+            return curingas
+        especificos = inscritos.snapshot()
+        if not especificos:
+            # Todos os assinantes foram coletados
+            del self._por_destinatario[destinatario]
+        return curingas + especificos
 
     def notify(self) -> None:
         """
-        Dispara a atualização para todos os observadores,
+        Dispara a atualização para os observadores interessados,
         enviando a última mensagem (modelo Push).
         """
-        if not self._mensagens:
+        ultima_mensagem = self._mensagens.ultima()
+        if ultima_mensagem is None:
             return
+        observadores = self._observadores_de(ultima_mensagem.destinatario)
 
-        ultima_mensagem = self._mensagens[-1]
-        
-        print(f"\n[Sistema] Notificando {len(self._observers)} observadores...")
-        for observer in self._observers:
-            observer.update(ultima_mensagem)
+        logger.debug("[Sistema] Notificando %d observadores...", len(observadores))
+        self._despachante.despachar(observadores, ultima_mensagem)
+
+    def metricas(self) -> dict:
+        """
+        Snapshot das métricas: mensagens recebidas, notificações enviadas
+        e com falha, taxa de sucesso, latência (p50/p95/p99) por classe de
+        observador, o estado do despachante (filas, retentativas) e o
+        atraso de cada cursor de consumo.
+        """
+        snapshot = self._metricas.snapshot()
+        snapshot['despachante'] = self._despachante.estatisticas()
+        snapshot['consumidores'] = self._cursores.atrasos()
+        return snapshot
+
+    def flush(self) -> None:
+        """Aguarda a entrega de todas as notificações pendentes."""
+        self._despachante.flush()
+
+    def close(self) -> None:
+        """
+        Drena as notificações pendentes, grava um último instantâneo (se
+        configurado) e encerra o despachante e o armazenamento.
+        """
+        self._despachante.close()
+        if self._instantaneos is not None:
+            self._instantaneos.aguardar()
+            self.instantaneo()
+            self._instantaneos.aguardar()
+        self._mensagens.close()
+
+    def instantaneo(self) -> bool:
+        """
+        Compacta (aplica a retenção do armazenamento e remove dos índices
+        as mensagens descartadas) e grava um instantâneo em segundo plano.
+        A ingestão fica parada só durante a captura; ver Instantaneos.
+
+        Returns:
+            False se não há instantâneos configurados ou se o anterior
+            ainda está sendo gravado
+        """
+        if self._instantaneos is None or self._instantaneos.em_andamento():
+            # A gravação em curso ainda lê as listas do índice textual
+            return False
+        expirar = getattr(self._mensagens, 'expirar', None)
+        if expirar is not None:
+            expirar()
+        primeiro = self._mensagens.primeiro_offset
+        if self._indice.entradas() > len(self._mensagens):
+            self._indice.compactar(primeiro)
+            self._indice_textual.compactar(primeiro)
+
+        registros = None
+        if isinstance(self._mensagens, ArmazenamentoEmMemoria):
+            registros = [registro for _, registro in self._mensagens.registros()]
+        captura = Captura(primeiro, self._mensagens.proximo_offset,
+                          self._indice.estado(), self._indice_textual.estado_adiado(), registros,
+                          self._cursores.estado())
+        return self._instantaneos.gravar_em_segundo_plano(captura)
 
     def novaMensagem(self, remetente: str, destinatario: str, conteudo: str) -> None:
         """
         Método de negócio principal. Cria uma nova mensagem,
         armazena e notifica os observadores.
         """
-        print(f"\n[Sistema] Nova mensagem recebida de {remetente}.")
-        
+        logger.debug("[Sistema] Nova mensagem recebida de %s.", remetente)
+        self._metricas.registrar_recebidas()
+
         msg = Mensagem(
             remetente=remetente,
             destinatario=destinatario,
             conteudo=conteudo,
             timestamp=datetime.datetime.now()
         )
-        self._mensagens.append(msg)
+        offset = self._mensagens.adicionar(msg)
+        self._indexar(offset, [msg])
         
         # O Padrão Observer entra em ação aqui
         self.notify()
+
+    def novasMensagens(self, mensagens: Iterable[Tuple[str, str, str]],
+                       tamanho_lote: int = 1000) -> int:
+        """
+        Ingestão em lote. Recebe tuplas (remetente, destinatario, conteudo),
+        armazena todas e notifica os observadores uma vez por lote através
+        de update_batch, evitando o custo por mensagem de novaMensagem.
+
+        Args:
+            mensagens: Iterável de tuplas (remetente, destinatario, conteudo)
+            tamanho_lote: Quantidade máxima de mensagens por notificação
+
+        Returns:
+            Quantidade de mensagens ingeridas
+        """
+        if tamanho_lote < 1:
+            raise ValueError("tamanho_lote deve ser maior que zero")
+
+        total = 0
+        iterador = iter(mensagens)
+        while True:
+            bloco = list(islice(iterador, tamanho_lote))
+            if not bloco:
+                break
+
+            timestamp = datetime.datetime.now()
+            lote = [
+                Mensagem(remetente=r, destinatario=d, conteudo=c, timestamp=timestamp)
+                for r, d, c in bloco
+            ]
+            primeiro = self._mensagens.adicionar_lote(lote)
+            self._indexar(primeiro, lote)
+            total += len(lote)
+
+            logger.debug("[Sistema] Lote de %d mensagens recebido.", len(lote))
+            self._metricas.registrar_recebidas(len(lote))
+            self._notificar_lote(lote)
+
+        return total
+
+    def _indexar(self, primeiro_offset: int, mensagens: List[Mensagem]) -> None:
+        """
+        Atualiza os índices com mensagens recém-armazenadas (offsets
+        consecutivos) e compacta quando a maior parte das entradas
+        aponta para mensagens já descartadas pela retenção.
+        """
+        for offset, msg in enumerate(mensagens, start=primeiro_offset):
+            self._indice.adicionar(offset, msg.remetente, msg.destinatario,
+                                   para_epoch_us(msg.timestamp))
+            self._indice_textual.adicionar(offset, msg.destinatario, msg.conteudo)
+        if self._indice.entradas() > 2 * len(self._mensagens) + 1024:
+            self._indice.compactar(self._mensagens.primeiro_offset)
+            self._indice_textual.compactar(self._mensagens.primeiro_offset)
+        if self._instantaneos is not None and self._instantaneos.devido(self._mensagens.proximo_offset):
+            self.instantaneo()
+
+    def registrar_cursor(self, nome: str, do_inicio: bool = False) -> None:
+        """
+        Registra um consumidor no modelo pull. Em vez de acompanhar a
+        ingestão via update(), ele busca lotes com buscar_desde() no próprio
+        ritmo e confirma o que processou com confirmar_cursor().
+
+        Registrar um cursor que já existe (ex: restaurado do instantâneo)
+        não o move.
+
+        Args:
+            nome: Identificador do consumidor
+            do_inicio: Começa da mensagem retida mais antiga em vez de
+                apenas das novas
+        """
+        self._cursores.registrar(nome, do_inicio)
+
+    def remover_cursor(self, nome: str) -> None:
+        self._cursores.remover(nome)
+
+    def buscar_desde(self, cursor: str, max_itens: int = 1000) -> LoteDeConsumo:
+        """
+        Próximo lote do cursor, em ordem de offset, lido direto do
+        armazenamento. Avança a posição de leitura, mas não confirma:
+        chame confirmar_cursor(cursor, lote.proximo_offset) depois de
+        processar o lote.
+
+        Se o consumidor ficou para trás da retenção, as mensagens
+        descartadas são puladas e contadas em lote.perdidas.
+        """
+        if max_itens < 1:
+            raise ValueError("max_itens deve ser maior que zero")
+        return self._cursores.ler(cursor, max_itens)
+
+    def confirmar_cursor(self, cursor: str, offset: Optional[int] = None) -> None:
+        """
+        Confirma que tudo antes de 'offset' (por padrão, a posição de
+        leitura atual) foi processado. É o ponto de retomada do cursor em
+        reposicionar_cursor() e depois de um restart com instantâneos.
+        """
+        self._cursores.confirmar(cursor, offset)
+
+    def reposicionar_cursor(self, cursor: str, offset: Optional[int] = None) -> None:
+        """Volta a leitura para 'offset' (por padrão, o último confirmado)."""
+        self._cursores.reposicionar(cursor, offset)
+
+    def buscar(self, remetente: Optional[str] = None, destinatario: Optional[str] = None,
+               desde: Optional[datetime.datetime] = None, ate: Optional[datetime.datetime] = None,
+               limite: int = 50, cursor: Optional[str] = None) -> ResultadoBusca:
+        """
+        Busca mensagens retidas usando os índices secundários.
+
+        Args:
+            remetente: Apenas mensagens enviadas por este remetente ("enviadas por Y")
+            destinatario: Apenas mensagens para este destinatário ("caixa de entrada de X")
+            desde: Timestamp mínimo (inclusivo)
+            ate: Timestamp máximo (inclusivo)
+            limite: Tamanho máximo da página
+            cursor: proximo_cursor de uma página anterior
+
+        Returns:
+            ResultadoBusca com as mensagens em ordem cronológica e o cursor
+            da próxima página (None se não houver mais resultados)
+        """
+        if limite < 1:
+            raise ValueError("limite deve ser maior que zero")
+
+        candidatos = self._indice.candidatos(
+            remetente, destinatario,
+            para_epoch_us(desde) if desde is not None else None,
+            para_epoch_us(ate) if ate is not None else None,
+            decodificar_cursor(cursor) if cursor is not None else None
+        )
+
+        resultado = ResultadoBusca()
+        primeiro_retido = self._mensagens.primeiro_offset
+        ultimo = None
+        for epoch_us, offset in candidatos:
+            if offset < primeiro_retido:
+                continue
+            msg = self._mensagens.obter(offset)
+            if msg is None:
+                continue
+            # Com remetente e destinatário, só um deles foi usado no índice
+            if remetente is not None and msg.remetente != remetente:
+                continue
+            if destinatario is not None and msg.destinatario != destinatario:
+                continue
+            if len(resultado.mensagens) == limite:
+                resultado.proximo_cursor = codificar_cursor(*ultimo)
+                break
+            resultado.mensagens.append(msg)
+            ultimo = (epoch_us, offset)
+        return resultado
+
+    def buscar_texto(self, todos: Iterable[str] = (), algum: Iterable[str] = (),
+                     destinatario: Optional[str] = None, limite: int = 20,
+                     cursor: Optional[str] = None) -> ResultadoBusca:
+        """
+        Busca textual no conteúdo das mensagens retidas, sem diferenciar
+        maiúsculas nem acentos ("atencao" encontra "Atenção").
+
+        Args:
+            todos: Termos que precisam aparecer todos (AND)
+            algum: Termos dos quais ao menos um precisa aparecer (OR)
+            destinatario: Apenas a caixa de entrada deste destinatário
+            limite: Tamanho máximo da página
+            cursor: proximo_cursor de uma página anterior
+
+        Returns:
+            ResultadoBusca com as mensagens da mais para a menos relevante
+            e o cursor da próxima página (None se não houver mais resultados)
+        """
+        if limite < 1:
+            raise ValueError("limite deve ser maior que zero")
+        if isinstance(todos, str) or isinstance(algum, str):
+            raise TypeError("'todos' e 'algum' devem ser coleções de termos")
+
+        encontrados = self._indice_textual.buscar(
+            todos, algum, destinatario,
+            primeiro_offset=self._mensagens.primeiro_offset,
+            limite=limite + 1,
+            apos=decodificar_cursor_textual(cursor) if cursor is not None else None
+        )
+        resultado = ResultadoBusca()
+        for pontuacao, offset in encontrados[:limite]:
+            msg = self._mensagens.obter(offset)
+            if msg is not None:
+                resultado.mensagens.append(msg)
+        if len(encontrados) > limite:
+            resultado.proximo_cursor = codificar_cursor_textual(*encontrados[limite - 1])
+        return resultado
+
+    def _notificar_lote(self, lote: List[Mensagem]) -> None:
+        """
+        Curingas recebem o lote inteiro; assinantes de um destinatário
+        recebem apenas as mensagens do lote endereçadas a ele.
+        """
+        curingas = self._curingas.snapshot()
+        if curingas:
+            self._despachante.despachar_lote(curingas, lote)
+
+        if not self._por_destinatario:
+            return
+        grupos: Dict[str, List[Mensagem]] = {}
+        for msg in lote:
+            if msg.destinatario in self._por_destinatario:
+                grupos.setdefault(msg.destinatario, []).append(msg)
+        for destinatario, mensagens in grupos.items():
+            inscritos = self._por_destinatario[destinatario].snapshot()
+            if inscritos:
+                self._despachante.despachar_lote(inscritos, mensagens)
@@ -0,0 +1,122 @@
+# src/correio_digital/sistema_async.py
+
+import asyncio
+import datetime
+import logging
+import time
+from typing import Dict, List, Optional, Union
+from .metricas import Metricas
+from .models import Mensagem
+from .observer_pattern import Subject, Observer, AsyncObserver
+
+logger = logging.getLogger(__name__)
+
+ObservadorQualquer = Union[Observer, AsyncObserver]
+
+class SistemaDeMensagensAsync(Subject):
+    """
+    Subject Concreto assíncrono. Entrega cada nova mensagem a todos
+    os observadores ao mesmo tempo (fan-out), de modo que um canal
+    lento não atrasa os demais.
+
+    Observadores síncronos (ex: NotificadorEmail) também são aceitos:
+    o update deles roda em uma thread via asyncio.to_thread.
+
+    Um observador que estoura o timeout ou lança uma exceção não afeta os
+    demais: a falha é registrada em metricas() e a entrega dele retorna False.
+    """
+    def __init__(self, timeout_padrao: Optional[float] = None):
+        self._observers: List[ObservadorQualquer] = []
+        self._timeouts: Dict[int, Optional[float]] = {}
+        self._mensagens: List[Mensagem] = []
+        self._timeout_padrao = timeout_padrao
+        self._metricas = Metricas()
+
+    def attach(self, observer: ObservadorQualquer, timeout: Optional[float] = None) -> None:
+        """
+        Anexa um observador. 'timeout' (em segundos) limita o tempo de
+        entrega apenas deste observador; se omitido, usa o timeout padrão.
+        """
+        if observer not in self._observers:
+            if isinstance(observer, Observer):
+                observer.preparar()
+            logger.debug("[SistemaAsync] %s foi anexado.", observer.__class__.__name__)
+            self._observers.append(observer)
+        self._timeouts[id(observer)] = timeout if timeout is not None else self._timeout_padrao
+
+    def detach(self, observer: ObservadorQualquer) -> None:
+        try:
+            self._observers.remove(observer)
+            self._timeouts.pop(id(observer), None)
+            logger.debug("[SistemaAsync] %s foi desanexado.", observer.__class__.__name__)
+        except ValueError:
+            logger.warning("[SistemaAsync] %s não está na lista.", observer.__class__.__name__)
+
+    async def _entregar(self, observer: ObservadorQualquer, mensagem: Mensagem) -> bool:
+        """
+        Entrega a mensagem a um único observador respeitando o seu timeout.
+        Retorna False se o observador estourou o tempo limite ou falhou.
+        """
+        inicio = time.perf_counter()
+        try:
+            if isinstance(observer, AsyncObserver):
+                entrega = observer.update(mensagem)
+            else:
+                entrega = asyncio.to_thread(observer.update, mensagem)
+            await asyncio.wait_for(entrega, timeout=self._timeouts.get(id(observer)))
+        except asyncio.TimeoutError:
+            logger.warning("[SistemaAsync] %s excedeu o tempo limite.", observer.__class__.__name__)
+            self._metricas.registrar_falha(observer, 1)
+            return False
+        except Exception:
+            logger.exception("[SistemaAsync] Falha ao notificar %s.", observer.__class__.__name__)
+            self._metricas.registrar_falha(observer, 1)
+            return False
+        self._metricas.registrar_entrega(observer, 1, time.perf_counter() - inicio)
+        return True
+
+    async def notify(self) -> List[bool]:
+        """
+        Dispara a atualização para todos os observadores concorrentemente,
+        enviando a última mensagem (modelo Push).
+
+        Returns:
+            Lista com o resultado da entrega de cada observador, na ordem
+            em que foram anexados (False indica timeout ou exceção)
+        """
+        if not self._mensagens:
+            return []
+
+        ultima_mensagem = self._mensagens[-1]
+        observadores = list(self._observers)
+
+        logger.debug("[SistemaAsync] Notificando %d observadores...", len(observadores))
+        return await asyncio.gather(
+            *(self._entregar(observer, ultima_mensagem) for observer in observadores)
+        )
+
+    async def anovaMensagem(self, remetente: str, destinatario: str, conteudo: str) -> List[bool]:
+        """
+        Versão assíncrona de novaMensagem. Cria, armazena e notifica
+        todos os observadores sem que um bloqueie o outro.
+        """
+        logger.debug("[SistemaAsync] Nova mensagem recebida de %s.", remetente)
+        self._metricas.registrar_recebidas()
+
+        msg = Mensagem(
+            remetente=remetente,
+            destinatario=destinatario,
+            conteudo=conteudo,
+            timestamp=datetime.datetime.now()
+        )
+        self._mensagens.append(msg)
+
+        return await self.notify()
+
+    def metricas(self) -> dict:
+        """
+        Snapshot das métricas: mensagens recebidas, notificações enviadas
+        e com falha (timeouts e exceções), taxa de sucesso e latência
+        (p50/p95/p99) por classe de observador.
+        """
+        return self._metricas.snapshot()
@@ -0,0 +1,110 @@
+# src/correio_digital/temporizador.py
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class Agendamento:
+    """Referência para uma tarefa agendada, permitindo cancelá-la."""
+    __slots__ = ('quando', 'callback', 'cancelado')
+
+    def __init__(self, quando: float, callback: Callable[[], None]):
+        self.quando = quando
+        self.callback = callback
+        self.cancelado = False
+
+    def cancelar(self) -> None:
+        self.cancelado = True
+
+class Temporizador:
+    """
+    Executa callbacks agendados usando uma única thread e um heap ordenado
+    pelo instante de disparo. Agendar é O(log n), independente de quantas
+    tarefas estão pendentes, e não cria uma thread por tarefa.
+
+    Os callbacks rodam na thread do temporizador, então devem ser curtos.
+    """
+    def __init__(self, nome: str = "temporizador"):
+        self._nome = nome
+        self._heap: List[Tuple[float, int, Agendamento]] = []
+        self._sequencia = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._fechado = False
+
+    def agendar(self, atraso: float, callback: Callable[[], None]) -> Agendamento:
+        """Agenda 'callback' para daqui a 'atraso' segundos."""
+        agendamento = Agendamento(time.monotonic() + atraso, callback)
+        with self._cond:
+            if self._fechado:
+                raise RuntimeError("Temporizador já foi fechado")
+            heapq.heappush(self._heap, (agendamento.quando, next(self._sequencia), agendamento))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, name=self._nome, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return agendamento
+
+    def pendentes(self) -> int:
+        """Quantidade de tarefas ainda não executadas (canceladas incluídas)."""
+        with self._cond:
+            return len(self._heap)
+
+    def _executar(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._fechado:
+                        return
+                    if self._heap:
+                        espera = self._heap[0][0] - time.monotonic()
+                        if espera <= 0:
+                            _, _, agendamento = heapq.heappop(self._heap)
+                            break
+                        self._cond.wait(espera)
+                    else:
+                        self._cond.wait()
+
+            if agendamento.cancelado:
+                continue
+            try:
+                agendamento.callback()
+            except Exception:
+                logger.exception("[Temporizador] Falha ao executar tarefa agendada")
+
+    def close(self) -> None:
+        """Para a thread; tarefas ainda não disparadas são descartadas."""
+        with self._cond:
+            self._fechado = True
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+_padrao: Optional[Temporizador] = None
+_padrao_lock = threading.Lock()
+
+def temporizador_padrao() -> Temporizador:
+    """
+    Temporizador compartilhado pelos decorators que não recebem um
+    (ObservadorAgrupado, ObservadorLimitado): uma única thread para todos,
+    criada só no primeiro agendamento. Não deve ser fechado por quem usa.
+    """
+    global _padrao
+    with _padrao_lock:
+        if _padrao is None or _padrao._fechado:
+            _padrao = Temporizador("temporizador-padrao")
+        return _padrao
+
+def _descartar_padrao() -> None:
+    # Depois de um fork a thread não existe no processo filho
+    global _padrao
+    _padrao = None
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_descartar_padrao)
@@ -11,7 +11,15 @@ from .adaptadores import (
     GoogleAdapter,
     DeepLAdapter
 )
+from .cache import CacheTraducao, ChaveTraducao
+from .roteamento import EstadoCircuito, DisjuntorCircuito, PoliticaEWMA
 from .servico import ServicoTraducao
+from .servico_async import (
+    ITradutorAsync,
+    AdaptadorAsync,
+    TradutorSimuladoAsync,
+    ServicoTraducaoAsync
+)
 
 __all__ = [
     'Mensagem',
@@ -21,5 +29,14 @@ __all__ = [
     'DeepLAPI',
     'GoogleAdapter',
     'DeepLAdapter',
-    'ServicoTraducao'
+    'CacheTraducao',
+    'ChaveTraducao',
+    'EstadoCircuito',
+    'DisjuntorCircuito',
+    'PoliticaEWMA',
+    'ServicoTraducao',
+    'ITradutorAsync',
+    'AdaptadorAsync',
+    'TradutorSimuladoAsync',
+    'ServicoTraducaoAsync'
 ]
@@ -3,6 +3,7 @@ Implementações concretas dos adaptadores para APIs externas de tradução.
 Adaptadores (Adapters) que convertem a interface das APIs (Adaptees) para ITradutor (Target).
 """
 
+from typing import List, Optional, Union
 from .adapter_pattern import ITradutor, TraducaoError
 
 
@@ -26,6 +27,14 @@ class GoogleTranslateAPI:
             raise ValueError("Texto vazio")
         return f"[Google Translate] {texto} traduzido para {destino}"
     
+    def traduzir_textos(self, textos: List[str], destino: str) -> List[str]:
+        """
+        Endpoint em lote do Google: vários segmentos em uma requisição.
+        """
+        if len(textos) > 128:
+            raise ValueError("Máximo de 128 segmentos por requisição")
+        return [self.traduzir_texto(texto, destino) for texto in textos]
+    
     def obter_idiomas_suportados(self) -> list:
         """Método adicional específico do Google."""
         return ['EN', 'PT', 'ES', 'FR', 'DE', 'IT', 'JA', 'ZH']
@@ -37,20 +46,27 @@ class DeepLAPI:
     Interface completamente diferente do Google e do nosso sistema.
     """
     
-    def translate(self, text: str, target_lang: str, source_lang: str = 'auto') -> dict:
+    def translate(self, text: Union[str, List[str]], target_lang: str,
+                  source_lang: str = 'auto') -> dict:
         """
         Método da API DeepL - retorna dict com metadados.
         Assinatura e retorno diferentes do esperado pelo sistema.
+        
+        Como na API real, 'text' pode ser uma lista (até 50 textos): a
+        resposta traz uma tradução por texto, na mesma ordem.
         """
-        if not text:
+        textos = [text] if isinstance(text, str) else text
+        if not textos or not all(textos):
             raise ValueError("Empty text")
+        if len(textos) > 50:
+            raise ValueError("Too many texts")
         
         # Simulação - DeepL retorna um objeto complexo
         return {
             'translations': [{
                 'detected_source_language': source_lang,
-                'text': f"[DeepL] {text} translated to {target_lang}"
-            }],
+                'text': f"[DeepL] {t} translated to {target_lang}"
+            } for t in textos],
             'metadata': {
                 'provider': 'deepl',
                 'confidence': 0.95
@@ -72,6 +88,9 @@ class GoogleAdapter(ITradutor):
     Converte a interface do Google (traduzir_texto) para o padrão ITradutor (traduzir).
     """
     
+    MAX_ITENS_LOTE = 128
+    MAX_CARACTERES_LOTE = 30_000
+    
     def __init__(self, google_api: GoogleTranslateAPI):
         """
         Args:
@@ -103,6 +122,32 @@ class GoogleAdapter(ITradutor):
         except Exception as e:
             raise TraducaoError(f"Falha na tradução via Google: {str(e)}") from e
     
+    def traduzir_lote(self, textos: List[str], idioma_destino: str) -> List[Optional[str]]:
+        """
+        Traduz vários textos em uma única requisição ao Google.
+        
+        Textos vazios são rejeitados pela API e ficam como None sem serem
+        enviados, para não derrubar o lote inteiro.
+        
+        Raises:
+            TraducaoError: Quando a requisição do lote falhar
+        """
+        if not self.validar_idioma(idioma_destino):
+            raise TraducaoError(f"Idioma {idioma_destino} não suportado")
+        
+        validos = [i for i, texto in enumerate(textos) if texto]
+        resultados: List[Optional[str]] = [None] * len(textos)
+        if not validos:
+            return resultados
+        try:
+            traducoes = self._google_api.traduzir_textos([textos[i] for i in validos],
+                                                         destino=idioma_destino)
+        except Exception as e:
+            raise TraducaoError(f"Falha na tradução em lote via Google: {str(e)}") from e
+        for i, traducao in zip(validos, traducoes):
+            resultados[i] = traducao
+        return resultados
+    
     def obter_provedor(self) -> str:
         """Retorna o nome do provedor."""
         return "Google Translate"
@@ -114,6 +159,9 @@ class DeepLAdapter(ITradutor):
     Converte a interface complexa do DeepL (translate com dict) para o padrão ITradutor.
     """
     
+    MAX_ITENS_LOTE = 50
+    MAX_CARACTERES_LOTE = 120_000
+    
     def __init__(self, deepl_api: DeepLAPI):
         """
         Args:
@@ -149,6 +197,35 @@ class DeepLAdapter(ITradutor):
         except Exception as e:
             raise TraducaoError(f"Falha na tradução via DeepL: {str(e)}") from e
     
+    def traduzir_lote(self, textos: List[str], idioma_destino: str) -> List[Optional[str]]:
+        """
+        Traduz vários textos em uma única requisição ao DeepL.
+        
+        Textos vazios ficam como None sem serem enviados; as demais
+        traduções são extraídas do dict de resposta na ordem do envio.
+        
+        Raises:
+            TraducaoError: Quando a requisição do lote falhar
+        """
+        if not self.validar_idioma(idioma_destino):
+            raise TraducaoError(f"Idioma {idioma_destino} não suportado")
+        
+        validos = [i for i, texto in enumerate(textos) if texto]
+        resultados: List[Optional[str]] = [None] * len(textos)
+        if not validos:
+            return resultados
+        try:
+            resposta = self._deepl_api.translate([textos[i] for i in validos],
+                                                 target_lang=idioma_destino)
+            traducoes = [t['text'] for t in resposta['translations']]
+        except Exception as e:
+            raise TraducaoError(f"Falha na tradução em lote via DeepL: {str(e)}") from e
+        if len(traducoes) != len(validos):
+            raise TraducaoError("Resposta do DeepL com quantidade de traduções inesperada")
+        for i, traducao in zip(validos, traducoes):
+            resultados[i] = traducao
+        return resultados
+    
     def obter_provedor(self) -> str:
         """Retorna o nome do provedor."""
         return "DeepL"
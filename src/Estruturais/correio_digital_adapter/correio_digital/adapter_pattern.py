@@ -4,6 +4,7 @@ Define o contrato (Target) que todos os adaptadores devem seguir.
 """
 
 from abc import ABC, abstractmethod
+from typing import List, Optional
 
 
 class TraducaoError(Exception):
@@ -22,6 +23,11 @@ class ITradutor(ABC):
     Qualquer novo adaptador de API de tradução deve implementar esta interface.
     """
     
+    # Limites de uma chamada de traduzir_lote (quantidade de textos e soma
+    # dos caracteres). Adaptadores com API em lote usam os do provedor.
+    MAX_ITENS_LOTE = 50
+    MAX_CARACTERES_LOTE = 30_000
+    
     @abstractmethod
     def traduzir(self, texto: str, idioma_destino: str) -> str:
         """
@@ -39,6 +45,32 @@ class ITradutor(ABC):
         """
         pass
     
+    def traduzir_lote(self, textos: List[str], idioma_destino: str) -> List[Optional[str]]:
+        """
+        Traduz vários textos para o mesmo idioma destino.
+        
+        Implementação padrão: uma chamada de traduzir() por texto. Adaptadores
+        cujo provedor aceita vários textos por requisição devem sobrescrever.
+        
+        Args:
+            textos: Textos a serem traduzidos (dentro de MAX_ITENS_LOTE e
+                MAX_CARACTERES_LOTE)
+            idioma_destino: Código ISO do idioma destino
+            
+        Returns:
+            Uma tradução por texto, na mesma ordem; None nos itens que falharam
+            
+        Raises:
+            TraducaoError: Quando o lote inteiro falhar
+        """
+        resultados: List[Optional[str]] = []
+        for texto in textos:
+            try:
+                resultados.append(self.traduzir(texto, idioma_destino))
+            except TraducaoError:
+                resultados.append(None)
+        return resultados
+    
     def validar_idioma(self, codigo_idioma: str) -> bool:
         """
         Valida se o código de idioma é suportado.
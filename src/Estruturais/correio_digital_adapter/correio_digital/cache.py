@@ -0,0 +1,224 @@
+"""
+Cache de traduções do CorreioDigital.
+Evita chamar o provedor de novo para textos que se repetem (saudações, assinaturas).
+"""
+
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Iterable, NamedTuple, Optional, Tuple
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Normaliza o texto para uso como chave do cache.
+
+    Unifica a forma Unicode (NFC) e os espaços, sem mudar maiúsculas:
+    "Bom  dia " e "Bom dia" são a mesma chave, "bom dia" não.
+    """
+    return " ".join(unicodedata.normalize('NFC', texto).split())
+
+
+class ChaveTraducao(NamedTuple):
+    """Identifica uma tradução: texto normalizado, idiomas e provedor."""
+    texto: str
+    idioma_origem: str
+    idioma_destino: str
+    provedor: str
+
+    @classmethod
+    def criar(cls, texto: str, idioma_origem: Optional[str],
+              idioma_destino: str, provedor: str) -> "ChaveTraducao":
+        """Monta a chave normalizando o texto e os códigos de idioma."""
+        return cls(normalizar_texto(texto), (idioma_origem or '').upper(),
+                   idioma_destino.upper(), provedor)
+
+
+class CacheTraducao:
+    """
+    Cache de traduções em dois níveis.
+
+    - Memória: LRU limitado a 'max_itens', com validade 'ttl' por item.
+    - SQLite (opcional): persiste entre reinícios. Um acerto no disco
+      volta para a memória.
+
+    É seguro para uso por várias threads.
+    """
+
+    _ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS traducoes (
+            texto TEXT NOT NULL,
+            idioma_origem TEXT NOT NULL,
+            idioma_destino TEXT NOT NULL,
+            provedor TEXT NOT NULL,
+            traducao TEXT NOT NULL,
+            criado_em REAL NOT NULL,
+            PRIMARY KEY (texto, idioma_origem, idioma_destino, provedor)
+        ) WITHOUT ROWID
+    """
+
+    def __init__(self, max_itens: int = 10_000, ttl: Optional[float] = 24 * 3600,
+                 caminho_sqlite: Optional[str] = None,
+                 ttl_sqlite: Optional[float] = 30 * 24 * 3600,
+                 relogio: Callable[[], float] = time.time):
+        """
+        Args:
+            max_itens: Máximo de traduções mantidas em memória
+            ttl: Validade (segundos) de um item em memória; None = sem validade
+            caminho_sqlite: Arquivo do nível persistente; None = apenas memória
+            ttl_sqlite: Validade (segundos) de um item no SQLite; None = sem validade
+            relogio: Fonte de tempo em segundos (útil para testes)
+        """
+        if max_itens < 1:
+            raise ValueError("max_itens deve ser maior que zero")
+
+        self._max_itens = max_itens
+        self._ttl = ttl
+        self._ttl_sqlite = ttl_sqlite
+        self._relogio = relogio
+        self._memoria: "OrderedDict[ChaveTraducao, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._conexao = None
+        if caminho_sqlite is not None:
+            self._conexao = sqlite3.connect(caminho_sqlite, check_same_thread=False)
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute(self._ESQUEMA)
+            self._conexao.commit()
+
+        self._acertos_memoria = 0
+        self._acertos_sqlite = 0
+        self._falhas = 0
+        self._despejos = 0
+        self._expiradas = 0
+
+    def _valido(self, criado_em: float, ttl: Optional[float], agora: float) -> bool:
+        return ttl is None or agora - criado_em < ttl
+
+    def obter(self, chave: ChaveTraducao) -> Optional[str]:
+        """
+        Busca a tradução na memória e depois no SQLite.
+
+        Returns:
+            Texto traduzido ou None se não estiver no cache (ou expirou)
+        """
+        encontrada = self.obter_qualquer([chave])
+        return encontrada[0] if encontrada is not None else None
+
+    def obter_qualquer(self, chaves: Iterable[ChaveTraducao]
+                       ) -> Optional[Tuple[str, ChaveTraducao]]:
+        """
+        Busca a primeira das chaves que estiver no cache (ex: a mesma
+        tradução para cada provedor, em ordem de prioridade). Conta como uma
+        única consulta nas estatísticas: um acerto ou uma falha.
+
+        Returns:
+            (texto traduzido, chave encontrada) ou None se nenhuma estiver no cache
+        """
+        agora = self._relogio()
+        with self._lock:
+            chaves = list(chaves)
+            for chave in chaves:
+                traducao = self._obter_da_memoria(chave, agora)
+                if traducao is not None:
+                    self._acertos_memoria += 1
+                    return traducao, chave
+            for chave in chaves:
+                traducao = self._obter_do_sqlite(chave, agora)
+                if traducao is not None:
+                    self._acertos_sqlite += 1
+                    return traducao, chave
+            self._falhas += 1
+            return None
+
+    def _obter_da_memoria(self, chave: ChaveTraducao, agora: float) -> Optional[str]:
+        """Requer self._lock."""
+        item = self._memoria.get(chave)
+        if item is None:
+            return None
+        traducao, criado_em = item
+        if self._valido(criado_em, self._ttl, agora):
+            self._memoria.move_to_end(chave)
+            return traducao
+        del self._memoria[chave]
+        self._expiradas += 1
+        return None
+
+    def _obter_do_sqlite(self, chave: ChaveTraducao, agora: float) -> Optional[str]:
+        """Requer self._lock. Um acerto volta para a memória."""
+        if self._conexao is None:
+            return None
+        linha = self._conexao.execute(
+            "SELECT traducao, criado_em FROM traducoes WHERE texto = ? "
+            "AND idioma_origem = ? AND idioma_destino = ? AND provedor = ?",
+            chave
+        ).fetchone()
+        if linha is None:
+            return None
+        traducao, criado_em = linha
+        if self._valido(criado_em, self._ttl_sqlite, agora):
+            # Volta para a memória com a validade do nível de memória
+            self._guardar_em_memoria(chave, traducao, agora)
+            return traducao
+        self._conexao.execute(
+            "DELETE FROM traducoes WHERE texto = ? AND idioma_origem = ? "
+            "AND idioma_destino = ? AND provedor = ?", chave)
+        self._conexao.commit()
+        self._expiradas += 1
+        return None
+
+    def guardar(self, chave: ChaveTraducao, traducao: str) -> None:
+        """Armazena a tradução nos dois níveis."""
+        agora = self._relogio()
+        with self._lock:
+            self._guardar_em_memoria(chave, traducao, agora)
+            if self._conexao is not None:
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO traducoes VALUES (?, ?, ?, ?, ?, ?)",
+                    (*chave, traducao, agora))
+                self._conexao.commit()
+
+    def _guardar_em_memoria(self, chave: ChaveTraducao, traducao: str, agora: float) -> None:
+        """Insere no LRU despejando o item menos usado. Requer self._lock."""
+        self._memoria[chave] = (traducao, agora)
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self._max_itens:
+            self._memoria.popitem(last=False)
+            self._despejos += 1
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna acertos (por nível), falhas, taxa de acerto, despejos do
+        LRU, itens expirados e ocupação da memória.
+        """
+        with self._lock:
+            acertos = self._acertos_memoria + self._acertos_sqlite
+            consultas = acertos + self._falhas
+            return {
+                'acertos': acertos,
+                'acertos_memoria': self._acertos_memoria,
+                'acertos_sqlite': self._acertos_sqlite,
+                'falhas': self._falhas,
+                'taxa_acerto': acertos / consultas if consultas else 0.0,
+                'taxa_falha': self._falhas / consultas if consultas else 0.0,
+                'despejos': self._despejos,
+                'expiradas': self._expiradas,
+                'itens_memoria': len(self._memoria),
+            }
+
+    def limpar(self) -> None:
+        """Remove todas as traduções dos dois níveis."""
+        with self._lock:
+            self._memoria.clear()
+            if self._conexao is not None:
+                self._conexao.execute("DELETE FROM traducoes")
+                self._conexao.commit()
+
+    def fechar(self) -> None:
+        """Fecha a conexão com o SQLite (a memória continua utilizável)."""
+        with self._lock:
+            if self._conexao is not None:
+                self._conexao.close()
+                self._conexao = None
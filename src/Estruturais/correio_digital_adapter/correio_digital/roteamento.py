@@ -0,0 +1,249 @@
+"""
+Roteamento entre adaptadores de tradução do CorreioDigital.
+Disjuntores (circuit breakers) por provedor e ordenação dinâmica por latência e sucesso.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Union
+from .adapter_pattern import ITradutor
+
+
+class EstadoCircuito(Enum):
+    """Estados de um DisjuntorCircuito."""
+    FECHADO = "fechado"         # chamadas passam normalmente
+    ABERTO = "aberto"           # provedor considerado fora do ar: chamadas são evitadas
+    SEMI_ABERTO = "semi_aberto"  # uma chamada de teste decide se fecha ou reabre
+
+
+class DisjuntorCircuito:
+    """
+    Circuit breaker de um provedor.
+
+    Fechado, observa as últimas 'janela' chamadas; com pelo menos
+    'minimo_chamadas' e taxa de falhas >= 'limite_falhas', abre. Aberto,
+    recusa chamadas por 'tempo_aberto' segundos e então fica semi-aberto:
+    libera uma única chamada de teste, que fecha o circuito se der certo
+    ou o reabre se falhar.
+
+    É seguro para uso por várias threads.
+    """
+
+    def __init__(self, janela: int = 20, limite_falhas: float = 0.5,
+                 minimo_chamadas: int = 5, tempo_aberto: float = 30.0,
+                 relogio: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            janela: Quantidade de chamadas recentes consideradas
+            limite_falhas: Taxa de falhas (0 a 1) que abre o circuito
+            minimo_chamadas: Chamadas necessárias na janela antes de abrir
+            tempo_aberto: Segundos com o circuito aberto antes do teste
+            relogio: Fonte de tempo em segundos (útil para testes)
+        """
+        if not 0 < limite_falhas <= 1:
+            raise ValueError("limite_falhas deve estar entre 0 e 1")
+
+        self._resultados = deque(maxlen=janela)
+        self._limite_falhas = limite_falhas
+        self._minimo_chamadas = minimo_chamadas
+        self._tempo_aberto = tempo_aberto
+        self._relogio = relogio
+        self._estado = EstadoCircuito.FECHADO
+        self._aberto_em = 0.0
+        self._teste_em: Optional[float] = None
+        self._aberturas = 0
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self) -> EstadoCircuito:
+        """Estado atual (um circuito aberto há tempo suficiente já conta como semi-aberto)."""
+        with self._lock:
+            if (self._estado is EstadoCircuito.ABERTO
+                    and self._relogio() - self._aberto_em >= self._tempo_aberto):
+                return EstadoCircuito.SEMI_ABERTO
+            return self._estado
+
+    def permite(self) -> bool:
+        """
+        Se uma chamada ao provedor deve ser feita agora. No estado
+        semi-aberto, reserva a chamada de teste para quem recebeu True.
+        """
+        with self._lock:
+            agora = self._relogio()
+            if self._estado is EstadoCircuito.FECHADO:
+                return True
+            if self._estado is EstadoCircuito.ABERTO:
+                if agora - self._aberto_em < self._tempo_aberto:
+                    return False
+                self._estado = EstadoCircuito.SEMI_ABERTO
+                self._teste_em = None
+            # Semi-aberto: uma chamada de teste por vez (uma que nunca foi
+            # registrada é descartada depois de tempo_aberto)
+            if self._teste_em is not None and agora - self._teste_em < self._tempo_aberto:
+                return False
+            self._teste_em = agora
+            return True
+
+    def registrar_sucesso(self) -> None:
+        """Registra uma chamada bem-sucedida ao provedor."""
+        self.registrar(sucessos=1)
+
+    def registrar_falha(self) -> None:
+        """Registra uma chamada que falhou, abrindo o circuito se necessário."""
+        self.registrar(falhas=1)
+
+    def registrar(self, sucessos: int = 0, falhas: int = 0) -> None:
+        """
+        Registra o resultado de uma chamada com vários itens (ex: um lote),
+        contando cada item na janela. A chamada de teste do estado
+        semi-aberto fecha o circuito se a taxa de falhas dela ficou abaixo
+        do limite.
+        """
+        total = sucessos + falhas
+        if not total:
+            return
+        with self._lock:
+            if self._estado is EstadoCircuito.SEMI_ABERTO:
+                if falhas / total >= self._limite_falhas:
+                    self._abrir()
+                    return
+                self._estado = EstadoCircuito.FECHADO
+                self._resultados.clear()
+                self._teste_em = None
+            self._resultados.extend([True] * sucessos + [False] * falhas)
+            if (self._estado is EstadoCircuito.FECHADO and falhas
+                    and len(self._resultados) >= self._minimo_chamadas):
+                if self._resultados.count(False) / len(self._resultados) >= self._limite_falhas:
+                    self._abrir()
+
+    def _abrir(self) -> None:
+        """Requer self._lock."""
+        self._estado = EstadoCircuito.ABERTO
+        self._aberto_em = self._relogio()
+        self._teste_em = None
+        self._aberturas += 1
+
+    def estatisticas(self) -> dict:
+        """Retorna estado, taxa de falhas na janela e quantas vezes abriu."""
+        estado = self.estado
+        with self._lock:
+            chamadas = len(self._resultados)
+            return {
+                'estado': estado.value,
+                'taxa_falhas': self._resultados.count(False) / chamadas if chamadas else 0.0,
+                'aberturas': self._aberturas
+            }
+
+
+class PoliticaEWMA:
+    """
+    Política de roteamento que ordena os adaptadores pelo custo esperado
+    de uma tradução: latência média móvel exponencial (EWMA) das chamadas
+    bem-sucedidas dividida pela taxa de sucesso (também EWMA). Um provedor
+    rápido que falha muito fica atrás de um mais lento e confiável; falhas
+    rápidas não baixam a latência de um provedor quebrado.
+
+    Provedores ainda sem medições vão primeiro (na ordem original), para
+    que todos sejam experimentados; empates mantêm a ordem do construtor.
+
+    Um provedor que ficou atrás dos outros deixaria de ser chamado e suas
+    medições ficariam congeladas. Por isso, em uma fração 'exploracao' das
+    ordenações, o provedor com a medição mais antiga vai para a frente:
+    assim a recuperação de um provedor é notada (e o teste do disjuntor
+    semi-aberto acontece) sem desviar muito tráfego.
+    """
+
+    def __init__(self, alfa: float = 0.2, exploracao: float = 0.05,
+                 aleatorio: Optional[random.Random] = None):
+        """
+        Args:
+            alfa: Peso da medição mais recente (0 a 1); maior reage mais rápido
+            exploracao: Fração (0 a 1) das ordenações que experimentam o
+                provedor medido há mais tempo
+            aleatorio: Gerador de números aleatórios (útil para testes)
+        """
+        if not 0 < alfa <= 1:
+            raise ValueError("alfa deve estar entre 0 e 1")
+        if not 0 <= exploracao <= 1:
+            raise ValueError("exploracao deve estar entre 0 e 1")
+        self._alfa = alfa
+        self._exploracao = exploracao
+        self._aleatorio = aleatorio or random.Random()
+        self._latencia: Dict[str, float] = {}
+        self._sucesso: Dict[str, float] = {}
+        # provedor -> número da última medição (para achar a mais antiga)
+        self._medido_em: Dict[str, int] = {}
+        self._medicoes = 0
+        self._exploracoes = 0
+        self._lock = threading.Lock()
+
+    def registrar(self, provedor: str, latencia: float, sucesso: Union[bool, float]) -> None:
+        """
+        Incorpora o resultado de uma chamada ao provedor.
+
+        Args:
+            provedor: Nome do provedor
+            latencia: Segundos por item
+            sucesso: Se a chamada deu certo, ou a fração de itens bem-sucedidos
+        """
+        alfa = self._alfa
+        taxa = float(sucesso)
+        with self._lock:
+            self._medicoes += 1
+            self._medido_em[provedor] = self._medicoes
+            if provedor not in self._sucesso:
+                self._sucesso[provedor] = taxa
+            else:
+                self._sucesso[provedor] += alfa * (taxa - self._sucesso[provedor])
+            # Só chamadas com algum sucesso dizem quanto o provedor demora
+            if taxa > 0:
+                if provedor not in self._latencia:
+                    self._latencia[provedor] = latencia
+                else:
+                    self._latencia[provedor] += alfa * (latencia - self._latencia[provedor])
+
+    def _custo(self, provedor: str) -> float:
+        """Requer self._lock."""
+        if provedor not in self._sucesso:
+            return 0.0
+        latencia = self._latencia.get(provedor)
+        if latencia is None:
+            # Nunca acertou: no mínimo tão lento quanto o pior conhecido
+            latencia = max(self._latencia.values(), default=1.0)
+        return latencia / max(self._sucesso[provedor], 0.01)
+
+    def custo(self, provedor: str) -> float:
+        """Custo esperado (segundos por tradução bem-sucedida); 0 se sem medições."""
+        with self._lock:
+            return self._custo(provedor)
+
+    def ordenar(self, adaptadores: List[ITradutor]) -> List[ITradutor]:
+        """
+        Adaptadores do menor para o maior custo esperado (ou, na fração
+        'exploracao' das vezes, com o medido há mais tempo na frente).
+        """
+        with self._lock:
+            ordem = sorted(adaptadores, key=lambda a: self._custo(a.obter_provedor()))
+            if len(ordem) > 1 and self._aleatorio.random() < self._exploracao:
+                antigo = min(ordem[1:], key=lambda a: self._medido_em.get(a.obter_provedor(), 0))
+                ordem.remove(antigo)
+                ordem.insert(0, antigo)
+                self._exploracoes += 1
+        return ordem
+
+    def estatisticas(self) -> dict:
+        """Latência e taxa de sucesso (EWMA) por provedor e ordenações de exploração."""
+        with self._lock:
+            return {
+                'provedores': {
+                    provedor: {
+                        'latencia_ewma': self._latencia.get(provedor),
+                        'sucesso_ewma': self._sucesso[provedor]
+                    }
+                    for provedor in self._sucesso
+                },
+                'exploracoes': self._exploracoes
+            }
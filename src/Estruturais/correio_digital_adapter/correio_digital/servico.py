@@ -3,9 +3,30 @@ Serviço de tradução do CorreioDigital.
 Utiliza o padrão Adapter com fallback para garantir resiliência.
 """
 
-from typing import List, Optional
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from .adapter_pattern import ITradutor, TraducaoError
+from .cache import CacheTraducao, ChaveTraducao
 from .models import Mensagem
+from .roteamento import DisjuntorCircuito, PoliticaEWMA
+
+
+def _dividir_em_lotes(textos: List[str], max_itens: int,
+                      max_caracteres: int) -> Iterator[List[str]]:
+    """
+    Divide os textos em lotes consecutivos que respeitam os limites do
+    provedor. Um texto maior que max_caracteres vai sozinho em um lote.
+    """
+    lote: List[str] = []
+    caracteres = 0
+    for texto in textos:
+        if lote and (len(lote) == max_itens or caracteres + len(texto) > max_caracteres):
+            yield lote
+            lote, caracteres = [], 0
+        lote.append(texto)
+        caracteres += len(texto)
+    if lote:
+        yield lote
 
 
 class ServicoTraducao:
@@ -14,19 +35,101 @@ class ServicoTraducao:
     
     Gerencia tradução de mensagens usando múltiplos adaptadores com fallback.
     Não conhece detalhes das APIs externas - trabalha apenas com a interface ITradutor.
+    
+    Opcionalmente, cada adaptador ganha um disjuntor (circuit breaker): um
+    provedor fora do ar deixa de ser chamado até o próximo teste, em vez de
+    custar uma chamada com falha a cada mensagem. Com uma política de
+    roteamento, a ordem de tentativa passa a ser dinâmica (ex: PoliticaEWMA,
+    do provedor mais rápido e confiável para o mais lento).
     """
     
-    def __init__(self, adaptadores: List[ITradutor]):
+    def __init__(self, adaptadores: List[ITradutor], cache: Optional[CacheTraducao] = None,
+                 fabrica_disjuntor: Optional[Callable[[], DisjuntorCircuito]] = None,
+                 politica: Optional[PoliticaEWMA] = None):
         """
         Args:
             adaptadores: Lista de adaptadores de tradução (ordem define prioridade)
+            cache: Cache de traduções consultado antes dos provedores (opcional)
+            fabrica_disjuntor: Cria o disjuntor de cada adaptador (ex:
+                DisjuntorCircuito ou um lambda com outros limites); None
+                desativa os disjuntores
+            politica: Reordena os adaptadores a cada tradução; None mantém
+                a ordem do construtor
         """
         if not adaptadores:
             raise ValueError("É necessário fornecer pelo menos um adaptador")
         
         self._adaptadores = adaptadores
+        self._cache = cache
+        self._disjuntores: Dict[ITradutor, DisjuntorCircuito] = (
+            {a: fabrica_disjuntor() for a in adaptadores} if fabrica_disjuntor else {})
+        self._politica = politica
         self._mensagens_traduzidas: List[Mensagem] = []
     
+    def _ordem(self) -> List[ITradutor]:
+        """Adaptadores na ordem em que devem ser tentados."""
+        if self._politica is None:
+            return self._adaptadores
+        return self._politica.ordenar(self._adaptadores)
+    
+    def _disponivel(self, adaptador: ITradutor) -> bool:
+        """Se o disjuntor do adaptador (se houver) permite uma chamada agora."""
+        disjuntor = self._disjuntores.get(adaptador)
+        return disjuntor is None or disjuntor.permite()
+    
+    def _chamar(self, adaptador: ITradutor, operacao: Callable, *args, itens: int = 1):
+        """
+        Executa uma chamada ao adaptador registrando o resultado no disjuntor
+        e a latência por item na política de roteamento.
+        
+        Em lotes (itens > 1) o resultado conta item a item: os None devolvidos
+        por traduzir_lote são falhas, mesmo que a chamada não tenha levantado.
+        """
+        inicio = time.perf_counter()
+        try:
+            resultado = operacao(*args)
+        except TraducaoError:
+            self._registrar(adaptador, time.perf_counter() - inicio, itens, itens)
+            raise
+        falhas = sum(1 for r in resultado if r is None) if isinstance(resultado, list) else 0
+        self._registrar(adaptador, time.perf_counter() - inicio, itens, falhas)
+        return resultado
+    
+    def _registrar(self, adaptador: ITradutor, duracao: float, itens: int, falhas: int) -> None:
+        disjuntor = self._disjuntores.get(adaptador)
+        if disjuntor is not None:
+            disjuntor.registrar(sucessos=itens - falhas, falhas=falhas)
+        if self._politica is not None:
+            self._politica.registrar(adaptador.obter_provedor(), duracao / max(itens, 1),
+                                     (itens - falhas) / max(itens, 1))
+    
+    def _buscar_no_cache(self, texto: str, idioma_origem: Optional[str],
+                         idioma_destino: str) -> Optional[Tuple[str, str]]:
+        """
+        Procura uma tradução já feita por algum dos provedores, respeitando
+        a ordem de prioridade.
+        
+        Returns:
+            (texto traduzido, provedor) ou None se não estiver no cache
+        """
+        if self._cache is None:
+            return None
+        encontrada = self._cache.obter_qualquer(
+            ChaveTraducao.criar(texto, idioma_origem, idioma_destino, a.obter_provedor())
+            for a in self._adaptadores)
+        if encontrada is None:
+            return None
+        traducao, chave = encontrada
+        return traducao, chave.provedor
+    
+    def _guardar_no_cache(self, texto: str, idioma_origem: Optional[str],
+                          idioma_destino: str, adaptador: ITradutor, traducao: str) -> None:
+        if self._cache is not None:
+            self._cache.guardar(
+                ChaveTraducao.criar(texto, idioma_origem, idioma_destino,
+                                    adaptador.obter_provedor()),
+                traducao)
+    
     def traduzir_mensagem(self, mensagem: Mensagem) -> bool:
         """
         Traduz uma mensagem usando adaptadores com fallback.
@@ -49,30 +152,119 @@ class ServicoTraducao:
             mensagem.definir_traducao(mensagem.conteudo)
             return True
         
-        for i, adaptador in enumerate(self._adaptadores, 1):
+        em_cache = self._buscar_no_cache(mensagem.conteudo, mensagem.idioma_origem,
+                                         mensagem.idioma_destino)
+        if em_cache is not None:
+            texto_traduzido, provedor = em_cache
+            mensagem.definir_traducao(texto_traduzido)
+            self._mensagens_traduzidas.append(mensagem)
+            print(f"💾 Tradução encontrada no cache ({provedor})")
+            return True
+        
+        ordem = self._ordem()
+        for i, adaptador in enumerate(ordem, 1):
+            if not self._disponivel(adaptador):
+                print(f"⛔ Circuito aberto para {adaptador.obter_provedor()} - pulando")
+                continue
             try:
                 print(f"🔄 Tentativa {i}: Usando {adaptador.obter_provedor()}...")
                 
-                texto_traduzido = adaptador.traduzir(
+                texto_traduzido = self._chamar(
+                    adaptador,
+                    adaptador.traduzir,
                     mensagem.conteudo,
                     mensagem.idioma_destino
                 )
                 
                 mensagem.definir_traducao(texto_traduzido)
                 self._mensagens_traduzidas.append(mensagem)
+                self._guardar_no_cache(mensagem.conteudo, mensagem.idioma_origem,
+                                       mensagem.idioma_destino, adaptador, texto_traduzido)
                 
                 print(f"✅ Tradução bem-sucedida com {adaptador.obter_provedor()}")
                 return True
                 
             except TraducaoError as e:
                 print(f"❌ Falha com {adaptador.obter_provedor()}: {e}")
-                if i < len(self._adaptadores):
+                if i < len(ordem):
                     print(f"   Tentando próximo adaptador...")
                 continue
         
         print(f"⚠️  Todos os adaptadores falharam - mantendo texto original")
         return False
     
+    def traduzir_mensagens(self, mensagens: List[Mensagem]) -> int:
+        """
+        Traduz várias mensagens usando as APIs em lote dos adaptadores.
+        
+        As mensagens são agrupadas por idioma destino e os textos repetidos
+        são enviados uma vez só. Cada grupo é dividido em lotes dentro dos
+        limites do provedor (MAX_ITENS_LOTE e MAX_CARACTERES_LOTE); apenas
+        os textos que falharam seguem para o próximo adaptador.
+        
+        Args:
+            mensagens: Mensagens a serem traduzidas
+            
+        Returns:
+            Quantidade de mensagens traduzidas (as que falharam em todos os
+            adaptadores mantêm o texto original)
+        """
+        traduzidas = 0
+        # idioma destino -> texto -> mensagens com esse texto
+        grupos: Dict[str, Dict[str, List[Mensagem]]] = {}
+        for mensagem in mensagens:
+            if not mensagem.idioma_destino:
+                continue
+            if mensagem.idioma_origem == mensagem.idioma_destino:
+                mensagem.definir_traducao(mensagem.conteudo)
+                traduzidas += 1
+                continue
+            em_cache = self._buscar_no_cache(mensagem.conteudo, mensagem.idioma_origem,
+                                             mensagem.idioma_destino)
+            if em_cache is not None:
+                mensagem.definir_traducao(em_cache[0])
+                self._mensagens_traduzidas.append(mensagem)
+                traduzidas += 1
+                continue
+            grupos.setdefault(mensagem.idioma_destino, {}) \
+                .setdefault(mensagem.conteudo, []).append(mensagem)
+        
+        for idioma_destino, por_texto in grupos.items():
+            pendentes = list(por_texto)
+            for adaptador in self._ordem():
+                if not pendentes:
+                    break
+                print(f"🔄 {adaptador.obter_provedor()}: {len(pendentes)} textos para {idioma_destino}...")
+                falhas: List[str] = []
+                for lote in _dividir_em_lotes(pendentes, adaptador.MAX_ITENS_LOTE,
+                                              adaptador.MAX_CARACTERES_LOTE):
+                    # O disjuntor pode abrir no meio do grupo: o resto vai para o próximo
+                    if not self._disponivel(adaptador):
+                        falhas.extend(lote)
+                        continue
+                    try:
+                        resultados = self._chamar(adaptador, adaptador.traduzir_lote,
+                                                  lote, idioma_destino, itens=len(lote))
+                    except TraducaoError as e:
+                        print(f"❌ Lote de {len(lote)} textos falhou com {adaptador.obter_provedor()}: {e}")
+                        falhas.extend(lote)
+                        continue
+                    for texto, traducao in zip(lote, resultados):
+                        if traducao is None:
+                            falhas.append(texto)
+                            continue
+                        for mensagem in por_texto[texto]:
+                            mensagem.definir_traducao(traducao)
+                            self._mensagens_traduzidas.append(mensagem)
+                            self._guardar_no_cache(texto, mensagem.idioma_origem,
+                                                   idioma_destino, adaptador, traducao)
+                            traduzidas += 1
+                pendentes = falhas
+            if pendentes:
+                print(f"⚠️  {len(pendentes)} textos para {idioma_destino} falharam em todos os adaptadores")
+        
+        return traduzidas
+    
     def traduzir_texto(self, texto: str, idioma_destino: str) -> Optional[str]:
         """
         Traduz um texto diretamente (sem criar objeto Mensagem).
@@ -84,11 +276,19 @@ class ServicoTraducao:
         Returns:
             Texto traduzido ou None se todos adaptadores falharem
         """
-        for adaptador in self._adaptadores:
+        em_cache = self._buscar_no_cache(texto, None, idioma_destino)
+        if em_cache is not None:
+            return em_cache[0]
+        
+        for adaptador in self._ordem():
+            if not self._disponivel(adaptador):
+                continue
             try:
-                return adaptador.traduzir(texto, idioma_destino)
+                traducao = self._chamar(adaptador, adaptador.traduzir, texto, idioma_destino)
             except TraducaoError:
                 continue
+            self._guardar_no_cache(texto, None, idioma_destino, adaptador, traducao)
+            return traducao
         return None
     
     def obter_estatisticas(self) -> dict:
@@ -96,13 +296,22 @@ class ServicoTraducao:
         Retorna estatísticas do serviço de tradução.
         
         Returns:
-            Dict com estatísticas de uso
+            Dict com estatísticas de uso (e do cache, dos disjuntores e da
+            política de roteamento, se configurados)
         """
-        return {
+        estatisticas = {
             'adaptadores_disponiveis': len(self._adaptadores),
             'provedores': [a.obter_provedor() for a in self._adaptadores],
             'mensagens_traduzidas': len(self._mensagens_traduzidas)
         }
+        if self._cache is not None:
+            estatisticas['cache'] = self._cache.estatisticas()
+        if self._disjuntores:
+            estatisticas['circuitos'] = {a.obter_provedor(): d.estatisticas()
+                                         for a, d in self._disjuntores.items()}
+        if self._politica is not None:
+            estatisticas['roteamento'] = self._politica.estatisticas()
+        return estatisticas
     
     def obter_historico(self) -> List[Mensagem]:
         """Retorna histórico de mensagens traduzidas."""
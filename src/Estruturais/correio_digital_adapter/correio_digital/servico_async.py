@@ -0,0 +1,424 @@
+"""
+Versão assíncrona (asyncio) do serviço de tradução do CorreioDigital.
+Permite várias traduções em andamento ao mesmo tempo, com limites de concorrência.
+"""
+
+import asyncio
+import random
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Union
+from .adapter_pattern import ITradutor, TraducaoError
+from .models import Mensagem
+
+
+class ITradutorAsync(ABC):
+    """
+    Interface Target assíncrona do padrão Adapter.
+    Equivalente a ITradutor para o ServicoTraducaoAsync.
+
+    'cancelavel' diz se cancelar a corrotina de fato interrompe a
+    requisição ao provedor (True para clientes nativamente assíncronos).
+    """
+
+    cancelavel = True
+
+    @abstractmethod
+    async def atraduzir(self, texto: str, idioma_destino: str) -> str:
+        """
+        Traduz o texto para o idioma destino sem bloquear o event loop.
+
+        Args:
+            texto: Texto a ser traduzido
+            idioma_destino: Código ISO do idioma destino (ex: 'EN', 'PT', 'ES')
+
+        Returns:
+            Texto traduzido
+
+        Raises:
+            TraducaoError: Quando a tradução falhar
+        """
+        pass
+
+    @abstractmethod
+    def obter_provedor(self) -> str:
+        """Retorna o nome do provedor."""
+        pass
+
+
+class AdaptadorAsync(ITradutorAsync):
+    """
+    Adapter de um ITradutor síncrono para ITradutorAsync.
+
+    A chamada bloqueante roda em uma thread do executor padrão, então os
+    adaptadores existentes (GoogleAdapter, DeepLAdapter) podem ser usados
+    no serviço assíncrono sem alteração.
+
+    Limitação: uma thread não pode ser interrompida. Quando o hedging
+    cancela esta chamada, só a espera pelo resultado é cancelada; a
+    thread e a requisição HTTP continuam até o fim e o resultado é
+    descartado. Por isso cancelavel = False e essas chamadas aparecem
+    como 'abandonadas' (não 'canceladas') nas estatísticas do serviço: o
+    hedge corta a latência, mas não economiza a cota do provedor.
+    """
+
+    cancelavel = False
+
+    def __init__(self, tradutor: ITradutor):
+        """
+        Args:
+            tradutor: Adaptador síncrono a ser envolvido
+        """
+        self._tradutor = tradutor
+
+    async def atraduzir(self, texto: str, idioma_destino: str) -> str:
+        """Executa tradutor.traduzir em uma thread."""
+        return await asyncio.to_thread(self._tradutor.traduzir, texto, idioma_destino)
+
+    def obter_provedor(self) -> str:
+        """Retorna o nome do provedor do adaptador envolvido."""
+        return self._tradutor.obter_provedor()
+
+
+class TradutorSimuladoAsync(ITradutorAsync):
+    """
+    Provedor assíncrono simulado, para testes e benchmarks.
+
+    Cada chamada espera 'latencia' segundos (um número ou uma função que
+    sorteia a latência) e falha com probabilidade 'taxa_falha'. Registra
+    quantas chamadas houve e o pico de chamadas simultâneas.
+    """
+
+    def __init__(self, provedor: str = "Simulado",
+                 latencia: Union[float, Callable[[], float]] = 0.05,
+                 taxa_falha: float = 0.0,
+                 aleatorio: Optional[random.Random] = None):
+        """
+        Args:
+            provedor: Nome do provedor simulado
+            latencia: Segundos por chamada, ou função que retorna a latência
+            taxa_falha: Probabilidade (0 a 1) de a chamada falhar
+            aleatorio: Gerador de números aleatórios (útil para testes)
+        """
+        self._provedor = provedor
+        self._latencia = latencia
+        self._taxa_falha = taxa_falha
+        self._aleatorio = aleatorio or random.Random()
+        self.chamadas = 0
+        self.em_andamento = 0
+        self.pico_concorrencia = 0
+
+    async def atraduzir(self, texto: str, idioma_destino: str) -> str:
+        """Simula a requisição: espera a latência e traduz (ou falha)."""
+        self.chamadas += 1
+        self.em_andamento += 1
+        self.pico_concorrencia = max(self.pico_concorrencia, self.em_andamento)
+        try:
+            latencia = self._latencia() if callable(self._latencia) else self._latencia
+            await asyncio.sleep(latencia)
+            if not texto:
+                raise TraducaoError("Texto vazio")
+            if self._aleatorio.random() < self._taxa_falha:
+                raise TraducaoError(f"Falha simulada em {self._provedor}")
+            return f"[{self._provedor}] {texto} traduzido para {idioma_destino}"
+        finally:
+            self.em_andamento -= 1
+
+    def obter_provedor(self) -> str:
+        """Retorna o nome do provedor simulado."""
+        return self._provedor
+
+
+class ServicoTraducaoAsync:
+    """
+    Cliente assíncrono do padrão Adapter.
+
+    Mesmas regras e fallback ordenado do ServicoTraducao, mas várias
+    mensagens podem ser traduzidas ao mesmo tempo: um semáforo global limita
+    as traduções em andamento e, opcionalmente, um semáforo por provedor
+    limita as requisições simultâneas a cada API.
+
+    Com hedging ativado, se o adaptador ainda não respondeu depois de um
+    atraso (fixo, ou o p95 observado daquele provedor), a mesma tradução
+    também é pedida ao próximo adaptador. A primeira resposta bem-sucedida
+    vence e as demais requisições são canceladas. Isso corta a cauda de
+    latência ao custo de algumas requisições a mais (a taxa de hedge).
+    Requisições de um AdaptadorAsync não podem ser interrompidas: elas
+    são abandonadas (ver AdaptadorAsync) e contadas à parte.
+    """
+
+    # Atraso de hedge usado enquanto o provedor tem poucas amostras de latência
+    ATRASO_HEDGE_INICIAL = 1.0
+    AMOSTRAS_MINIMAS = 20
+    # O p95 de cada provedor é recalculado a cada tantas amostras novas
+    RECALCULO_P95 = 16
+
+    def __init__(self, adaptadores: List[ITradutorAsync], max_concorrencia: int = 10,
+                 limites_por_provedor: Optional[Dict[str, int]] = None,
+                 hedging: bool = False, atraso_hedge: Optional[float] = None):
+        """
+        Args:
+            adaptadores: Lista de adaptadores assíncronos (ordem define prioridade)
+            max_concorrencia: Máximo de traduções em andamento ao mesmo tempo
+            limites_por_provedor: Máximo de requisições simultâneas por
+                provedor (nome -> limite); provedores ausentes só respeitam
+                o limite global
+            hedging: Dispara o próximo adaptador se o atual demorar
+            atraso_hedge: Segundos de espera antes do hedge; None usa o p95
+                das latências observadas do adaptador que está demorando
+        """
+        if not adaptadores:
+            raise ValueError("É necessário fornecer pelo menos um adaptador")
+        if max_concorrencia < 1:
+            raise ValueError("max_concorrencia deve ser maior que zero")
+
+        self._adaptadores = adaptadores
+        self._max_concorrencia = max_concorrencia
+        self._limites_por_provedor = dict(limites_por_provedor or {})
+        # Semáforos são criados sob demanda para cada event loop (um asyncio.Semaphore
+        # fica preso ao loop em que foi usado); loops encerrados saem sozinhos
+        self._semaforos: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = \
+            weakref.WeakKeyDictionary()
+        self._mensagens_traduzidas: List[Mensagem] = []
+        self._chamadas: Dict[str, int] = {a.obter_provedor(): 0 for a in adaptadores}
+        self._falhas: Dict[str, int] = {a.obter_provedor(): 0 for a in adaptadores}
+        self._hedging = hedging
+        self._atraso_hedge = atraso_hedge
+        self._latencias: Dict[str, Deque[float]] = {}
+        self._amostras: Dict[str, int] = {}
+        # provedor -> (amostras quando foi calculado, p95)
+        self._p95: Dict[str, Tuple[int, float]] = {}
+        self._requisicoes = 0
+        self._com_hedge = 0
+        self._hedges = 0
+        self._canceladas = 0
+        self._abandonadas = 0
+        self._vitorias: Dict[str, int] = {a.obter_provedor(): 0 for a in adaptadores}
+
+    def _semaforos_do_loop(self) -> dict:
+        """Semáforos do event loop em execução: None -> global, provedor -> limite."""
+        loop = asyncio.get_running_loop()
+        semaforos = self._semaforos.get(loop)
+        if semaforos is None:
+            semaforos = self._semaforos[loop] = {
+                None: asyncio.Semaphore(self._max_concorrencia)}
+        return semaforos
+
+    def _semaforo_global(self) -> asyncio.Semaphore:
+        return self._semaforos_do_loop()[None]
+
+    def _semaforo_de(self, provedor: str) -> Optional[asyncio.Semaphore]:
+        limite = self._limites_por_provedor.get(provedor)
+        if limite is None:
+            return None
+        semaforos = self._semaforos_do_loop()
+        semaforo = semaforos.get(provedor)
+        if semaforo is None:
+            semaforo = semaforos[provedor] = asyncio.Semaphore(limite)
+        return semaforo
+
+    async def _chamar(self, adaptador: ITradutorAsync, texto: str, idioma_destino: str) -> str:
+        """Uma requisição ao adaptador, respeitando o limite do provedor."""
+        provedor = adaptador.obter_provedor()
+        self._chamadas[provedor] = self._chamadas.get(provedor, 0) + 1
+        semaforo = self._semaforo_de(provedor)
+        if semaforo is None:
+            return await self._medir(adaptador, texto, idioma_destino)
+        async with semaforo:
+            return await self._medir(adaptador, texto, idioma_destino)
+
+    async def _medir(self, adaptador: ITradutorAsync, texto: str, idioma_destino: str) -> str:
+        """
+        Chama o adaptador registrando a latência do provedor (sem a espera
+        pelo semáforo). Uma chamada cancelada pelo hedge entra com o tempo
+        que já tinha levado: a latência real foi no mínimo essa, e ignorá-la
+        deixaria o p95 otimista justamente para o provedor lento.
+        """
+        provedor = adaptador.obter_provedor()
+        inicio = time.perf_counter()
+        try:
+            traducao = await adaptador.atraduzir(texto, idioma_destino)
+        except TraducaoError:
+            self._falhas[provedor] = self._falhas.get(provedor, 0) + 1
+            raise
+        except asyncio.CancelledError:
+            self._registrar_latencia(provedor, time.perf_counter() - inicio)
+            raise
+        self._registrar_latencia(provedor, time.perf_counter() - inicio)
+        return traducao
+
+    def _registrar_latencia(self, provedor: str, latencia: float) -> None:
+        """Guarda a latência nas últimas amostras do provedor."""
+        latencias = self._latencias.get(provedor)
+        if latencias is None:
+            latencias = self._latencias[provedor] = deque(maxlen=256)
+        latencias.append(latencia)
+        self._amostras[provedor] = self._amostras.get(provedor, 0) + 1
+
+    def _espera_hedge(self, adaptador: ITradutorAsync) -> float:
+        """Quanto esperar pelo adaptador antes de disparar o próximo."""
+        if self._atraso_hedge is not None:
+            return self._atraso_hedge
+        provedor = adaptador.obter_provedor()
+        latencias = self._latencias.get(provedor)
+        if latencias is None or len(latencias) < self.AMOSTRAS_MINIMAS:
+            return self.ATRASO_HEDGE_INICIAL
+        amostras = self._amostras[provedor]
+        calculado = self._p95.get(provedor)
+        if calculado is None or amostras - calculado[0] >= self.RECALCULO_P95:
+            ordenadas = sorted(latencias)
+            calculado = self._p95[provedor] = (
+                amostras, ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.95))])
+        return calculado[1]
+
+    async def _traduzir_com_fallback(self, texto: str, idioma_destino: str) -> Optional[str]:
+        """Tenta os adaptadores em ordem; None se todos falharem."""
+        async with self._semaforo_global():
+            if self._hedging:
+                return await self._traduzir_com_hedge(texto, idioma_destino)
+            for adaptador in self._adaptadores:
+                try:
+                    return await self._chamar(adaptador, texto, idioma_destino)
+                except TraducaoError:
+                    continue
+        return None
+
+    async def _traduzir_com_hedge(self, texto: str, idioma_destino: str) -> Optional[str]:
+        """
+        Fallback ordenado com hedging: o próximo adaptador é disparado quando
+        o anterior falha ou demora mais que _espera_hedge(); a primeira
+        tradução bem-sucedida vence e as outras requisições são canceladas.
+        """
+        self._requisicoes += 1
+        restantes = iter(self._adaptadores)
+        em_andamento: Dict[asyncio.Task, ITradutorAsync] = {}
+        ultimo: Optional[ITradutorAsync] = None
+        houve_hedge = False
+
+        def disparar() -> bool:
+            nonlocal ultimo
+            adaptador = next(restantes, None)
+            if adaptador is None:
+                return False
+            tarefa = asyncio.ensure_future(self._chamar(adaptador, texto, idioma_destino))
+            em_andamento[tarefa] = ultimo = adaptador
+            return True
+
+        disparar()
+        try:
+            while em_andamento:
+                concluidas, _ = await asyncio.wait(em_andamento, timeout=self._espera_hedge(ultimo),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not concluidas:
+                    # O adaptador mais recente está demorando: hedge no próximo
+                    if disparar():
+                        self._hedges += 1
+                        if not houve_hedge:
+                            houve_hedge = True
+                            self._com_hedge += 1
+                    else:
+                        await asyncio.wait(em_andamento, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                for tarefa in concluidas:
+                    adaptador = em_andamento.pop(tarefa)
+                    if isinstance(tarefa.exception(), TraducaoError):
+                        # Segue o fallback ordenado já, sem esperar o atraso
+                        # de hedge (mesmo que outra chamada ainda esteja em andamento)
+                        disparar()
+                        continue
+                    traducao = tarefa.result()
+                    if houve_hedge:
+                        provedor = adaptador.obter_provedor()
+                        self._vitorias[provedor] = self._vitorias.get(provedor, 0) + 1
+                    return traducao
+            return None
+        finally:
+            for tarefa, adaptador in em_andamento.items():
+                tarefa.cancel()
+                if adaptador.cancelavel:
+                    self._canceladas += 1
+                else:
+                    self._abandonadas += 1
+            if em_andamento:
+                await asyncio.gather(*em_andamento, return_exceptions=True)
+
+    async def atraduzir_mensagem(self, mensagem: Mensagem) -> bool:
+        """
+        Traduz uma mensagem usando adaptadores com fallback.
+
+        Args:
+            mensagem: Mensagem a ser traduzida
+
+        Returns:
+            True se tradução foi bem-sucedida, False se todos adaptadores falharam
+        """
+        if not mensagem.idioma_destino:
+            return False
+
+        if mensagem.idioma_origem == mensagem.idioma_destino:
+            mensagem.definir_traducao(mensagem.conteudo)
+            return True
+
+        texto_traduzido = await self._traduzir_com_fallback(mensagem.conteudo,
+                                                            mensagem.idioma_destino)
+        if texto_traduzido is None:
+            print(f"⚠️  Todos os adaptadores falharam - mantendo texto original")
+            return False
+
+        mensagem.definir_traducao(texto_traduzido)
+        self._mensagens_traduzidas.append(mensagem)
+        return True
+
+    async def atraduzir_muitas(self, mensagens: List[Mensagem]) -> List[bool]:
+        """
+        Traduz várias mensagens concorrentemente, com no máximo
+        max_concorrencia traduções em andamento.
+
+        Args:
+            mensagens: Mensagens a serem traduzidas
+
+        Returns:
+            Resultado de atraduzir_mensagem para cada mensagem, na mesma ordem
+        """
+        return list(await asyncio.gather(*(self.atraduzir_mensagem(m) for m in mensagens)))
+
+    async def atraduzir_texto(self, texto: str, idioma_destino: str) -> Optional[str]:
+        """
+        Traduz um texto diretamente (sem criar objeto Mensagem).
+
+        Returns:
+            Texto traduzido ou None se todos adaptadores falharem
+        """
+        return await self._traduzir_com_fallback(texto, idioma_destino)
+
+    def obter_estatisticas(self) -> dict:
+        """
+        Retorna estatísticas do serviço de tradução.
+
+        Returns:
+            Dict com estatísticas de uso, incluindo chamadas e falhas por
+            provedor e, no hedging, a taxa de hedge e as vitórias por provedor
+        """
+        return {
+            'adaptadores_disponiveis': len(self._adaptadores),
+            'provedores': [a.obter_provedor() for a in self._adaptadores],
+            'mensagens_traduzidas': len(self._mensagens_traduzidas),
+            'max_concorrencia': self._max_concorrencia,
+            'chamadas_por_provedor': dict(self._chamadas),
+            'falhas_por_provedor': dict(self._falhas),
+            'hedging': {
+                'requisicoes': self._requisicoes,
+                'com_hedge': self._com_hedge,
+                'hedges_disparados': self._hedges,
+                'canceladas': self._canceladas,
+                'abandonadas': self._abandonadas,
+                'taxa_hedge': self._com_hedge / self._requisicoes if self._requisicoes else 0.0,
+                'vitorias_por_provedor': dict(self._vitorias)
+            }
+        }
+
+    def obter_historico(self) -> List[Mensagem]:
+        """Retorna histórico de mensagens traduzidas."""
+        return self._mensagens_traduzidas.copy()
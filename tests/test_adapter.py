@@ -15,6 +15,7 @@ from src.Estruturais.correio_digital_adapter.correio_digital import (
     DeepLAdapter,
     ServicoTraducao
 )
+from src.Estruturais.correio_digital_adapter.correio_digital.servico import _dividir_em_lotes
 
 
 class TestAdaptadores(unittest.TestCase):
@@ -203,6 +204,87 @@ class TestFallback(unittest.TestCase):
         self.assertIsNone(resultado)
 
 
+class TestTraducaoEmLote(unittest.TestCase):
+    """Testes para traduzir_lote e ServicoTraducao.traduzir_mensagens."""
+    
+    class GoogleContador(GoogleTranslateAPI):
+        """API do Google que registra o tamanho de cada requisição em lote."""
+        
+        def __init__(self):
+            self.requisicoes = []
+        
+        def traduzir_textos(self, textos, destino):
+            self.requisicoes.append(len(textos))
+            return super().traduzir_textos(textos, destino)
+    
+    def test_implementacao_padrao_marca_falhas_individuais(self):
+        """Testa se o loop padrão de ITradutor devolve None só no item que falhou."""
+        class TradutorSimples(ITradutor):
+            def traduzir(self, texto, idioma_destino):
+                if texto == "ruim":
+                    raise TraducaoError("falha")
+                return texto.upper()
+        
+        resultado = TradutorSimples().traduzir_lote(["a", "ruim", "b"], "EN")
+        self.assertEqual(resultado, ["A", None, "B"])
+    
+    def test_deepl_lote_preserva_ordem_e_ignora_vazios(self):
+        """Testa se o DeepLAdapter traduz o lote em uma chamada, na ordem."""
+        adaptador = DeepLAdapter(DeepLAPI())
+        resultado = adaptador.traduzir_lote(["um", "", "dois"], "EN")
+        self.assertIn("um", resultado[0])
+        self.assertIsNone(resultado[1])
+        self.assertIn("dois", resultado[2])
+    
+    def test_dividir_respeita_itens_e_caracteres(self):
+        """Testa a divisão em lotes pelos limites do provedor."""
+        lotes = list(_dividir_em_lotes(["aaaa", "bb", "cc", "d", "eeeeeeee"],
+                                       max_itens=3, max_caracteres=6))
+        self.assertEqual(lotes, [["aaaa", "bb"], ["cc", "d"], ["eeeeeeee"]])
+    
+    def test_servico_agrupa_por_idioma_e_divide_em_lotes(self):
+        """Testa se 300 mensagens viram poucas requisições por idioma."""
+        api = self.GoogleContador()
+        servico = ServicoTraducao([GoogleAdapter(api)])
+        mensagens = [Mensagem(f"texto {i % 200}", "PT", "u1", "u2", "EN" if i % 2 else "ES")
+                     for i in range(300)]
+        
+        self.assertEqual(servico.traduzir_mensagens(mensagens), 300)
+        # 100 textos distintos por idioma: um lote por idioma
+        self.assertEqual(api.requisicoes, [100, 100])
+        self.assertTrue(all("Google" in m.traducao for m in mensagens))
+    
+    def test_falha_parcial_so_reenvia_itens_que_falharam(self):
+        """Testa se apenas os textos que falharam vão para o próximo adaptador."""
+        class GoogleComFalhaNoItem(GoogleAdapter):
+            def traduzir_lote(self, textos, idioma_destino):
+                resultados = super().traduzir_lote(textos, idioma_destino)
+                return [None if "erro" in t else r for t, r in zip(textos, resultados)]
+        
+        deepl_api = DeepLAPI()
+        enviados = []
+        original = deepl_api.translate
+        deepl_api.translate = lambda text, **kw: (enviados.append(list(text)), original(text, **kw))[1]
+        
+        servico = ServicoTraducao([GoogleComFalhaNoItem(GoogleTranslateAPI()), DeepLAdapter(deepl_api)])
+        mensagens = [Mensagem(t, "PT", "u1", "u2", "EN") for t in ("ok 1", "erro 1", "ok 2")]
+        
+        self.assertEqual(servico.traduzir_mensagens(mensagens), 3)
+        self.assertEqual(enviados, [["erro 1"]])
+        self.assertIn("Google", mensagens[0].traducao)
+        self.assertIn("DeepL", mensagens[1].traducao)
+    
+    def test_lote_mantem_regras_de_mensagem_individual(self):
+        """Testa mensagens sem destino e com origem igual ao destino."""
+        servico = ServicoTraducao([GoogleAdapter(GoogleTranslateAPI())])
+        sem_destino = Mensagem("Olá", "PT", "u1", "u2")
+        mesmo_idioma = Mensagem("Hello", "EN", "u1", "u2", "EN")
+        
+        self.assertEqual(servico.traduzir_mensagens([sem_destino, mesmo_idioma]), 1)
+        self.assertIsNone(sem_destino.traducao)
+        self.assertEqual(mesmo_idioma.traducao, "Hello")
+
+
 class TestModelos(unittest.TestCase):
     """Testes para o modelo Mensagem."""
     
@@ -0,0 +1,94 @@
+# tests/test_agendamento.py
+
+import threading
+import time
+import unittest
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    Observer,
+    Prioridade,
+    SistemaDeMensagens,
+    DespachantePrioritario
+)
+
+class ObservadorRegistrador(Observer):
+    """Anota em 'ordem' o nome do canal a cada entrega."""
+    def __init__(self, nome: str, ordem: list, prioridade: Prioridade,
+                 prazo: float = None, liberar: threading.Event = None):
+        self.nome = nome
+        self.ordem = ordem
+        self.prioridade = prioridade
+        self.prazo = prazo
+        self.liberar = liberar
+        self.recebidas = []
+
+    def update(self, mensagem) -> None:
+        if self.liberar is not None:
+            self.liberar.wait()
+        self.ordem.append(self.nome)
+        self.recebidas.append(mensagem.conteudo)
+
+class TestDespachantePrioritario(unittest.TestCase):
+
+    def setUp(self):
+        self.ordem = []
+        self.liberar = threading.Event()
+        self.despachante = DespachantePrioritario(max_workers=1)
+        self.sistema = SistemaDeMensagens(despachante=self.despachante)
+        # Ocupa a única thread até 'liberar', para as demais entregas enfileirarem
+        self.bloqueio = ObservadorRegistrador("bloqueio", [], Prioridade.URGENTE,
+                                              liberar=self.liberar)
+
+    def tearDown(self):
+        self.liberar.set()
+        self.sistema.close()
+
+    def ocupar_worker(self):
+        sistema = SistemaDeMensagens(despachante=self.despachante)
+        sistema.attach(self.bloqueio)
+        sistema.novaMensagem("x", "y", "ocupa")
+        time.sleep(0.05)
+
+    def test_canal_urgente_passa_na_frente(self):
+        email = ObservadorRegistrador("email", self.ordem, Prioridade.BAIXA)
+        mobile = ObservadorRegistrador("mobile", self.ordem, Prioridade.URGENTE)
+        web = ObservadorRegistrador("web", self.ordem, Prioridade.ALTA)
+        for obs in (email, mobile, web):
+            self.sistema.attach(obs)
+
+        self.ocupar_worker()
+        self.sistema.novaMensagem("a", "b", "1")
+        self.liberar.set()
+        self.sistema.flush()
+
+        self.assertEqual(self.ordem, ["mobile", "web", "email"])
+
+    def test_descarta_entregas_expiradas(self):
+        mobile = ObservadorRegistrador("mobile", self.ordem, Prioridade.URGENTE, prazo=0.01)
+        email = ObservadorRegistrador("email", self.ordem, Prioridade.BAIXA)
+        self.sistema.attach(mobile)
+        self.sistema.attach(email)
+
+        self.ocupar_worker()
+        self.sistema.novaMensagem("a", "b", "1")
+        time.sleep(0.05)
+        self.liberar.set()
+        self.sistema.flush()
+
+        self.assertEqual(self.ordem, ["email"])
+        self.assertEqual(self.despachante.expiradas(), 1)
+        self.assertEqual(self.sistema.metricas()["despachante"]["expiradas"], 1)
+
+    def test_preserva_ordem_por_observador(self):
+        despachante = DespachantePrioritario(max_workers=4)
+        sistema = SistemaDeMensagens(despachante=despachante)
+        obs = ObservadorRegistrador("web", self.ordem, Prioridade.ALTA)
+        sistema.attach(obs)
+        for i in range(50):
+            sistema.novaMensagem("a", "b", str(i))
+        sistema.close()
+
+        self.assertEqual(obs.recebidas, [str(i) for i in range(50)])
+
+if __name__ == "__main__":
+    unittest.main()
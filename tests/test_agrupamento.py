@@ -0,0 +1,96 @@
+# tests/test_agrupamento.py
+
+import datetime
+import threading
+import time
+import unittest
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    Mensagem,
+    Observer,
+    SistemaDeMensagens,
+    ObservadorAgrupado,
+    Temporizador,
+    temporizador_padrao
+)
+
+class ObservadorColetor(Observer):
+    def __init__(self):
+        self.recebidas = []
+        self.evento = threading.Event()
+
+    def update(self, mensagem) -> None:
+        self.recebidas.append(mensagem)
+        self.evento.set()
+
+class TestObservadorAgrupado(unittest.TestCase):
+
+    def setUp(self):
+        self.sistema = SistemaDeMensagens()
+        self.coletor = ObservadorColetor()
+        self.agrupado = ObservadorAgrupado(self.coletor, janela=0.05)
+        self.sistema.attach(self.agrupado)
+
+    def tearDown(self):
+        self.agrupado.close()
+
+    def test_rajada_vira_um_unico_resumo(self):
+        for i in range(3):
+            self.sistema.novaMensagem("alice", "bob", f"msg {i}")
+
+        self.assertTrue(self.coletor.evento.wait(1))
+        time.sleep(0.05)
+        self.assertEqual(len(self.coletor.recebidas), 1)
+        self.assertEqual(self.coletor.recebidas[0].conteudo, "3 novas mensagens de alice")
+
+    def test_agrupa_por_destinatario(self):
+        self.sistema.novaMensagem("alice", "bob", "oi bob")
+        self.sistema.novaMensagem("carol", "dave", "oi dave")
+        self.sistema.novaMensagem("erin", "dave", "oi de novo")
+        self.agrupado.flush()
+
+        conteudos = sorted(m.conteudo for m in self.coletor.recebidas)
+        self.assertEqual(conteudos, ["2 novas mensagens de carol e erin", "oi bob"])
+
+    def test_mensagem_unica_e_entregue_sem_resumo(self):
+        self.sistema.novaMensagem("alice", "bob", "só uma")
+        self.assertTrue(self.coletor.evento.wait(1))
+        self.assertEqual(self.coletor.recebidas[0].conteudo, "só uma")
+
+    def test_flush_cancela_a_janela_antiga(self):
+        agrupado = ObservadorAgrupado(self.coletor, janela=0.2)
+        agrupado.update(Mensagem("alice", "bob", "antes", datetime.datetime.now()))
+        time.sleep(0.1)
+        agrupado.flush()
+        agrupado.update(Mensagem("alice", "bob", "depois", datetime.datetime.now()))
+        # O callback da primeira janela venceria aqui
+        time.sleep(0.15)
+        self.assertEqual([m.conteudo for m in self.coletor.recebidas], ["antes"])
+        agrupado.close()
+        self.assertEqual([m.conteudo for m in self.coletor.recebidas], ["antes", "depois"])
+
+    def test_decorators_compartilham_um_temporizador(self):
+        outro = ObservadorAgrupado(ObservadorColetor(), janela=0.05)
+        self.assertIs(outro._temporizador, self.agrupado._temporizador)
+        self.assertIs(outro._temporizador, temporizador_padrao())
+        outro.close()
+        # Fechar um decorator não para o temporizador dos outros
+        self.sistema.novaMensagem("alice", "bob", "depois")
+        self.assertTrue(self.coletor.evento.wait(1))
+
+class TestTemporizador(unittest.TestCase):
+
+    def test_dispara_em_ordem_de_prazo_e_respeita_cancelamento(self):
+        temporizador = Temporizador()
+        disparos = []
+        pronto = threading.Event()
+        temporizador.agendar(0.06, lambda: (disparos.append("c"), pronto.set()))
+        temporizador.agendar(0.02, lambda: disparos.append("a"))
+        temporizador.agendar(0.04, lambda: disparos.append("b")).cancelar()
+
+        self.assertTrue(pronto.wait(1))
+        temporizador.close()
+        self.assertEqual(disparos, ["a", "c"])
+
+if __name__ == "__main__":
+    unittest.main()
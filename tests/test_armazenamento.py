@@ -0,0 +1,62 @@
+# tests/test_armazenamento.py
+
+import datetime
+import unittest
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    Mensagem,
+    MensagemCompacta,
+    ArmazenamentoEmMemoria
+)
+
+def criar_mensagem(i: int, timestamp: datetime.datetime = None) -> Mensagem:
+    return Mensagem(
+        remetente=f"rem{i % 3}",
+        destinatario=f"dest{i % 2}",
+        conteudo=f"conteudo {i}",
+        timestamp=timestamp or datetime.datetime(2025, 1, 1, 12, 0, 0, i)
+    )
+
+class TestMensagemCompacta(unittest.TestCase):
+
+    def test_ida_e_volta_preserva_campos(self):
+        original = criar_mensagem(7)
+        self.assertEqual(MensagemCompacta.de_mensagem(original).para_mensagem(), original)
+
+    def test_nao_tem_dict_por_instancia(self):
+        compacta = MensagemCompacta.de_mensagem(criar_mensagem(1))
+        self.assertFalse(hasattr(compacta, "__dict__"))
+
+class TestArmazenamentoEmMemoria(unittest.TestCase):
+
+    def test_buffer_circular_descarta_as_mais_antigas(self):
+        armazenamento = ArmazenamentoEmMemoria(max_mensagens=3)
+        for i in range(5):
+            self.assertEqual(armazenamento.adicionar(criar_mensagem(i)), i)
+
+        self.assertEqual(len(armazenamento), 3)
+        self.assertEqual(armazenamento.primeiro_offset, 2)
+        self.assertIsNone(armazenamento.obter(1))
+        self.assertEqual([m.conteudo for m in armazenamento],
+                         ["conteudo 2", "conteudo 3", "conteudo 4"])
+        self.assertEqual(armazenamento.ultima().conteudo, "conteudo 4")
+
+    def test_retencao_por_idade(self):
+        armazenamento = ArmazenamentoEmMemoria(max_idade=datetime.timedelta(minutes=10))
+        base = datetime.datetime(2025, 1, 1, 12, 0)
+        armazenamento.adicionar(criar_mensagem(0, base))
+        armazenamento.adicionar(criar_mensagem(1, base + datetime.timedelta(minutes=5)))
+        armazenamento.adicionar(criar_mensagem(2, base + datetime.timedelta(minutes=12)))
+
+        self.assertEqual([m.conteudo for m in armazenamento], ["conteudo 1", "conteudo 2"])
+
+    def test_adicionar_lote(self):
+        armazenamento = ArmazenamentoEmMemoria(max_mensagens=4)
+        primeiro = armazenamento.adicionar_lote([criar_mensagem(i) for i in range(6)])
+
+        self.assertEqual(primeiro, 0)
+        self.assertEqual(armazenamento.primeiro_offset, 2)
+        self.assertEqual(armazenamento.obter(5).conteudo, "conteudo 5")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+# tests/test_barramento.py
+
+import multiprocessing
+import threading
+import unittest
+from unittest import mock
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    SistemaDeMensagens,
+    PublicadorDoBarramento,
+    ConsumidorDoBarramento
+)
+from src.Comportamentais.correio_digital_observer.correio_digital import barramento
+from src.Comportamentais.correio_digital_observer.correio_digital.serializacao import (
+    RegistroCorrompidoError
+)
+from src.Comportamentais.correio_digital_observer import correio_digital
+
+LOGGER = correio_digital.__name__
+
+def consumir_em_outro_processo(nome: str, quantidade: int, saida) -> None:
+    consumidor = ConsumidorDoBarramento(nome, do_inicio=True)
+    recebidas = []
+    while len(recebidas) < quantidade:
+        recebidas.extend(m.conteudo for m in consumidor.aguardar(timeout=5))
+    consumidor.close()
+    saida.put(recebidas)
+
+class TestBarramento(unittest.TestCase):
+
+    def setUp(self):
+        self.sistema = SistemaDeMensagens()
+
+    def publicador(self, capacidade: int) -> PublicadorDoBarramento:
+        publicador = PublicadorDoBarramento(capacidade=capacidade)
+        self.addCleanup(publicador.close)
+        self.sistema.attach(publicador)
+        return publicador
+
+    def test_consumidores_com_cursores_independentes(self):
+        publicador = self.publicador(4096)
+        primeiro = ConsumidorDoBarramento(publicador.nome)
+        self.addCleanup(primeiro.close)
+
+        self.sistema.novaMensagem("alice", "bob", "1")
+        segundo = ConsumidorDoBarramento(publicador.nome)
+        self.addCleanup(segundo.close)
+        self.sistema.novasMensagens([("alice", "bob", "2"), ("carol", "bob", "3")])
+
+        self.assertEqual([m.conteudo for m in primeiro.ler()], ["1", "2", "3"])
+        self.assertEqual([m.conteudo for m in segundo.ler()], ["2", "3"])
+        self.assertEqual(primeiro.ler(), [])
+        self.assertEqual(primeiro.atrasadas(), 0)
+
+    def test_buffer_circular_da_a_volta(self):
+        publicador = self.publicador(200)
+        consumidor = ConsumidorDoBarramento(publicador.nome)
+        self.addCleanup(consumidor.close)
+
+        recebidas = []
+        for i in range(50):
+            self.sistema.novaMensagem("alice", "bob", f"mensagem {i}")
+            recebidas.extend(m.conteudo for m in consumidor.ler())
+
+        self.assertEqual(recebidas, [f"mensagem {i}" for i in range(50)])
+        self.assertEqual(consumidor.perdidas, 0)
+
+    def test_consumidor_lento_perde_mensagens_sobrescritas(self):
+        publicador = self.publicador(200)
+        consumidor = ConsumidorDoBarramento(publicador.nome)
+        self.addCleanup(consumidor.close)
+
+        for i in range(20):
+            self.sistema.novaMensagem("alice", "bob", f"mensagem {i}")
+        with self.assertLogs(LOGGER, level="WARNING"):
+            self.assertEqual(consumidor.ler(), [])
+        self.assertEqual(consumidor.perdidas, 20)
+
+        self.sistema.novaMensagem("alice", "bob", "nova")
+        self.assertEqual([m.conteudo for m in consumidor.ler()], ["nova"])
+
+    def test_copia_corrompida_conta_como_ultrapassado(self):
+        publicador = self.publicador(4096)
+        consumidor = ConsumidorDoBarramento(publicador.nome)
+        self.addCleanup(consumidor.close)
+        self.sistema.novasMensagens([("alice", "bob", "1"), ("alice", "bob", "2")])
+
+        # Simula o publicador sobrescrevendo a região durante a cópia
+        with mock.patch.object(barramento, "validar",
+                               side_effect=RegistroCorrompidoError("CRC inválido")):
+            with self.assertLogs(LOGGER, level="WARNING"):
+                self.assertEqual(consumidor.ler(), [])
+        self.assertEqual((consumidor.corrompidas, consumidor.perdidas), (1, 2))
+
+        self.sistema.novaMensagem("alice", "bob", "3")
+        self.assertEqual([m.conteudo for m in consumidor.ler()], ["3"])
+
+    def test_executar_sobrevive_a_falha_de_leitura(self):
+        publicador = self.publicador(4096)
+        consumidor = ConsumidorDoBarramento(publicador.nome)
+        self.addCleanup(consumidor.close)
+        parar = threading.Event()
+        recebidas = []
+
+        class Coletor(correio_digital.Observer):
+            def update(self, mensagem):
+                recebidas.append(mensagem.conteudo)
+                parar.set()
+
+        leituras = iter([OSError("falha"), [correio_digital.Mensagem("a", "b", "oi", None)]])
+
+        def aguardar(*args, **kwargs):
+            resultado = next(leituras, [])
+            if isinstance(resultado, Exception):
+                raise resultado
+            return resultado
+
+        with mock.patch.object(consumidor, "aguardar", side_effect=aguardar):
+            with self.assertLogs(LOGGER, level="ERROR"):
+                consumidor.executar(Coletor(), parar)
+        self.assertEqual(recebidas, ["oi"])
+
+    def test_consumidor_em_outro_processo(self):
+        publicador = self.publicador(1 << 16)
+        saida = multiprocessing.Queue()
+        processo = multiprocessing.Process(
+            target=consumir_em_outro_processo, args=(publicador.nome, 100, saida))
+        processo.start()
+
+        self.sistema.novasMensagens(("alice", "bob", str(i)) for i in range(100))
+        recebidas = saida.get(timeout=10)
+        processo.join()
+
+        self.assertEqual(recebidas, [str(i) for i in range(100)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+# tests/test_benchmarks.py
+
+import unittest
+
+from benchmarks.bench_sistema import Cenario, comparar, executar
+
+def resultado(vazao: float, p99: float, memoria: float) -> dict:
+    return {'cenarios': {'c': {
+        'vazao_msgs_s': vazao,
+        'latencia_us': {'p50': 1.0, 'p95': 1.0, 'p99': p99, 'max': p99},
+        'pico_memoria_kb': memoria,
+    }}}
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_executa_cenario_pequeno(self):
+        medidas = executar(Cenario(observadores=2, mensagens=20, tamanho=8, tipo='cpu'))
+        self.assertGreater(medidas['vazao_msgs_s'], 0)
+        self.assertLessEqual(medidas['latencia_us']['p50'], medidas['latencia_us']['max'])
+        self.assertGreater(medidas['pico_memoria_kb'], 0)
+
+    def test_comparar_aponta_regressoes(self):
+        base = resultado(vazao=1000, p99=10, memoria=100)
+        self.assertEqual(comparar(base, resultado(950, 10.5, 105), tolerancia=0.10), [])
+
+        regressoes = comparar(base, resultado(800, 20, 100), tolerancia=0.10)
+        self.assertEqual(len(regressoes), 2)
+        self.assertIn("vazao_msgs_s", regressoes[0])
+        self.assertIn("latencia p99", regressoes[1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# tests/test_busca_textual.py
+
+import unittest
+from unittest import mock
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    SistemaDeMensagens,
+    ArmazenamentoEmMemoria
+)
+from src.Comportamentais.correio_digital_observer.correio_digital.busca_textual import (
+    IndiceTextual,
+    normalizar,
+    tokenizar
+)
+
+class TestTokenizacao(unittest.TestCase):
+
+    def test_ignora_acentos_e_maiusculas(self):
+        self.assertEqual(normalizar("Atenção, Reunião às 15h!"), "atencao, reuniao as 15h!")
+        self.assertEqual(tokenizar("A reunião de amanhã"), ["reuniao", "amanha"])
+
+class TestBuscaTextual(unittest.TestCase):
+
+    def setUp(self):
+        self.sistema = SistemaDeMensagens()
+        self.sistema.novasMensagens([
+            ("alice", "bob", "Reunião amanhã às 10h"),
+            ("carol", "bob", "Relatório da reunião anterior"),
+            ("alice", "dave", "A reunião foi cancelada"),
+            ("erin", "bob", "Almoço amanhã?"),
+            ("alice", "bob", "Reunião, reunião e mais reunião"),
+        ])
+
+    def conteudos(self, resultado):
+        return [m.conteudo for m in resultado.mensagens]
+
+    def test_termo_sem_acento_encontra_com_acento(self):
+        resultado = self.sistema.buscar_texto(todos=["reuniao"])
+        self.assertEqual(len(resultado.mensagens), 4)
+        # Mais ocorrências do termo pontuam mais
+        self.assertEqual(resultado.mensagens[0].conteudo, "Reunião, reunião e mais reunião")
+
+    def test_and_or_e_filtro_de_destinatario(self):
+        self.assertEqual(self.conteudos(self.sistema.buscar_texto(todos=["reunião", "amanhã"])),
+                         ["Reunião amanhã às 10h"])
+        self.assertEqual(sorted(self.conteudos(self.sistema.buscar_texto(
+                             algum=["almoco", "relatorio"]))),
+                         ["Almoço amanhã?", "Relatório da reunião anterior"])
+        self.assertEqual(self.conteudos(self.sistema.buscar_texto(
+                             todos=["reuniao"], algum=["cancelada", "anterior"],
+                             destinatario="bob")),
+                         ["Relatório da reunião anterior"])
+        self.assertEqual(self.sistema.buscar_texto(todos=["reuniao", "inexistente"]).mensagens, [])
+
+    def test_paginacao(self):
+        paginas = []
+        cursor = None
+        while True:
+            resultado = self.sistema.buscar_texto(todos=["reuniao"], limite=3, cursor=cursor)
+            paginas.append(self.conteudos(resultado))
+            cursor = resultado.proximo_cursor
+            if cursor is None:
+                break
+        self.assertEqual([len(p) for p in paginas], [3, 1])
+        self.assertEqual(paginas[0] + paginas[1],
+                         self.conteudos(self.sistema.buscar_texto(todos=["reuniao"], limite=10)))
+
+    def test_filtro_de_destinatario_percorre_a_caixa_menor(self):
+        indice = IndiceTextual()
+        for offset in range(200):
+            indice.adicionar(offset, "bob" if offset % 50 else "carol", "aviso geral")
+        lista_aviso = indice._listas["aviso"]
+
+        with mock.patch.object(type(lista_aviso), "frequencia", autospec=True,
+                               side_effect=type(lista_aviso).frequencia) as frequencia:
+            resultado = indice.buscar(todos=["aviso"], destinatario="carol")
+        # Apenas as 4 mensagens da caixa da carol são conferidas
+        self.assertEqual([offset for _, offset in resultado], [150, 100, 50, 0])
+        self.assertEqual(frequencia.call_count, 4)
+
+        indice.compactar(100)
+        self.assertEqual([o for _, o in indice.buscar(todos=["aviso"], destinatario="carol")],
+                         [150, 100])
+        restaurado = IndiceTextual()
+        restaurado.restaurar(indice.estado())
+        self.assertEqual(restaurado.buscar(todos=["aviso"], destinatario="carol"),
+                         indice.buscar(todos=["aviso"], destinatario="carol"))
+
+    def test_ignora_mensagens_descartadas_pela_retencao(self):
+        sistema = SistemaDeMensagens(armazenamento=ArmazenamentoEmMemoria(max_mensagens=3))
+        for i in range(6):
+            sistema.novaMensagem("alice", "bob", f"aviso número {i}")
+
+        self.assertEqual(sorted(self.conteudos(sistema.buscar_texto(todos=["aviso"]))),
+                         ["aviso número 3", "aviso número 4", "aviso número 5"])
+
+if __name__ == "__main__":
+    unittest.main()
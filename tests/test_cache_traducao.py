@@ -0,0 +1,147 @@
+"""
+Testes para o cache de traduções do CorreioDigital.
+Valida os níveis em memória (LRU + TTL) e SQLite e a integração com o serviço.
+"""
+
+import os
+import tempfile
+import unittest
+from src.Estruturais.correio_digital_adapter.correio_digital import (
+    Mensagem,
+    GoogleTranslateAPI,
+    GoogleAdapter,
+    DeepLAPI,
+    DeepLAdapter,
+    CacheTraducao,
+    ChaveTraducao,
+    ServicoTraducao
+)
+
+
+class RelogioFalso:
+    """Relógio controlado manualmente."""
+    
+    def __init__(self):
+        self.agora = 1000.0
+    
+    def __call__(self):
+        return self.agora
+
+
+class APIContadora(GoogleTranslateAPI):
+    """API do Google que conta as chamadas feitas."""
+    
+    def __init__(self):
+        self.chamadas = 0
+    
+    def traduzir_texto(self, texto, destino):
+        self.chamadas += 1
+        return super().traduzir_texto(texto, destino)
+
+
+class TestCacheTraducao(unittest.TestCase):
+    """Testes para o CacheTraducao."""
+    
+    def setUp(self):
+        self.relogio = RelogioFalso()
+        self.chave = ChaveTraducao.criar("Bom dia", "pt", "en", "Google Translate")
+    
+    def test_chave_normaliza_espacos_e_idiomas(self):
+        """Testa se textos com espaços diferentes geram a mesma chave."""
+        outra = ChaveTraducao.criar("  Bom   dia ", "PT", "EN", "Google Translate")
+        self.assertEqual(self.chave, outra)
+        self.assertNotEqual(self.chave, ChaveTraducao.criar("bom dia", "PT", "EN", "Google Translate"))
+    
+    def test_lru_despeja_menos_usado(self):
+        """Testa se o item menos usado recentemente é despejado."""
+        cache = CacheTraducao(max_itens=2, relogio=self.relogio)
+        a, b, c = (ChaveTraducao.criar(t, "PT", "EN", "Google") for t in "abc")
+        cache.guardar(a, "A")
+        cache.guardar(b, "B")
+        cache.obter(a)
+        cache.guardar(c, "C")
+        
+        self.assertEqual(cache.obter(a), "A")
+        self.assertIsNone(cache.obter(b))
+        self.assertEqual(cache.estatisticas()['despejos'], 1)
+    
+    def test_ttl_expira_item(self):
+        """Testa se itens vencidos deixam de ser retornados."""
+        cache = CacheTraducao(ttl=60, relogio=self.relogio)
+        cache.guardar(self.chave, "Good morning")
+        self.relogio.agora += 59
+        self.assertEqual(cache.obter(self.chave), "Good morning")
+        self.relogio.agora += 2
+        self.assertIsNone(cache.obter(self.chave))
+        
+        stats = cache.estatisticas()
+        self.assertEqual((stats['acertos'], stats['falhas'], stats['expiradas']), (1, 1, 1))
+    
+    def test_sqlite_sobrevive_a_reinicio(self):
+        """Testa se o nível SQLite mantém as traduções entre instâncias."""
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "traducoes.db")
+            cache = CacheTraducao(caminho_sqlite=caminho, relogio=self.relogio)
+            cache.guardar(self.chave, "Good morning")
+            cache.fechar()
+            
+            reaberto = CacheTraducao(caminho_sqlite=caminho, relogio=self.relogio)
+            self.assertEqual(reaberto.obter(self.chave), "Good morning")
+            self.assertEqual(reaberto.obter(self.chave), "Good morning")
+            stats = reaberto.estatisticas()
+            self.assertEqual((stats['acertos_sqlite'], stats['acertos_memoria']), (1, 1))
+            reaberto.fechar()
+
+
+class TestServicoComCache(unittest.TestCase):
+    """Testes para o ServicoTraducao usando cache."""
+    
+    def setUp(self):
+        self.api = APIContadora()
+        self.cache = CacheTraducao()
+        self.servico = ServicoTraducao([GoogleAdapter(self.api)], cache=self.cache)
+    
+    def test_mensagens_repetidas_chamam_provedor_uma_vez(self):
+        """Testa se a mesma saudação é traduzida apenas uma vez."""
+        for destinatario in ("user2", "user3", "user4"):
+            mensagem = Mensagem("Bom dia", "PT", "user1", destinatario, "EN")
+            self.assertTrue(self.servico.traduzir_mensagem(mensagem))
+            self.assertIn("Bom dia", mensagem.traducao)
+        
+        self.assertEqual(self.api.chamadas, 1)
+        self.assertEqual(len(self.servico.obter_historico()), 3)
+    
+    def test_idioma_destino_faz_parte_da_chave(self):
+        """Testa se destinos diferentes não compartilham tradução."""
+        self.servico.traduzir_texto("Bom dia", "EN")
+        self.servico.traduzir_texto("Bom dia", "ES")
+        self.servico.traduzir_texto("Bom dia", "EN")
+        self.assertEqual(self.api.chamadas, 2)
+    
+    def test_estatisticas_incluem_cache(self):
+        """Testa se obter_estatisticas expõe acertos e falhas do cache."""
+        self.servico.traduzir_texto("Olá", "EN")
+        self.servico.traduzir_texto("Olá", "EN")
+        
+        stats = self.servico.obter_estatisticas()['cache']
+        self.assertEqual(stats['acertos'], 1)
+        self.assertEqual(stats['falhas'], 1)
+        self.assertAlmostEqual(stats['taxa_acerto'], 0.5)
+
+    
+    def test_consulta_com_varios_provedores_conta_uma_vez(self):
+        """Testa se uma busca entre vários provedores conta um acerto ou uma falha."""
+        deepl_api = DeepLAPI()
+        servico = ServicoTraducao([GoogleAdapter(self.api), DeepLAdapter(deepl_api)],
+                                  cache=self.cache)
+        self.cache.guardar(ChaveTraducao.criar("Oi", None, "EN", "DeepL"), "Hi")
+        
+        self.assertEqual(servico.traduzir_texto("Oi", "EN"), "Hi")
+        servico.traduzir_texto("Tchau", "EN")
+        
+        stats = servico.obter_estatisticas()['cache']
+        self.assertEqual((stats['acertos'], stats['falhas']), (1, 1))
+        self.assertAlmostEqual(stats['taxa_acerto'], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
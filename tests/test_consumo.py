@@ -0,0 +1,100 @@
+# tests/test_consumo.py
+
+import os
+import tempfile
+import unittest
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    SistemaDeMensagens,
+    ArmazenamentoEmMemoria,
+    ArmazenamentoEmDisco,
+    Instantaneos
+)
+
+class TestConsumoPorCursor(unittest.TestCase):
+
+    def setUp(self):
+        self.sistema = SistemaDeMensagens()
+
+    def ingerir(self, n, inicio=0):
+        self.sistema.novasMensagens((("alice", "bob", f"msg {i}") for i in range(inicio, inicio + n)))
+
+    def conteudos(self, lote):
+        return [m.conteudo for m in lote.mensagens]
+
+    def test_cursor_novo_le_apenas_mensagens_novas(self):
+        self.ingerir(3)
+        self.sistema.registrar_cursor("analytics")
+        self.assertEqual(self.sistema.buscar_desde("analytics").mensagens, [])
+
+        self.ingerir(2, inicio=3)
+        lote = self.sistema.buscar_desde("analytics")
+        self.assertEqual(self.conteudos(lote), ["msg 3", "msg 4"])
+        self.assertEqual((lote.primeiro_offset, lote.proximo_offset), (3, 5))
+
+    def test_lotes_sucessivos_e_atraso(self):
+        self.sistema.registrar_cursor("analytics", do_inicio=True)
+        self.ingerir(10)
+
+        lote = self.sistema.buscar_desde("analytics", max_itens=4)
+        self.assertEqual(self.conteudos(lote), [f"msg {i}" for i in range(4)])
+        # Lido, mas ainda não confirmado
+        atraso = self.sistema.metricas()['consumidores']['analytics']
+        self.assertEqual((atraso['posicao'], atraso['confirmado'], atraso['atraso']), (4, 0, 10))
+
+        self.sistema.confirmar_cursor("analytics", lote.proximo_offset)
+        lote = self.sistema.buscar_desde("analytics", max_itens=100)
+        self.assertEqual(self.conteudos(lote), [f"msg {i}" for i in range(4, 10)])
+        self.sistema.confirmar_cursor("analytics")
+        self.assertEqual(self.sistema.metricas()['consumidores']['analytics']['atraso'], 0)
+
+    def test_reposicionar_volta_ao_confirmado(self):
+        self.sistema.registrar_cursor("analytics", do_inicio=True)
+        self.ingerir(5)
+        self.sistema.buscar_desde("analytics", max_itens=2)
+        self.sistema.confirmar_cursor("analytics")
+        self.sistema.buscar_desde("analytics")  # processamento falhou
+
+        self.sistema.reposicionar_cursor("analytics")
+        self.assertEqual(self.conteudos(self.sistema.buscar_desde("analytics")),
+                         ["msg 2", "msg 3", "msg 4"])
+
+    def test_nao_confirma_o_que_nao_foi_lido(self):
+        self.sistema.registrar_cursor("analytics", do_inicio=True)
+        self.ingerir(5)
+        with self.assertRaises(ValueError):
+            self.sistema.confirmar_cursor("analytics", 3)
+        with self.assertRaises(KeyError):
+            self.sistema.buscar_desde("desconhecido")
+
+    def test_consumidor_atrasado_pula_mensagens_descartadas(self):
+        sistema = SistemaDeMensagens(armazenamento=ArmazenamentoEmMemoria(max_mensagens=5))
+        sistema.registrar_cursor("lento", do_inicio=True)
+        sistema.novasMensagens(("alice", "bob", f"msg {i}") for i in range(8))
+
+        self.assertEqual(sistema.metricas()['consumidores']['lento']['atraso'], 5)
+        lote = sistema.buscar_desde("lento")
+        self.assertEqual(lote.perdidas, 3)
+        self.assertEqual(self.conteudos(lote), [f"msg {i}" for i in range(3, 8)])
+
+    def test_cursores_confirmados_sobrevivem_ao_restart(self):
+        with tempfile.TemporaryDirectory() as temporario:
+            log = os.path.join(temporario, "log")
+            diretorio = os.path.join(temporario, "instantaneos")
+            sistema = SistemaDeMensagens(armazenamento=ArmazenamentoEmDisco(log),
+                                         instantaneos=Instantaneos(diretorio))
+            sistema.registrar_cursor("analytics", do_inicio=True)
+            sistema.novasMensagens(("alice", "bob", f"msg {i}") for i in range(6))
+            sistema.buscar_desde("analytics", max_itens=4)
+            sistema.confirmar_cursor("analytics", 3)
+            sistema.close()
+
+            reaberto = SistemaDeMensagens(armazenamento=ArmazenamentoEmDisco(log),
+                                          instantaneos=Instantaneos(diretorio))
+            reaberto.registrar_cursor("analytics", do_inicio=True)
+            self.assertEqual(self.conteudos(reaberto.buscar_desde("analytics")),
+                             ["msg 3", "msg 4", "msg 5"])
+            reaberto.close()
+
+if __name__ == "__main__":
+    unittest.main()
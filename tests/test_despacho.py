@@ -0,0 +1,160 @@
+# tests/test_despacho.py
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    Observer,
+    SistemaDeMensagens,
+    DespachanteThreadPool,
+    PoliticaBackpressure,
+    FilaCheiaError
+)
+
+class ObservadorColetor(Observer):
+    def __init__(self, atraso: float = 0, liberar: threading.Event = None):
+        self.atraso = atraso
+        self.liberar = liberar
+        self.recebidas = []
+
+    def update(self, mensagem) -> None:
+        if self.liberar is not None:
+            self.liberar.wait()
+        time.sleep(self.atraso)
+        self.recebidas.append(mensagem.conteudo)
+
+class ObservadorConcorrencia(Observer):
+    """Registra quantas entregas ao mesmo observador acontecem ao mesmo tempo."""
+    def __init__(self, liberar: threading.Event):
+        self.liberar = liberar
+        self.recebidas = []
+        self.em_andamento = 0
+        self.pico = 0
+        self._lock = threading.Lock()
+
+    def update(self, mensagem) -> None:
+        self.update_batch([mensagem])
+
+    def update_batch(self, mensagens) -> None:
+        self.liberar.wait()
+        with self._lock:
+            self.em_andamento += 1
+            self.pico = max(self.pico, self.em_andamento)
+        time.sleep(0.05)
+        with self._lock:
+            self.em_andamento -= 1
+            self.recebidas.extend(m.conteudo for m in mensagens)
+
+class TestDespachanteThreadPool(unittest.TestCase):
+
+    def test_nova_mensagem_retorna_sem_esperar_observador_lento(self):
+        """
+        A ingestão não espera o observador lento; flush() aguarda a entrega.
+        """
+        sistema = SistemaDeMensagens(despachante=DespachanteThreadPool(max_workers=2))
+        lento = ObservadorColetor(atraso=0.05)
+        rapido = ObservadorColetor()
+
+        sistema.attach(lento)
+        sistema.attach(rapido)
+        inicio = time.perf_counter()
+        for i in range(5):
+            sistema.novaMensagem("a", "b", str(i))
+        duracao = time.perf_counter() - inicio
+        sistema.close()
+
+        self.assertLess(duracao, 0.1)
+        # A ordem por observador é preservada
+        self.assertEqual(lento.recebidas, ["0", "1", "2", "3", "4"])
+        self.assertEqual(rapido.recebidas, ["0", "1", "2", "3", "4"])
+
+    def test_politica_rejeitar(self):
+        liberar = threading.Event()
+        despachante = DespachanteThreadPool(
+            capacidade_fila=1, politica=PoliticaBackpressure.REJEITAR)
+        sistema = SistemaDeMensagens(despachante=despachante)
+        obs = ObservadorColetor(liberar=liberar)
+
+        sistema.attach(obs)
+        sistema.novaMensagem("a", "b", "0")   # em entrega (bloqueada)
+        time.sleep(0.05)
+        sistema.novaMensagem("a", "b", "1")   # ocupa a fila
+        with self.assertRaises(FilaCheiaError):
+            sistema.novaMensagem("a", "b", "2")
+        liberar.set()
+        sistema.close()
+
+        self.assertEqual(obs.recebidas, ["0", "1"])
+
+    def test_politica_descartar_antigo(self):
+        liberar = threading.Event()
+        despachante = DespachanteThreadPool(
+            capacidade_fila=2, politica=PoliticaBackpressure.DESCARTAR_ANTIGO)
+        sistema = SistemaDeMensagens(despachante=despachante)
+        obs = ObservadorColetor(liberar=liberar)
+
+        sistema.attach(obs)
+        sistema.novaMensagem("a", "b", "0")
+        time.sleep(0.05)
+        for i in range(1, 5):
+            sistema.novaMensagem("a", "b", str(i))
+        liberar.set()
+        sistema.close()
+
+        self.assertEqual(obs.recebidas, ["0", "3", "4"])
+        self.assertEqual(despachante.descartadas(), 2)
+
+    def test_close_impede_novos_envios(self):
+        sistema = SistemaDeMensagens(despachante=DespachanteThreadPool())
+        sistema.attach(ObservadorColetor())
+        sistema.close()
+        with self.assertRaises(RuntimeError):
+            sistema.novaMensagem("a", "b", "depois do close")
+
+    def test_bloqueio_enquanto_a_fila_e_drenada_e_recriada(self):
+        """
+        Um publicador bloqueado na fila cheia acorda depois que ela foi
+        esvaziada, removida e recriada por outro publicador: a mensagem
+        dele vai para a fila nova, sem um segundo drenador.
+        """
+        despachante = DespachanteThreadPool(capacidade_fila=1)
+        liberar = threading.Event()
+        obs = ObservadorConcorrencia(liberar)
+        sistema = SistemaDeMensagens(despachante=despachante)
+        sistema.attach(obs)
+
+        sistema.novaMensagem("a", "b", "1")
+        while despachante.pendentes():   # o drenador já pegou a "1"
+            time.sleep(0.005)
+        sistema.novaMensagem("a", "b", "2")   # fila cheia
+
+        cond = despachante._cond
+        wait_for_original = cond.wait_for
+
+        chamadas = []
+
+        def wait_for(predicado, timeout=None):
+            chamadas.append(predicado)
+            if len(chamadas) > 1:
+                return wait_for_original(predicado, timeout)
+            liberar.set()
+            wait_for_original(predicado, timeout)
+            # Ainda sem o lock: a fila esvazia, é removida e outro
+            # publicador cria uma nova
+            wait_for_original(lambda: not despachante._filas, timeout=2)
+            sistema.novaMensagem("a", "b", "4")
+            return True
+
+        with mock.patch.object(cond, "wait_for", side_effect=wait_for):
+            publicador = threading.Thread(target=sistema.novaMensagem, args=("a", "b", "3"))
+            publicador.start()
+            publicador.join(2)
+        sistema.close()
+
+        self.assertEqual(sorted(obs.recebidas), ["1", "2", "3", "4"])
+        self.assertEqual(obs.pico, 1)
+
+if __name__ == "__main__":
+    unittest.main()
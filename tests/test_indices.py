@@ -0,0 +1,81 @@
+# tests/test_indices.py
+
+import datetime
+import unittest
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    Mensagem,
+    SistemaDeMensagens,
+    ArmazenamentoEmMemoria
+)
+
+BASE = datetime.datetime(2025, 1, 1, 12, 0)
+
+class TestBuscaDeMensagens(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Pré-carrega o armazenamento com 30 mensagens, uma por minuto,
+        alternando remetentes e destinatários.
+        """
+        self.armazenamento = ArmazenamentoEmMemoria(max_mensagens=1000)
+        for i in range(30):
+            self.armazenamento.adicionar(Mensagem(
+                remetente=["alice", "bob", "carol"][i % 3],
+                destinatario=["bob", "alice"][i % 2],
+                conteudo=f"msg {i}",
+                timestamp=BASE + datetime.timedelta(minutes=i)
+            ))
+        self.sistema = SistemaDeMensagens(armazenamento=self.armazenamento)
+
+    def test_caixa_de_entrada(self):
+        resultado = self.sistema.buscar(destinatario="alice", limite=100)
+        self.assertEqual(len(resultado.mensagens), 15)
+        self.assertTrue(all(m.destinatario == "alice" for m in resultado.mensagens))
+        self.assertIsNone(resultado.proximo_cursor)
+
+    def test_remetente_e_destinatario_juntos(self):
+        resultado = self.sistema.buscar(remetente="carol", destinatario="alice", limite=100)
+        # i % 3 == 2 e i % 2 == 1  ->  i em {5, 11, 17, 23, 29}
+        self.assertEqual([m.conteudo for m in resultado.mensagens],
+                         ["msg 5", "msg 11", "msg 17", "msg 23", "msg 29"])
+
+    def test_intervalo_de_tempo(self):
+        resultado = self.sistema.buscar(
+            desde=BASE + datetime.timedelta(minutes=10),
+            ate=BASE + datetime.timedelta(minutes=12))
+        self.assertEqual([m.conteudo for m in resultado.mensagens],
+                         ["msg 10", "msg 11", "msg 12"])
+
+    def test_paginacao_com_cursor(self):
+        paginas = []
+        cursor = None
+        while True:
+            resultado = self.sistema.buscar(remetente="alice", limite=4, cursor=cursor)
+            paginas.append([m.conteudo for m in resultado.mensagens])
+            cursor = resultado.proximo_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual([len(p) for p in paginas], [4, 4, 2])
+        todas = [c for p in paginas for c in p]
+        self.assertEqual(todas, [f"msg {i}" for i in range(0, 30, 3)])
+
+    def test_mensagens_novas_sao_indexadas(self):
+        self.sistema.novaMensagem("dave", "erin", "oi erin")
+        self.sistema.novasMensagens([("dave", "erin", "tudo bem?")])
+
+        resultado = self.sistema.buscar(remetente="dave", destinatario="erin")
+        self.assertEqual([m.conteudo for m in resultado.mensagens], ["oi erin", "tudo bem?"])
+
+    def test_ignora_mensagens_descartadas_pela_retencao(self):
+        sistema = SistemaDeMensagens(armazenamento=ArmazenamentoEmMemoria(max_mensagens=5))
+        for i in range(12):
+            sistema.novaMensagem("alice", "bob", f"msg {i}")
+
+        resultado = sistema.buscar(destinatario="bob")
+        self.assertEqual([m.conteudo for m in resultado.mensagens],
+                         [f"msg {i}" for i in range(7, 12)])
+
+if __name__ == "__main__":
+    unittest.main()
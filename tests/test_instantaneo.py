@@ -0,0 +1,168 @@
+# tests/test_instantaneo.py
+
+import os
+import struct
+import tempfile
+import threading
+import unittest
+import zlib
+from array import array
+from unittest import mock
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    SistemaDeMensagens,
+    ArmazenamentoEmMemoria,
+    ArmazenamentoEmDisco,
+    Instantaneos
+)
+from src.Comportamentais.correio_digital_observer import correio_digital
+from src.Comportamentais.correio_digital_observer.correio_digital import instantaneo
+from src.Comportamentais.correio_digital_observer.correio_digital.instantaneo import (
+    Captura,
+    carregar,
+    gravar
+)
+
+LOGGER = correio_digital.__name__
+
+class TestInstantaneos(unittest.TestCase):
+
+    def setUp(self):
+        self.temporario = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temporario.cleanup)
+        self.diretorio = os.path.join(self.temporario.name, "instantaneos")
+
+    def conteudos(self, resultado):
+        return [m.conteudo for m in resultado.mensagens]
+
+    def test_memoria_restaura_mensagens_e_indices(self):
+        sistema = SistemaDeMensagens(instantaneos=Instantaneos(self.diretorio, a_cada=10))
+        for i in range(25):
+            sistema.novaMensagem(f"user{i % 3}", "bob", f"aviso {i}")
+        sistema.close()
+
+        reaberto = SistemaDeMensagens(instantaneos=Instantaneos(self.diretorio))
+        self.assertEqual([m.conteudo for m in reaberto._mensagens], [f"aviso {i}" for i in range(25)])
+        self.assertEqual(self.conteudos(reaberto.buscar(remetente="user1", limite=3)),
+                         ["aviso 1", "aviso 4", "aviso 7"])
+        self.assertEqual(len(reaberto.buscar_texto(todos=["aviso"], limite=100).mensagens), 25)
+
+        # Offsets continuam de onde pararam
+        reaberto.novaMensagem("user0", "bob", "depois do restart")
+        self.assertEqual(reaberto._mensagens.proximo_offset, 26)
+        self.assertEqual(self.conteudos(reaberto.buscar_texto(todos=["restart"])),
+                         ["depois do restart"])
+
+    def test_retencao_e_aplicada_antes_de_gravar(self):
+        sistema = SistemaDeMensagens(armazenamento=ArmazenamentoEmMemoria(max_mensagens=5),
+                                     instantaneos=Instantaneos(self.diretorio, a_cada=1000))
+        for i in range(12):
+            sistema.novaMensagem("alice", "bob", f"msg {i}")
+        sistema.close()
+
+        reaberto = SistemaDeMensagens(instantaneos=Instantaneos(self.diretorio))
+        self.assertEqual(self.conteudos(reaberto.buscar(destinatario="bob")),
+                         [f"msg {i}" for i in range(7, 12)])
+
+    def test_disco_indexa_apenas_a_cauda(self):
+        log = os.path.join(self.temporario.name, "log")
+        sistema = SistemaDeMensagens(armazenamento=ArmazenamentoEmDisco(log),
+                                     instantaneos=Instantaneos(self.diretorio, a_cada=10))
+        for i in range(15):
+            sistema.novaMensagem("alice", "bob", f"msg {i}")
+        sistema._instantaneos.aguardar()
+        # Simula uma queda: sem close(), o instantâneo ficou no offset 10
+        sistema._mensagens.close()
+
+        armazenamento = ArmazenamentoEmDisco(log)
+        lidos = []
+        registros = armazenamento.registros
+        armazenamento.registros = lambda desde=0: (lidos.append(desde) or registros(desde))
+        reaberto = SistemaDeMensagens(armazenamento=armazenamento,
+                                      instantaneos=Instantaneos(self.diretorio))
+        self.assertEqual(lidos, [10])
+        self.assertEqual(self.conteudos(reaberto.buscar(remetente="alice", limite=100)),
+                         [f"msg {i}" for i in range(15)])
+        reaberto.close()
+
+    def test_instantaneo_corrompido_usa_o_anterior(self):
+        sistema = SistemaDeMensagens(instantaneos=Instantaneos(self.diretorio, a_cada=5))
+        for i in range(5):
+            sistema.novaMensagem("alice", "bob", f"msg {i}")
+        sistema._instantaneos.aguardar()
+        sistema.novaMensagem("alice", "bob", "msg 5")
+        sistema.close()
+
+        ultimo = sorted(os.listdir(self.diretorio))[-1]
+        with open(os.path.join(self.diretorio, ultimo), "r+b") as arquivo:
+            arquivo.seek(20)
+            arquivo.write(b"\xff\xff")
+
+        with self.assertLogs(LOGGER, level="WARNING"):
+            reaberto = SistemaDeMensagens(instantaneos=Instantaneos(self.diretorio))
+        self.assertEqual(len(reaberto._mensagens), 5)
+
+    def captura(self, trocar=False):
+        def arr(tipo, valores):
+            valores = array(tipo, valores)
+            if trocar:
+                valores.byteswap()
+            return valores
+        indice = {'remetente': {'alice': (arr('q', [10, 20]), arr('Q', [0, 1]))},
+                  'destinatario': {'bob': (arr('q', [10, 20]), arr('Q', [0, 1]))},
+                  'tempo': (arr('q', [10, 20]), arr('Q', [0, 1]))}
+        textual = {'destinatarios': ['bob'], 'base': 0, 'destinos': arr('I', [1, 1]),
+                   'listas': {'aviso': (arr('Q', [0, 1]), arr('H', [1, 300]))}}
+        return Captura(0, 2, indice, textual, None, {'leitor': 1})
+
+    def test_arrays_de_outra_ordem_de_bytes_sao_convertidos(self):
+        caminho = os.path.join(self.temporario.name, "estrangeiro.snap")
+        outra = b'>' if instantaneo._ORDEM_NATIVA == b'<' else b'<'
+        # Simula um instantâneo gravado numa máquina com a outra ordem
+        with mock.patch.object(instantaneo, '_ORDEM_NATIVA', outra):
+            gravar(self.captura(trocar=True), caminho)
+        with open(caminho, 'rb') as arquivo:
+            self.assertEqual(arquivo.read(9), b'CDSNAP03' + outra)
+        self.assertEqual(carregar(caminho), self.captura())
+
+    def test_carrega_instantaneo_da_versao_anterior(self):
+        caminho = os.path.join(self.temporario.name, "antigo.snap")
+        gravar(self.captura(), caminho)
+        with open(caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+        corpo = b'CDSNAP02' + dados[9:-4]
+        with open(caminho, 'wb') as arquivo:
+            arquivo.write(corpo + struct.pack('<I', zlib.crc32(corpo)))
+        self.assertEqual(carregar(caminho), self.captura())
+
+    def test_captura_nao_copia_o_indice_textual_nem_compacta_durante_gravacao(self):
+        liberar, gravando = threading.Event(), threading.Event()
+        gravados = []
+
+        def gravar_devagar(captura, caminho):
+            gravando.set()
+            liberar.wait(5)
+            gravados.append(captura.indice_textual())
+
+        sistema = SistemaDeMensagens(armazenamento=ArmazenamentoEmMemoria(max_mensagens=3),
+                                     instantaneos=Instantaneos(self.diretorio, a_cada=1000))
+        with mock.patch.object(instantaneo, 'gravar', side_effect=gravar_devagar):
+            for i in range(5):
+                sistema.novaMensagem("alice", "bob", f"aviso {i}")
+            self.assertTrue(sistema.instantaneo())
+            gravando.wait(5)
+            # Mensagens novas entram nas mesmas listas que a gravação ainda vai copiar
+            for i in range(5, 10):
+                sistema.novaMensagem("alice", "bob", f"aviso {i}")
+            with mock.patch.object(sistema._indice_textual, 'compactar') as compactar:
+                self.assertFalse(sistema.instantaneo())
+            compactar.assert_not_called()
+            liberar.set()
+            sistema._instantaneos.aguardar()
+
+        listas = gravados[0]['listas']
+        self.assertEqual(list(listas['aviso'][0]), [2, 3, 4])
+        self.assertEqual(list(gravados[0]['destinos']), [1, 1, 1])
+
+if __name__ == "__main__":
+    unittest.main()
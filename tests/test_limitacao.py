@@ -0,0 +1,139 @@
+# tests/test_limitacao.py
+
+import time
+import unittest
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    Observer,
+    SistemaDeMensagens,
+    BaldeDeTokens,
+    ObservadorLimitado,
+    NotificadorEmail
+)
+from src.Comportamentais.correio_digital_observer.correio_digital.agrupamento import resumir
+from src.Comportamentais.correio_digital_observer import correio_digital
+
+LOGGER = correio_digital.__name__
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self) -> float:
+        return self.agora
+
+class ObservadorColetor(Observer):
+    def __init__(self):
+        self.envios = []
+
+    def update(self, mensagem) -> None:
+        self.envios.append(mensagem.conteudo)
+
+    def update_batch(self, mensagens) -> None:
+        self.envios.append([m.conteudo for m in mensagens])
+
+def esperar(condicao, limite: float = 2.0) -> None:
+    fim = time.monotonic() + limite
+    while not condicao() and time.monotonic() < fim:
+        time.sleep(0.005)
+
+class TestBaldeDeTokens(unittest.TestCase):
+
+    def test_rajada_e_reposicao(self):
+        relogio = RelogioFalso()
+        balde = BaldeDeTokens(taxa=2, capacidade=3, relogio=relogio)
+
+        self.assertEqual([balde.consumir() for _ in range(4)], [True, True, True, False])
+        self.assertAlmostEqual(balde.tempo_ate(), 0.5)
+        relogio.agora = 0.5
+        self.assertTrue(balde.consumir())
+        relogio.agora = 100
+        self.assertTrue(balde.cheio)
+
+class TestObservadorLimitado(unittest.TestCase):
+
+    def setUp(self):
+        self.sistema = SistemaDeMensagens()
+
+    def test_excesso_vira_um_unico_resumo(self):
+        coletor = ObservadorColetor()
+        limitado = ObservadorLimitado(coletor, taxa_canal=20, capacidade_canal=1)
+        self.sistema.attach(limitado)
+
+        for i in range(5):
+            self.sistema.novaMensagem("alice", "bob", str(i))
+        self.assertEqual(coletor.envios, ["0"])
+
+        esperar(lambda: len(coletor.envios) == 2)
+        limitado.close()
+        self.assertEqual(coletor.envios, ["0", ["1", "2", "3", "4"]])
+        self.assertEqual(limitado.estatisticas(),
+                         {'entregues': 1, 'resumos': 1, 'adiadas': 4, 'pendentes': 0})
+
+    def test_balde_de_canal_compartilhado(self):
+        relogio = RelogioFalso()
+        balde = BaldeDeTokens(taxa=1, capacidade=2, relogio=relogio)
+        email, sms = ObservadorColetor(), ObservadorColetor()
+        limitado_email = ObservadorLimitado(email, balde_canal=balde, relogio=relogio)
+        limitado_sms = ObservadorLimitado(sms, balde_canal=balde, relogio=relogio)
+        self.sistema.attach(limitado_email)
+        self.sistema.attach(limitado_sms)
+
+        self.sistema.novaMensagem("alice", "bob", "1")
+        self.sistema.novaMensagem("alice", "bob", "2")
+        # Uma mensagem gera dois envios: a cota de 2 acabou na primeira
+        self.assertEqual((email.envios, sms.envios), (["1"], ["1"]))
+        self.assertEqual(limitado_email.estatisticas()['adiadas']
+                         + limitado_sms.estatisticas()['adiadas'], 2)
+
+        limitado_email.close()
+        limitado_sms.close()
+        self.assertEqual((email.envios, sms.envios), (["1", "2"], ["1", "2"]))
+
+    def test_balde_de_canal_e_taxa_juntos(self):
+        with self.assertRaises(ValueError):
+            ObservadorLimitado(ObservadorColetor(), taxa_canal=1,
+                               balde_canal=BaldeDeTokens(taxa=1))
+        with self.assertRaises(ValueError):
+            ObservadorLimitado(ObservadorColetor(), capacidade_canal=5,
+                               balde_canal=BaldeDeTokens(taxa=1))
+
+    def test_limite_por_destinatario_nao_afeta_os_outros(self):
+        coletor = ObservadorColetor()
+        limitado = ObservadorLimitado(coletor, taxa_destinatario=0.01, capacidade_destinatario=1)
+        self.sistema.attach(limitado)
+
+        self.sistema.novaMensagem("x", "alice", "a1")
+        self.sistema.novaMensagem("x", "alice", "a2")
+        self.sistema.novaMensagem("x", "bob", "b1")
+        self.assertEqual(coletor.envios, ["a1", "b1"])
+
+        limitado.close()
+        self.assertEqual(coletor.envios, ["a1", "b1", "a2"])
+
+    def test_resumo_de_email_e_um_envio_em_lote(self):
+        limitado = ObservadorLimitado(NotificadorEmail(), taxa_canal=0.01, capacidade_canal=1)
+        self.sistema.attach(limitado)
+
+        with self.assertLogs(LOGGER, level="INFO") as logs:
+            for i in range(4):
+                self.sistema.novaMensagem("alice", "bob", str(i))
+            limitado.close()
+            output = "\n".join(logs.output)
+
+        self.assertEqual(output.count("[EMAIL] Enviando e-mail para bob"), 1)
+        self.assertIn("[EMAIL] Enviando lote de 3 e-mails para 1 destinatários", output)
+
+    def test_agrupar_em_uma_mensagem(self):
+        coletor = ObservadorColetor()
+        limitado = ObservadorLimitado(coletor, taxa_canal=0.01, capacidade_canal=1,
+                                      agrupar=resumir)
+        self.sistema.attach(limitado)
+        for i in range(3):
+            self.sistema.novaMensagem("alice", "bob", str(i))
+        limitado.close()
+
+        self.assertEqual(coletor.envios, ["0", "2 novas mensagens de alice"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+# tests/test_log_segmentado.py
+
+import datetime
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    Mensagem,
+    ArmazenamentoEmDisco
+)
+
+BASE = datetime.datetime(2025, 1, 1, 12, 0)
+
+def criar_mensagem(i: int, minutos: int = 0) -> Mensagem:
+    return Mensagem(
+        remetente="alice",
+        destinatario="bob",
+        conteudo=f"conteúdo {i}",
+        timestamp=BASE + datetime.timedelta(minutes=minutos, microseconds=i)
+    )
+
+class TestArmazenamentoEmDisco(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.diretorio = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_mensagens_sobrevivem_ao_reinicio(self):
+        log = ArmazenamentoEmDisco(self.diretorio)
+        for i in range(10):
+            log.adicionar(criar_mensagem(i))
+        log.close()
+
+        reaberto = ArmazenamentoEmDisco(self.diretorio)
+        self.assertEqual(len(reaberto), 10)
+        self.assertEqual(reaberto.obter(3), criar_mensagem(3))
+        self.assertEqual(reaberto.ultima(), criar_mensagem(9))
+        self.assertEqual([r.conteudo for r in reaberto.replay(desde=7)],
+                         ["conteúdo 7", "conteúdo 8", "conteúdo 9"])
+        reaberto.close()
+
+    def test_rotacao_e_retencao_por_tamanho(self):
+        log = ArmazenamentoEmDisco(self.diretorio, max_bytes_segmento=100,
+                                   retencao_bytes=250)
+        for i in range(20):
+            log.adicionar(criar_mensagem(i))
+
+        segmentos = [n for n in os.listdir(self.diretorio) if n.endswith(".log")]
+        self.assertGreater(len(segmentos), 1)
+        self.assertGreater(log.primeiro_offset, 0)
+        self.assertIsNone(log.obter(0))
+        # O replay começa na primeira mensagem retida
+        self.assertEqual(next(log.replay()).conteudo, f"conteúdo {log.primeiro_offset}")
+        log.close()
+
+    def test_expirar_durante_replay(self):
+        log = ArmazenamentoEmDisco(self.diretorio, max_bytes_segmento=100)
+        for i in range(20):
+            log.adicionar(criar_mensagem(i))
+        leitura = log.replay()
+        self.assertEqual(next(leitura).conteudo, "conteúdo 0")
+
+        log._retencao_bytes = 150
+        with mock.patch.object(log, "_sincronizar_diretorio",
+                               wraps=log._sincronizar_diretorio) as sincronizar:
+            self.assertGreater(log.expirar(), 0)
+        sincronizar.assert_called_once()
+        # O segmento sendo lido foi apagado: a leitura termina sem erro
+        self.assertEqual(list(leitura), [])
+        self.assertEqual(next(log.replay()).conteudo, f"conteúdo {log.primeiro_offset}")
+        log.close()
+
+    def test_rotacao_e_retencao_por_idade(self):
+        log = ArmazenamentoEmDisco(self.diretorio,
+                                   max_idade_segmento=datetime.timedelta(minutes=30),
+                                   retencao_idade=datetime.timedelta(hours=1))
+        log.adicionar(criar_mensagem(0, minutos=0))
+        log.adicionar(criar_mensagem(1, minutos=40))   # novo segmento
+        log.adicionar(criar_mensagem(2, minutos=80))   # novo segmento
+
+        # Na rotação o primeiro segmento (idade de 80 min) já foi apagado
+        self.assertEqual(log.primeiro_offset, 1)
+
+        apagados = log.expirar(agora=BASE + datetime.timedelta(minutes=110))
+        self.assertEqual(apagados, 1)
+        self.assertEqual(log.primeiro_offset, 2)
+        # O segmento ativo nunca é apagado
+        self.assertEqual(log.expirar(agora=BASE + datetime.timedelta(days=1)), 0)
+        log.close()
+
+    def test_descarta_escrita_incompleta_ao_abrir(self):
+        log = ArmazenamentoEmDisco(self.diretorio)
+        for i in range(3):
+            log.adicionar(criar_mensagem(i))
+        log.close()
+
+        caminho = os.path.join(self.diretorio, sorted(os.listdir(self.diretorio))[-1])
+        with open(caminho, "ab") as f:
+            f.write(b"\x40\x00\x00\x00lixo")
+
+        reaberto = ArmazenamentoEmDisco(self.diretorio)
+        self.assertEqual(len(reaberto), 3)
+        reaberto.adicionar(criar_mensagem(3))
+        self.assertEqual(reaberto.obter(3), criar_mensagem(3))
+        reaberto.close()
+
+    def test_fsync_no_prazo_sem_novas_escritas(self):
+        log = ArmazenamentoEmDisco(self.diretorio, lote_fsync=1000, intervalo_fsync=0.02)
+        with mock.patch("os.fsync", wraps=os.fsync) as fsync:
+            log.adicionar(criar_mensagem(0))
+            limite = time.monotonic() + 2
+            while not fsync.called and time.monotonic() < limite:
+                time.sleep(0.01)
+            self.assertTrue(fsync.called)
+        log.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# tests/test_particionamento.py
+
+import os
+import time
+import tempfile
+import unittest
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    Observer,
+    SistemaParticionado
+)
+
+class ObservadorEmArquivo(Observer):
+    """
+    Roda dentro do processo da partição, então registra o que recebeu
+    em um arquivo em vez de uma lista em memória.
+    """
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+
+    def update(self, mensagem) -> None:
+        with open(self.caminho, "a", encoding="utf-8") as arquivo:
+            arquivo.write(f"{mensagem.destinatario}:{mensagem.conteudo}\n")
+
+def ler_linhas(caminho: str):
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, encoding="utf-8") as arquivo:
+        return arquivo.read().splitlines()
+
+class TestSistemaParticionado(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.sistema = SistemaParticionado(num_particoes=3, tamanho_lote_ipc=8)
+
+    def tearDown(self):
+        self.sistema.close()
+        self.diretorio.cleanup()
+
+    def caminho(self, nome: str) -> str:
+        return os.path.join(self.diretorio.name, nome)
+
+    def test_particao_e_estavel(self):
+        outro = SistemaParticionado(num_particoes=3)
+        try:
+            for destinatario in ("alice", "bob", "carol", "dave"):
+                self.assertEqual(self.sistema.particao_de(destinatario),
+                                 outro.particao_de(destinatario))
+        finally:
+            outro.close()
+
+    def test_assinante_recebe_so_o_proprio_destinatario_em_ordem(self):
+        self.sistema.attach(ObservadorEmArquivo(self.caminho("bob")), destinatario="bob")
+        destinatarios = ["alice", "bob", "carol", "dave"]
+        total = self.sistema.novasMensagens(
+            ("x", destinatarios[i % 4], str(i)) for i in range(40))
+        self.sistema.flush()
+
+        self.assertEqual(total, 40)
+        self.assertEqual(ler_linhas(self.caminho("bob")),
+                         [f"bob:{i}" for i in range(1, 40, 4)])
+
+    def test_curinga_recebe_de_todas_as_particoes(self):
+        self.sistema.attach(ObservadorEmArquivo(self.caminho("todos")))
+        for i in range(30):
+            self.sistema.novaMensagem("x", f"user{i}", "oi")
+
+        metricas = self.sistema.metricas()
+        self.assertEqual(len(ler_linhas(self.caminho("todos"))), 30)
+        self.assertEqual(metricas["mensagens_recebidas"], 30)
+        self.assertEqual(metricas["notificacoes_enviadas"], 30)
+        self.assertEqual(len(metricas["particoes"]), 3)
+
+    def test_lote_parcial_e_enviado_pelo_temporizador(self):
+        self.sistema.attach(ObservadorEmArquivo(self.caminho("bob")), destinatario="bob")
+        self.sistema.novaMensagem("x", "bob", "sozinha")
+
+        limite = time.monotonic() + 2
+        while not ler_linhas(self.caminho("bob")) and time.monotonic() < limite:
+            time.sleep(0.01)
+        self.assertEqual(ler_linhas(self.caminho("bob")), ["bob:sozinha"])
+
+    def test_detach(self):
+        obs = ObservadorEmArquivo(self.caminho("bob"))
+        self.sistema.attach(obs, destinatario="bob")
+        self.sistema.novaMensagem("x", "bob", "1")
+        self.sistema.flush()
+        self.sistema.detach(obs)
+        self.sistema.novaMensagem("x", "bob", "2")
+        self.sistema.flush()
+
+        self.assertEqual(ler_linhas(self.caminho("bob")), ["bob:1"])
+
+    def test_attach_e_detach_respeitam_mensagens_ainda_no_lote(self):
+        sistema = SistemaParticionado(num_particoes=2, atraso_max_ipc=60)
+        try:
+            antigo = ObservadorEmArquivo(self.caminho("antigo"))
+            novo = ObservadorEmArquivo(self.caminho("novo"))
+            sistema.attach(antigo, destinatario="bob")
+            sistema.novaMensagem("x", "bob", "1")   # ainda no lote
+            sistema.detach(antigo)
+            sistema.novaMensagem("x", "bob", "2")
+            sistema.attach(novo, destinatario="bob")
+            sistema.novaMensagem("x", "bob", "3")
+            sistema.flush()
+        finally:
+            sistema.close()
+
+        self.assertEqual(ler_linhas(self.caminho("antigo")), ["bob:1"])
+        self.assertEqual(ler_linhas(self.caminho("novo")), ["bob:3"])
+
+    def test_mesmo_observador_em_varios_destinatarios(self):
+        sistema = SistemaParticionado(num_particoes=1)
+        try:
+            obs = ObservadorEmArquivo(self.caminho("varios"))
+            sistema.attach(obs, destinatario="bob")
+            sistema.attach(obs, destinatario="carol")
+            sistema.novaMensagem("x", "bob", "1")
+            sistema.novaMensagem("x", "carol", "2")
+            sistema.flush()
+        finally:
+            sistema.close()
+
+        self.assertEqual(ler_linhas(self.caminho("varios")), ["bob:1", "carol:2"])
+
+    def test_particao_morta_nao_trava(self):
+        sistema = SistemaParticionado(num_particoes=2)
+        sistema.INTERVALO_VERIFICACAO = 0.05
+        sistema._processos[1].terminate()
+        sistema._processos[1].join()
+
+        with self.assertRaisesRegex(RuntimeError, "Partição 1"):
+            sistema.flush()
+        with self.assertRaises(RuntimeError):
+            sistema.close()
+        self.assertFalse(sistema._processos[0].is_alive())
+
+if __name__ == "__main__":
+    unittest.main()
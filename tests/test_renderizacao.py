@@ -0,0 +1,96 @@
+# tests/test_renderizacao.py
+
+import datetime
+import gc
+import logging
+import unittest
+import weakref
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    Mensagem,
+    Modelo,
+    SistemaDeMensagens,
+    NotificadorComModelo,
+    NotificadorWeb,
+    NotificadorMobile
+)
+from src.Comportamentais.correio_digital_observer import correio_digital
+
+LOGGER = correio_digital.__name__
+
+def mensagem(conteudo: str = "Olá, tudo bem com você hoje?") -> Mensagem:
+    return Mensagem("alice", "bob", conteudo, datetime.datetime(2025, 1, 1))
+
+class TestRenderizacao(unittest.TestCase):
+
+    def test_campos_derivados_sao_calculados_uma_vez(self):
+        m = mensagem()
+        renderizacao = m.renderizacao
+        self.assertIs(m.renderizacao, renderizacao)
+        self.assertEqual(renderizacao.previa(5), "Olá, ")
+        self.assertEqual(renderizacao.assunto, "Nova mensagem de alice")
+        self.assertEqual(renderizacao.resumo, "Nova mensagem de alice: Olá, tudo bem com vo...")
+        self.assertIs(renderizacao.resumo, renderizacao.resumo)
+
+    def test_modelo_compilado_e_compartilhado(self):
+        modelo = Modelo.compilar("{remetente} -> {destinatario}: {previa:3}")
+        self.assertIs(Modelo.compilar("{remetente} -> {destinatario}: {previa:3}"), modelo)
+
+        m = mensagem()
+        texto = modelo.renderizar(m)
+        self.assertEqual(texto, "alice -> bob: Olá")
+        self.assertIs(modelo.renderizar(m), texto)
+
+    def test_renderizacao_nao_cria_ciclo(self):
+        m = mensagem()
+        Modelo.compilar("{remetente}: {conteudo}").renderizar(m)
+        ref = weakref.ref(m)
+        gc.disable()
+        try:
+            del m
+            self.assertIsNone(ref())  # liberada por contagem de referências
+        finally:
+            gc.enable()
+
+    def test_notificador_nao_renderiza_com_info_desativado(self):
+        m = mensagem()
+        logger = logging.getLogger(LOGGER)
+        nivel = logger.level
+        logger.setLevel(logging.WARNING)
+        try:
+            NotificadorWeb().update(m)
+        finally:
+            logger.setLevel(nivel)
+        self.assertNotIn('renderizacao', vars(m))
+
+    def test_campo_desconhecido(self):
+        with self.assertRaises(ValueError):
+            Modelo("{assinatura}")
+
+    def test_notificadores_renderizam_uma_vez_por_modelo(self):
+        contador = {'chamadas': 0}
+
+        class Contador(NotificadorComModelo):
+            MODELO = "{assunto}"
+
+            def update(self, mensagem) -> None:
+                contador['chamadas'] += 1
+                self.renderizar(mensagem)
+
+        sistema = SistemaDeMensagens()
+        observadores = [Contador(), Contador(), NotificadorWeb(), NotificadorMobile()]
+        for obs in observadores:
+            sistema.attach(obs)
+        # preparar() no attach já compilou os modelos
+        self.assertIs(observadores[0]._modelo, observadores[1]._modelo)
+
+        with self.assertLogs(LOGGER, level="INFO") as logs:
+            sistema.novaMensagem("alice", "bob", "Olá, tudo bem com você hoje?")
+            output = "\n".join(logs.output)
+
+        self.assertEqual(contador['chamadas'], 2)
+        self.assertIn("[WEB] Notificação Push: 'Nova mensagem de alice: Olá, tudo bem com vo...'", output)
+        self.assertIn("[MOBILE] Notificação (Pling!): 'alice disse: Olá, tudo bem c...'", output)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+# tests/test_resiliencia.py
+
+import random
+import time
+import unittest
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    Observer,
+    SistemaDeMensagens,
+    DespachanteResiliente,
+    Temporizador
+)
+from src.Comportamentais.correio_digital_observer import correio_digital
+
+LOGGER = correio_digital.__name__
+
+class ObservadorInstavel(Observer):
+    """Falha nas primeiras 'falhas' chamadas e depois funciona."""
+    def __init__(self, falhas: int = 0):
+        self.falhas = falhas
+        self.recebidas = []
+
+    def update(self, mensagem) -> None:
+        if self.falhas > 0:
+            self.falhas -= 1
+            raise ConnectionError("serviço indisponível")
+        self.recebidas.append(mensagem.conteudo)
+
+def esperar(condicao, limite: float = 2.0) -> None:
+    fim = time.monotonic() + limite
+    while not condicao() and time.monotonic() < fim:
+        time.sleep(0.005)
+
+class TestIsolamentoDeFalhas(unittest.TestCase):
+
+    def test_falha_de_um_observador_nao_interrompe_os_demais(self):
+        sistema = SistemaDeMensagens()
+        quebrado = ObservadorInstavel(falhas=99)
+        saudavel = ObservadorInstavel()
+        sistema.attach(quebrado)
+        sistema.attach(saudavel)
+
+        with self.assertLogs(LOGGER, level="ERROR"):
+            sistema.novaMensagem("a", "b", "oi")
+
+        self.assertEqual(saudavel.recebidas, ["oi"])
+        metricas = sistema.metricas()
+        self.assertEqual(metricas["notificacoes_falhas"], 1)
+        self.assertEqual(metricas["taxa_sucesso"], 0.5)
+
+class TestDespachanteResiliente(unittest.TestCase):
+
+    def setUp(self):
+        self.despachante = DespachanteResiliente(
+            max_tentativas=3, atraso_base=0.01, aleatorio=random.Random(42))
+        self.sistema = SistemaDeMensagens(despachante=self.despachante)
+
+    def tearDown(self):
+        self.sistema.close()
+
+    def test_backoff_exponencial_com_jitter(self):
+        for tentativa, teto in [(1, 0.01), (2, 0.02), (3, 0.04)]:
+            atraso = self.despachante.atraso(tentativa)
+            self.assertGreaterEqual(atraso, teto / 2)
+            self.assertLessEqual(atraso, teto)
+
+    def test_retentativa_recupera_entrega(self):
+        obs = ObservadorInstavel(falhas=2)
+        self.sistema.attach(obs)
+
+        with self.assertLogs(LOGGER, level="DEBUG"):
+            self.sistema.novaMensagem("a", "b", "oi")
+            esperar(lambda: obs.recebidas)
+
+        self.assertEqual(obs.recebidas, ["oi"])
+        estatisticas = self.sistema.metricas()["despachante"]
+        self.assertEqual(estatisticas["recuperadas"], 1)
+        self.assertEqual(estatisticas["retentativas_pendentes"], 0)
+        self.assertEqual(estatisticas["mensagens_mortas"], 0)
+
+    def test_esgotou_tentativas_vai_para_mensagens_mortas_e_reprocessa(self):
+        obs = ObservadorInstavel(falhas=3)
+        self.sistema.attach(obs)
+        mortas = self.despachante.mensagens_mortas
+
+        with self.assertLogs(LOGGER, level="DEBUG"):
+            self.sistema.novaMensagem("a", "b", "oi")
+            esperar(lambda: len(mortas) == 1)
+
+        [entrega] = mortas.listar("ObservadorInstavel")
+        self.assertEqual(entrega.tentativas, 3)
+        self.assertIn("serviço indisponível", entrega.erro)
+        self.assertEqual([m.conteudo for m in entrega.mensagens], ["oi"])
+
+        self.assertEqual(self.despachante.reprocessar_mortas(), 1)
+        self.assertEqual(obs.recebidas, ["oi"])
+        self.assertEqual(len(mortas), 0)
+
+    def test_close_move_retentativas_pendentes(self):
+        despachante = DespachanteResiliente(atraso_base=60)
+        sistema = SistemaDeMensagens(despachante=despachante)
+        obs = ObservadorInstavel(falhas=1)
+        sistema.attach(obs)
+
+        with self.assertLogs(LOGGER, level="DEBUG"):
+            sistema.novaMensagem("a", "b", "oi")
+        self.assertEqual(sistema.metricas()["despachante"]["retentativas_pendentes"], 1)
+        sistema.close()
+
+        [entrega] = despachante.mensagens_mortas.listar()
+        self.assertEqual(entrega.erro, "despachante fechado")
+
+    def test_falha_depois_do_close_vai_para_mensagens_mortas(self):
+        despachante = DespachanteResiliente()
+        sistema = SistemaDeMensagens(despachante=despachante)
+        obs = ObservadorInstavel(falhas=1)
+        sistema.attach(obs)
+        sistema.close()
+
+        with self.assertLogs(LOGGER, level="ERROR") as logs:
+            sistema.novaMensagem("a", "b", "oi")
+
+        self.assertIn("depois do fechamento", "\n".join(logs.output))
+        [entrega] = despachante.mensagens_mortas.listar()
+        self.assertIn("serviço indisponível", entrega.erro)
+        self.assertEqual(despachante.estatisticas()["retentativas_pendentes"], 0)
+
+    def test_temporizador_compartilhado_fechado(self):
+        temporizador = Temporizador()
+        temporizador.close()
+        despachante = DespachanteResiliente(temporizador=temporizador)
+        sistema = SistemaDeMensagens(despachante=despachante)
+        obs = ObservadorInstavel(falhas=1)
+        sistema.attach(obs)
+
+        with self.assertLogs(LOGGER, level="ERROR"):
+            sistema.novaMensagem("a", "b", "oi")
+
+        self.assertEqual(len(despachante.mensagens_mortas), 1)
+        sistema.close()
+
+if __name__ == "__main__":
+    unittest.main()
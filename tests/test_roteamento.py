@@ -0,0 +1,213 @@
+"""
+Testes para o roteamento entre adaptadores do CorreioDigital.
+Valida os disjuntores (circuit breakers) e a ordenação por EWMA.
+"""
+
+import random
+import unittest
+from src.Estruturais.correio_digital_adapter.correio_digital import (
+    Mensagem,
+    ITradutor,
+    TraducaoError,
+    EstadoCircuito,
+    DisjuntorCircuito,
+    PoliticaEWMA,
+    ServicoTraducao
+)
+
+
+class RelogioFalso:
+    """Relógio controlado manualmente."""
+    
+    def __init__(self):
+        self.agora = 1000.0
+    
+    def __call__(self):
+        return self.agora
+
+
+class TradutorControlado(ITradutor):
+    """Tradutor de teste que pode ser colocado fora do ar."""
+    
+    def __init__(self, provedor, fora_do_ar=False):
+        self.provedor = provedor
+        self.fora_do_ar = fora_do_ar
+        self.chamadas = 0
+    
+    def traduzir(self, texto, idioma_destino):
+        self.chamadas += 1
+        if self.fora_do_ar:
+            raise TraducaoError(f"{self.provedor} fora do ar")
+        return f"[{self.provedor}] {texto}"
+    
+    def obter_provedor(self):
+        return self.provedor
+
+
+class TestDisjuntorCircuito(unittest.TestCase):
+    """Testes para o DisjuntorCircuito."""
+    
+    def setUp(self):
+        self.relogio = RelogioFalso()
+        self.disjuntor = DisjuntorCircuito(janela=10, limite_falhas=0.5, minimo_chamadas=4,
+                                           tempo_aberto=30, relogio=self.relogio)
+    
+    def test_abre_ao_atingir_taxa_de_falhas(self):
+        """Testa se o circuito abre só com chamadas mínimas e taxa atingida."""
+        self.disjuntor.registrar_sucesso()
+        self.disjuntor.registrar_falha()
+        self.disjuntor.registrar_falha()
+        self.assertEqual(self.disjuntor.estado, EstadoCircuito.FECHADO)
+        
+        self.disjuntor.registrar_sucesso()
+        self.assertEqual(self.disjuntor.estado, EstadoCircuito.FECHADO)
+        self.disjuntor.registrar_falha()
+        self.assertEqual(self.disjuntor.estado, EstadoCircuito.ABERTO)
+        self.assertFalse(self.disjuntor.permite())
+    
+    def test_semi_aberto_libera_um_teste(self):
+        """Testa a transição aberto -> semi-aberto -> fechado."""
+        for _ in range(4):
+            self.disjuntor.registrar_falha()
+        self.relogio.agora += 30
+        self.assertEqual(self.disjuntor.estado, EstadoCircuito.SEMI_ABERTO)
+        
+        self.assertTrue(self.disjuntor.permite())
+        self.assertFalse(self.disjuntor.permite())  # só uma chamada de teste
+        self.disjuntor.registrar_sucesso()
+        self.assertEqual(self.disjuntor.estado, EstadoCircuito.FECHADO)
+        self.assertTrue(self.disjuntor.permite())
+    
+    def test_teste_com_falha_reabre(self):
+        """Testa se uma falha no semi-aberto reabre o circuito."""
+        for _ in range(4):
+            self.disjuntor.registrar_falha()
+        self.relogio.agora += 30
+        self.assertTrue(self.disjuntor.permite())
+        self.disjuntor.registrar_falha()
+        
+        self.assertEqual(self.disjuntor.estado, EstadoCircuito.ABERTO)
+        self.assertEqual(self.disjuntor.estatisticas()['aberturas'], 2)
+
+
+class TestPoliticaEWMA(unittest.TestCase):
+    """Testes para a PoliticaEWMA."""
+    
+    def test_ordena_por_custo_esperado(self):
+        """Testa se o provedor mais rápido e confiável vai primeiro."""
+        lento, rapido, instavel = (TradutorControlado(n) for n in ("Lento", "Rapido", "Instavel"))
+        politica = PoliticaEWMA(alfa=0.5, exploracao=0)
+        for _ in range(5):
+            politica.registrar("Lento", 0.4, True)
+            politica.registrar("Rapido", 0.1, True)
+            politica.registrar("Instavel", 0.05, False)
+        
+        self.assertEqual(politica.ordenar([lento, rapido, instavel]), [rapido, lento, instavel])
+    
+    def test_falhas_rapidas_nao_baixam_a_latencia(self):
+        """Testa se só chamadas bem-sucedidas entram na latência EWMA."""
+        politica = PoliticaEWMA(exploracao=0)
+        politica.registrar("Google", 0.3, True)
+        politica.registrar("Google", 0.001, False)
+        self.assertEqual(politica.estatisticas()['provedores']['Google']['latencia_ewma'], 0.3)
+        self.assertGreater(politica.custo("Google"), 0.3)
+    
+    def test_sem_medicoes_mantem_ordem_original(self):
+        """Testa se provedores sem medições mantêm a ordem do construtor."""
+        a, b = TradutorControlado("A"), TradutorControlado("B")
+        self.assertEqual(PoliticaEWMA(exploracao=0).ordenar([a, b]), [a, b])
+
+
+class TestServicoComRoteamento(unittest.TestCase):
+    """Testes para o ServicoTraducao com disjuntores e política."""
+    
+    def test_provedor_fora_do_ar_deixa_de_ser_chamado(self):
+        """Testa se, com o circuito aberto, o Google não é mais chamado."""
+        google = TradutorControlado("Google", fora_do_ar=True)
+        deepl = TradutorControlado("DeepL")
+        servico = ServicoTraducao(
+            [google, deepl],
+            fabrica_disjuntor=lambda: DisjuntorCircuito(minimo_chamadas=3, tempo_aberto=60))
+        
+        for i in range(10):
+            self.assertEqual(servico.traduzir_texto(f"msg {i}", "EN"), f"[DeepL] msg {i}")
+        
+        self.assertEqual(google.chamadas, 3)
+        self.assertEqual(deepl.chamadas, 10)
+        circuitos = servico.obter_estatisticas()['circuitos']
+        self.assertEqual(circuitos['Google']['estado'], 'aberto')
+        self.assertEqual(circuitos['DeepL']['estado'], 'fechado')
+    
+    def test_todos_os_circuitos_abertos_falha_rapido(self):
+        """Testa se a mensagem mantém o original sem chamar provedores."""
+        google = TradutorControlado("Google", fora_do_ar=True)
+        servico = ServicoTraducao(
+            [google], fabrica_disjuntor=lambda: DisjuntorCircuito(minimo_chamadas=1))
+        servico.traduzir_texto("oi", "EN")
+        
+        mensagem = Mensagem("Olá", "PT", "user1", "user2", "EN")
+        self.assertFalse(servico.traduzir_mensagem(mensagem))
+        self.assertEqual(google.chamadas, 1)
+    
+    def test_politica_move_trafego_para_provedor_que_funciona(self):
+        """Testa se a política coloca à frente o provedor que está funcionando."""
+        google = TradutorControlado("Google", fora_do_ar=True)
+        deepl = TradutorControlado("DeepL")
+        servico = ServicoTraducao([google, deepl], politica=PoliticaEWMA(exploracao=0))
+        
+        for i in range(5):
+            servico.traduzir_texto(f"msg {i}", "EN")
+        
+        # Depois da primeira falha o Google vai para o fim da fila
+        self.assertEqual(google.chamadas, 1)
+        self.assertIn('Google', servico.obter_estatisticas()['roteamento']['provedores'])
+    
+    def test_exploracao_percebe_recuperacao(self):
+        """Testa se um provedor que voltou a funcionar recebe tráfego de novo."""
+        google = TradutorControlado("Google", fora_do_ar=True)
+        deepl = TradutorControlado("DeepL")
+        politica = PoliticaEWMA(exploracao=0.1, aleatorio=random.Random(42))
+        servico = ServicoTraducao([google, deepl], politica=politica)
+        
+        for i in range(50):
+            servico.traduzir_texto(f"msg {i}", "EN")
+        google.fora_do_ar = False
+        google.chamadas = 0
+        for i in range(1000):
+            servico.traduzir_texto(f"msg {i}", "EN")
+        
+        self.assertGreater(google.chamadas, 50)
+        self.assertGreater(politica.estatisticas()['provedores']['Google']['sucesso_ewma'], 0.9)
+    
+    def test_lote_respeita_disjuntor(self):
+        """Testa se traduzir_mensagens pula adaptadores com circuito aberto."""
+        google = TradutorControlado("Google", fora_do_ar=True)
+        deepl = TradutorControlado("DeepL")
+        servico = ServicoTraducao(
+            [google, deepl], fabrica_disjuntor=lambda: DisjuntorCircuito(minimo_chamadas=1))
+        servico.traduzir_texto("abre o circuito", "EN")
+        
+        mensagens = [Mensagem(f"Olá {i}", "PT", "user1", "user2", "EN") for i in range(5)]
+        self.assertEqual(servico.traduzir_mensagens(mensagens), 5)
+        self.assertEqual(google.chamadas, 1)
+
+    
+    def test_lote_com_todos_os_itens_falhando_abre_circuito(self):
+        """Testa se falhas item a item em traduzir_lote contam para o disjuntor."""
+        google = TradutorControlado("Google", fora_do_ar=True)
+        deepl = TradutorControlado("DeepL")
+        servico = ServicoTraducao(
+            [google, deepl], fabrica_disjuntor=lambda: DisjuntorCircuito(minimo_chamadas=3))
+        
+        for i in range(5):
+            mensagens = [Mensagem(f"Olá {i}.{j}", "PT", "user1", "user2", "EN") for j in range(4)]
+            self.assertEqual(servico.traduzir_mensagens(mensagens), 4)
+        
+        circuitos = servico.obter_estatisticas()['circuitos']
+        self.assertEqual(circuitos['Google']['estado'], 'aberto')
+        # Só o primeiro lote chegou ao Google; os seguintes foram direto ao DeepL
+        self.assertEqual(google.chamadas, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+"""
+Testes para o serviço de tradução assíncrono do CorreioDigital.
+Valida concorrência, limites por provedor e fallback ordenado.
+"""
+
+import asyncio
+import time
+import unittest
+from src.Estruturais.correio_digital_adapter.correio_digital import (
+    Mensagem,
+    GoogleTranslateAPI,
+    GoogleAdapter,
+    AdaptadorAsync,
+    TradutorSimuladoAsync,
+    ServicoTraducaoAsync
+)
+
+
+def criar_mensagens(quantidade):
+    return [Mensagem(f"Olá {i}", "PT", "user1", "user2", "EN") for i in range(quantidade)]
+
+
+class TestServicoTraducaoAsync(unittest.TestCase):
+    """Testes para o ServicoTraducaoAsync."""
+    
+    def test_traducoes_concorrentes(self):
+        """Testa se 20 traduções de 50ms com concorrência 10 levam ~100ms."""
+        provedor = TradutorSimuladoAsync("Rapido", latencia=0.05)
+        servico = ServicoTraducaoAsync([provedor], max_concorrencia=10)
+        
+        inicio = time.perf_counter()
+        resultados = asyncio.run(servico.atraduzir_muitas(criar_mensagens(20)))
+        duracao = time.perf_counter() - inicio
+        
+        self.assertEqual(resultados, [True] * 20)
+        self.assertEqual(provedor.pico_concorrencia, 10)
+        self.assertLess(duracao, 0.5)
+    
+    def test_limite_por_provedor(self):
+        """Testa se o limite do provedor prevalece sobre o global."""
+        provedor = TradutorSimuladoAsync("Limitado", latencia=0.01)
+        servico = ServicoTraducaoAsync([provedor], max_concorrencia=10,
+                                       limites_por_provedor={"Limitado": 3})
+        
+        asyncio.run(servico.atraduzir_muitas(criar_mensagens(12)))
+        self.assertEqual(provedor.pico_concorrencia, 3)
+    
+    def test_varios_event_loops(self):
+        """Testa se o mesmo serviço funciona em event loops diferentes."""
+        provedor = TradutorSimuladoAsync("Google", latencia=0.01)
+        servico = ServicoTraducaoAsync([provedor], max_concorrencia=2,
+                                       limites_por_provedor={"Google": 1})
+        
+        for _ in range(2):
+            resultados = asyncio.run(servico.atraduzir_muitas(criar_mensagens(10)))
+            self.assertEqual(resultados, [True] * 10)
+        self.assertEqual(provedor.pico_concorrencia, 1)
+    
+    def test_fallback_ordenado(self):
+        """Testa se o segundo provedor é usado quando o primeiro falha."""
+        falho = TradutorSimuladoAsync("Falho", latencia=0, taxa_falha=1.0)
+        reserva = TradutorSimuladoAsync("Reserva", latencia=0)
+        servico = ServicoTraducaoAsync([falho, reserva])
+        mensagens = criar_mensagens(3)
+        
+        self.assertEqual(asyncio.run(servico.atraduzir_muitas(mensagens)), [True] * 3)
+        self.assertTrue(all("Reserva" in m.traducao for m in mensagens))
+        
+        stats = servico.obter_estatisticas()
+        self.assertEqual(stats['falhas_por_provedor'], {"Falho": 3, "Reserva": 0})
+        self.assertEqual(stats['mensagens_traduzidas'], 3)
+    
+    def test_todos_falham(self):
+        """Testa se a mensagem mantém o texto original quando todos falham."""
+        servico = ServicoTraducaoAsync([TradutorSimuladoAsync(latencia=0, taxa_falha=1.0)])
+        mensagem = criar_mensagens(1)[0]
+        
+        self.assertFalse(asyncio.run(servico.atraduzir_mensagem(mensagem)))
+        self.assertEqual(mensagem.obter_texto_exibicao(), mensagem.conteudo)
+    
+    def test_regras_de_idioma(self):
+        """Testa mensagens sem destino e com origem igual ao destino."""
+        servico = ServicoTraducaoAsync([TradutorSimuladoAsync(latencia=0)])
+        sem_destino = Mensagem("Olá", "PT", "user1", "user2")
+        mesmo_idioma = Mensagem("Hello", "EN", "user1", "user2", "EN")
+        
+        resultados = asyncio.run(servico.atraduzir_muitas([sem_destino, mesmo_idioma]))
+        self.assertEqual(resultados, [False, True])
+        self.assertEqual(mesmo_idioma.traducao, "Hello")
+    
+    def test_adaptador_sincrono_envolvido(self):
+        """Testa se adaptadores síncronos funcionam via AdaptadorAsync."""
+        servico = ServicoTraducaoAsync([AdaptadorAsync(GoogleAdapter(GoogleTranslateAPI()))])
+        resultado = asyncio.run(servico.atraduzir_texto("Bom dia", "EN"))
+        self.assertIn("Google", resultado)
+
+
+class GoogleLento(GoogleAdapter):
+    """Adaptador síncrono que demora a responder."""
+    
+    def traduzir(self, texto, idioma_destino):
+        time.sleep(0.3)
+        return super().traduzir(texto, idioma_destino)
+
+
+class TestHedging(unittest.TestCase):
+    """Testes para o hedging entre provedores."""
+    
+    def test_chamada_em_thread_e_abandonada_nao_cancelada(self):
+        """Testa se o perdedor síncrono (em thread) conta como abandonado."""
+        lento = AdaptadorAsync(GoogleLento(GoogleTranslateAPI()))
+        rapido = TradutorSimuladoAsync("Rapido", latencia=0.01)
+        servico = ServicoTraducaoAsync([lento, rapido], hedging=True, atraso_hedge=0.05)
+        
+        resultado = asyncio.run(servico.atraduzir_texto("Olá", "EN"))
+        self.assertIn("Rapido", resultado)
+        hedging = servico.obter_estatisticas()['hedging']
+        self.assertEqual((hedging['canceladas'], hedging['abandonadas']), (0, 1))
+    
+    def test_p95_recalculado_a_cada_lote_de_amostras(self):
+        """Testa se o p95 fica em cache até RECALCULO_P95 amostras novas."""
+        provedor = TradutorSimuladoAsync("Primario", latencia=0)
+        servico = ServicoTraducaoAsync([provedor], hedging=True)
+        
+        def amostrar(latencia, n):
+            for _ in range(n):
+                servico._registrar_latencia("Primario", latencia)
+        
+        amostrar(0.01, ServicoTraducaoAsync.AMOSTRAS_MINIMAS)
+        self.assertEqual(servico._espera_hedge(provedor), 0.01)
+        amostrar(1.0, ServicoTraducaoAsync.RECALCULO_P95 - 1)
+        self.assertEqual(servico._espera_hedge(provedor), 0.01)
+        amostrar(1.0, 1)
+        self.assertEqual(servico._espera_hedge(provedor), 1.0)
+    
+    def test_hedge_vence_provedor_lento_e_cancela(self):
+        """Testa se o segundo provedor é disparado após o atraso e vence."""
+        lento = TradutorSimuladoAsync("Lento", latencia=1.0)
+        rapido = TradutorSimuladoAsync("Rapido", latencia=0.01)
+        servico = ServicoTraducaoAsync([lento, rapido], hedging=True, atraso_hedge=0.05)
+        
+        inicio = time.perf_counter()
+        resultado = asyncio.run(servico.atraduzir_texto("Olá", "EN"))
+        duracao = time.perf_counter() - inicio
+        
+        self.assertIn("Rapido", resultado)
+        self.assertLess(duracao, 0.5)
+        self.assertEqual(lento.em_andamento, 0)  # chamada perdedora cancelada
+        
+        hedging = servico.obter_estatisticas()['hedging']
+        self.assertEqual(hedging['taxa_hedge'], 1.0)
+        self.assertEqual(hedging['canceladas'], 1)
+        self.assertEqual(hedging['vitorias_por_provedor'], {"Lento": 0, "Rapido": 1})
+    
+    def test_sem_hedge_quando_primario_responde_rapido(self):
+        """Testa se o próximo provedor não é chamado abaixo do atraso."""
+        primario = TradutorSimuladoAsync("Primario", latencia=0.01)
+        reserva = TradutorSimuladoAsync("Reserva", latencia=0.01)
+        servico = ServicoTraducaoAsync([primario, reserva], hedging=True, atraso_hedge=0.2)
+        
+        asyncio.run(servico.atraduzir_muitas(criar_mensagens(5)))
+        self.assertEqual(reserva.chamadas, 0)
+        self.assertEqual(servico.obter_estatisticas()['hedging']['taxa_hedge'], 0.0)
+    
+    def test_atraso_pelo_p95_observado(self):
+        """Testa se, sem atraso fixo, o hedge usa o p95 do provedor."""
+        latencias = iter([0.01] * ServicoTraducaoAsync.AMOSTRAS_MINIMAS + [1.0])
+        primario = TradutorSimuladoAsync("Primario", latencia=lambda: next(latencias))
+        reserva = TradutorSimuladoAsync("Reserva", latencia=0.01)
+        servico = ServicoTraducaoAsync([primario, reserva], hedging=True)
+        
+        async def cenario():
+            for _ in range(ServicoTraducaoAsync.AMOSTRAS_MINIMAS):
+                await servico.atraduzir_texto("Olá", "EN")
+            inicio = time.perf_counter()
+            resultado = await servico.atraduzir_texto("Olá", "EN")
+            return resultado, time.perf_counter() - inicio
+        
+        resultado, duracao = asyncio.run(cenario())
+        self.assertIn("Reserva", resultado)
+        self.assertLess(duracao, 0.5)
+    
+    def test_falha_do_hedge_dispara_o_proximo_sem_esperar(self):
+        """Testa se a falha de um hedge dispara o próximo mesmo com o primário em andamento."""
+        lento = TradutorSimuladoAsync("Lento", latencia=1.0)
+        falho = TradutorSimuladoAsync("Falho", latencia=0, taxa_falha=1.0)
+        reserva = TradutorSimuladoAsync("Reserva", latencia=0.01)
+        servico = ServicoTraducaoAsync([lento, falho, reserva], hedging=True, atraso_hedge=0.2)
+        
+        inicio = time.perf_counter()
+        resultado = asyncio.run(servico.atraduzir_texto("Olá", "EN"))
+        duracao = time.perf_counter() - inicio
+        
+        self.assertIn("Reserva", resultado)
+        self.assertLess(duracao, 0.35)
+        # A chamada cancelada entra no histórico com o tempo que já levava
+        self.assertGreaterEqual(min(servico._latencias["Lento"]), 0.2)
+    
+    def test_latencia_nao_inclui_espera_pelo_semaforo(self):
+        """Testa se a espera pelo limite do provedor fica fora da latência medida."""
+        provedor = TradutorSimuladoAsync("Unico", latencia=0.05)
+        servico = ServicoTraducaoAsync([provedor], limites_por_provedor={"Unico": 1})
+        
+        asyncio.run(servico.atraduzir_muitas(criar_mensagens(4)))
+        self.assertEqual(provedor.pico_concorrencia, 1)
+        self.assertLess(max(servico._latencias["Unico"]), 0.1)
+    
+    def test_falha_com_hedge_mantem_fallback(self):
+        """Testa se uma falha dispara o próximo provedor imediatamente."""
+        falho = TradutorSimuladoAsync("Falho", latencia=0, taxa_falha=1.0)
+        reserva = TradutorSimuladoAsync("Reserva", latencia=0)
+        servico = ServicoTraducaoAsync([falho, reserva], hedging=True, atraso_hedge=5)
+        
+        resultado = asyncio.run(servico.atraduzir_texto("Olá", "EN"))
+        self.assertIn("Reserva", resultado)
+        self.assertEqual(servico.obter_estatisticas()['hedging']['com_hedge'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
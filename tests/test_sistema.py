@@ -2,6 +2,7 @@
 
 import unittest
 import io
+import gc
 from contextlib import redirect_stdout
 
 # Os testes estão fora de 'src', então importamos de 'src.correio_digital'
@@ -11,6 +12,10 @@ from src.Comportamentais.correio_digital_observer.correio_digital import (
     NotificadorEmail, 
     NotificadorMobile
 )
+from src.Comportamentais.correio_digital_observer import correio_digital
+
+# Todos os módulos do pacote registram log abaixo deste logger
+LOGGER = correio_digital.__name__
 
 class TestObserverPatternCorreioDigital(unittest.TestCase):
 
@@ -31,10 +36,10 @@ class TestObserverPatternCorreioDigital(unittest.TestCase):
         self.sistema.attach(self.obs_email)
         self.sistema.attach(self.obs_mobile)
 
-        # Usamos redirect_stdout para capturar as saídas do 'print'
-        with io.StringIO() as buf, redirect_stdout(buf):
+        # Usamos assertLogs para capturar as mensagens de log
+        with self.assertLogs(LOGGER, level="DEBUG") as logs:
             self.sistema.novaMensagem("remetente1", "dest1", "Olá mundo")
-            output = buf.getvalue()
+            output = "\n".join(logs.output)
 
         # Verifica se a saída capturada contém as strings de cada notificador
         self.assertIn("[WEB] Notificação Push", output)
@@ -53,9 +58,9 @@ class TestObserverPatternCorreioDigital(unittest.TestCase):
         # Desanexa o de e-mail
         self.sistema.detach(self.obs_email)
 
-        with io.StringIO() as buf, redirect_stdout(buf):
+        with self.assertLogs(LOGGER, level="DEBUG") as logs:
             self.sistema.novaMensagem("remetente2", "dest2", "Teste sem email")
-            output = buf.getvalue()
+            output = "\n".join(logs.output)
 
         # Verifica se WEB e MOBILE receberam, mas EMAIL não
         self.assertIn("[WEB] Notificação Push", output)
@@ -67,9 +72,9 @@ class TestObserverPatternCorreioDigital(unittest.TestCase):
         """
         Testa se o sistema não quebra ao notificar sem observadores.
         """
-        with io.StringIO() as buf, redirect_stdout(buf):
+        with self.assertLogs(LOGGER, level="DEBUG") as logs:
             self.sistema.novaMensagem("remetente3", "dest3", "Ninguém ouvindo")
-            output = buf.getvalue()
+            output = "\n".join(logs.output)
 
             # O sistema deve notificar 0 observadores sem quebrar
             self.assertIn("Notificando 0 observadores", output)
@@ -84,12 +89,140 @@ class TestObserverPatternCorreioDigital(unittest.TestCase):
         self.sistema.attach(self.obs_web)
         
         # Tenta desanexar o 'obs_email' que nunca foi anexado
-        with io.StringIO() as buf, redirect_stdout(buf):
+        with self.assertLogs(LOGGER, level="DEBUG") as logs:
             self.sistema.detach(self.obs_email)
-            output = buf.getvalue()
+            output = "\n".join(logs.output)
         
         # O sistema deve imprimir uma mensagem de aviso
         self.assertIn(f"{self.obs_email.__class__.__name__} não está na lista", output)
 
+    def test_novas_mensagens_em_lote(self):
+        """
+        Testa a ingestão em lote: todas as mensagens são armazenadas e cada
+        observador recebe os lotes via update_batch.
+        """
+        self.sistema.attach(self.obs_web)
+        self.sistema.attach(self.obs_email)
+
+        mensagens = [(f"rem{i}", f"dest{i % 2}", f"conteudo {i}") for i in range(5)]
+        with self.assertLogs(LOGGER, level="DEBUG") as logs:
+            total = self.sistema.novasMensagens(mensagens, tamanho_lote=2)
+            output = "\n".join(logs.output)
+
+        self.assertEqual(total, 5)
+        self.assertEqual(len(self.sistema._mensagens), 5)
+        # update_batch padrão do NotificadorWeb chama update por mensagem
+        self.assertEqual(output.count("[WEB] Notificação Push"), 5)
+        # NotificadorEmail envia um único e-mail em lote por notificação
+        self.assertEqual(output.count("[EMAIL] Enviando lote"), 3)
+        self.assertNotIn("[EMAIL] Enviando e-mail para", output)
+
+    def test_assinatura_por_destinatario(self):
+        """
+        Testa se observadores anexados a um destinatário só recebem as
+        mensagens endereçadas a ele, enquanto curingas recebem todas.
+        """
+        self.sistema.attach(self.obs_web)                           # curinga
+        self.sistema.attach(self.obs_mobile, destinatario="bob")
+
+        with self.assertLogs(LOGGER, level="DEBUG") as logs:
+            self.sistema.novaMensagem("alice", "carol", "Oi Carol")
+            output_carol = "\n".join(logs.output)
+
+        with self.assertLogs(LOGGER, level="DEBUG") as logs:
+            self.sistema.novaMensagem("alice", "bob", "Oi Bob")
+            output_bob = "\n".join(logs.output)
+
+        self.assertIn("Notificando 1 observadores", output_carol)
+        self.assertNotIn("[MOBILE]", output_carol)
+        self.assertIn("Notificando 2 observadores", output_bob)
+        self.assertIn("[MOBILE] Notificação (Pling!)", output_bob)
+
+    def test_detach_remove_assinaturas_por_destinatario(self):
+        """
+        Testa se detach remove todas as assinaturas de um observador.
+        """
+        self.sistema.attach(self.obs_mobile, destinatario="bob")
+        self.sistema.attach(self.obs_mobile, destinatario="carol")
+        self.sistema.detach(self.obs_mobile)
+
+        with self.assertLogs(LOGGER, level="DEBUG") as logs:
+            self.sistema.novaMensagem("alice", "bob", "Oi Bob")
+            self.sistema.novaMensagem("alice", "carol", "Oi Carol")
+            output = "\n".join(logs.output)
+
+        self.assertNotIn("[MOBILE]", output)
+
+    def test_observador_descartado_sem_detach_e_removido(self):
+        """
+        Testa se uma sessão abandonada (sem detach) deixa de ser notificada
+        e não é mantida viva pelo sistema.
+        """
+        self.sistema.attach(self.obs_web)
+        sessao = NotificadorMobile()
+        self.sistema.attach(sessao, destinatario="bob")
+
+        del sessao
+        gc.collect()
+
+        with self.assertLogs(LOGGER, level="DEBUG") as logs:
+            self.sistema.novaMensagem("alice", "bob", "Oi Bob")
+            output = "\n".join(logs.output)
+
+        self.assertIn("Notificando 1 observadores", output)
+        self.assertNotIn("[MOBILE]", output)
+        self.assertNotIn("bob", self.sistema._por_destinatario)
+
+    def test_detach_durante_notify_nao_afeta_entrega_corrente(self):
+        """
+        Testa se o notify itera sobre um snapshot estável dos observadores.
+        """
+        sistema = self.sistema
+        obs_web = self.obs_web
+
+        class ObservadorQueDesanexa(NotificadorEmail):
+            def update(self, mensagem):
+                sistema.detach(obs_web)
+                super().update(mensagem)
+
+        primeiro = ObservadorQueDesanexa()
+        sistema.attach(primeiro)
+        sistema.attach(obs_web)
+
+        with self.assertLogs(LOGGER, level="DEBUG") as logs:
+            sistema.novaMensagem("alice", "bob", "Primeira")
+            sistema.novaMensagem("alice", "bob", "Segunda")
+            output = "\n".join(logs.output)
+
+        # Recebe a primeira (snapshot) mas não a segunda
+        self.assertEqual(output.count("[WEB] Notificação Push"), 1)
+
+    def test_metricas(self):
+        """
+        Testa os contadores e o histograma de latência por classe de observador.
+        """
+        self.sistema.attach(self.obs_web)
+        self.sistema.attach(self.obs_email)
+
+        self.sistema.novaMensagem("alice", "bob", "Oi")
+        self.sistema.novaMensagem("alice", "bob", "Tudo bem?")
+
+        metricas = self.sistema.metricas()
+        self.assertEqual(metricas['mensagens_recebidas'], 2)
+        self.assertEqual(metricas['notificacoes_enviadas'], 4)
+        self.assertEqual(metricas['notificacoes_falhas'], 0)
+        latencia_web = metricas['latencia_por_observador']['NotificadorWeb']
+        self.assertEqual(latencia_web['contagem'], 2)
+        self.assertLessEqual(latencia_web['p50_ms'], latencia_web['p99_ms'])
+
+    def test_notificacao_sem_log_habilitado_nao_escreve_nada(self):
+        """
+        Testa que, com o log desabilitado, o caminho quente não produz saída.
+        """
+        self.sistema.attach(self.obs_web)
+        with io.StringIO() as buf, redirect_stdout(buf):
+            self.sistema.novaMensagem("alice", "bob", "Oi")
+            self.assertEqual(buf.getvalue(), "")
+
 if __name__ == "__main__":
     unittest.main()
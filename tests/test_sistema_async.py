@@ -0,0 +1,101 @@
+# tests/test_sistema_async.py
+
+import asyncio
+import time
+import unittest
+
+from src.Comportamentais.correio_digital_observer.correio_digital import (
+    AsyncObserver,
+    SistemaDeMensagensAsync,
+    NotificadorWeb
+)
+from src.Comportamentais.correio_digital_observer import correio_digital
+
+LOGGER = correio_digital.__name__
+
+class ObservadorLento(AsyncObserver):
+    def __init__(self, atraso: float):
+        self.atraso = atraso
+        self.recebidas = []
+
+    async def update(self, mensagem) -> None:
+        await asyncio.sleep(self.atraso)
+        self.recebidas.append(mensagem)
+
+class ObservadorQuebrado(AsyncObserver):
+    async def update(self, mensagem) -> None:
+        raise ConnectionError("canal fora do ar")
+
+class TestSistemaDeMensagensAsync(unittest.TestCase):
+
+    def setUp(self):
+        self.sistema = SistemaDeMensagensAsync()
+
+    def test_notifica_observadores_concorrentemente(self):
+        """
+        Três observadores de 0.1s devem ser notificados em ~0.1s, não 0.3s.
+        """
+        observadores = [ObservadorLento(0.1) for _ in range(3)]
+        for obs in observadores:
+            self.sistema.attach(obs)
+
+        inicio = time.perf_counter()
+        resultado = asyncio.run(self.sistema.anovaMensagem("a", "b", "oi"))
+        duracao = time.perf_counter() - inicio
+
+        self.assertEqual(resultado, [True, True, True])
+        self.assertLess(duracao, 0.25)
+        for obs in observadores:
+            self.assertEqual(len(obs.recebidas), 1)
+
+    def test_timeout_por_observador_nao_atrasa_os_demais(self):
+        """
+        Um observador lento estoura o próprio timeout sem impedir a entrega
+        para os outros.
+        """
+        rapido = ObservadorLento(0)
+        lento = ObservadorLento(5)
+        self.sistema.attach(rapido)
+        self.sistema.attach(lento, timeout=0.05)
+
+        with self.assertLogs(LOGGER, level="DEBUG") as logs:
+            resultado = asyncio.run(self.sistema.anovaMensagem("a", "b", "oi"))
+            output = "\n".join(logs.output)
+
+        self.assertEqual(resultado, [True, False])
+        self.assertEqual(len(rapido.recebidas), 1)
+        self.assertIn("excedeu o tempo limite", output)
+
+    def test_excecao_de_um_observador_nao_afeta_os_demais(self):
+        """
+        Uma exceção no update vira False para aquele observador e é contada
+        nas métricas, sem interromper a entrega aos outros.
+        """
+        rapido = ObservadorLento(0)
+        self.sistema.attach(ObservadorQuebrado())
+        self.sistema.attach(rapido)
+
+        with self.assertLogs(LOGGER, level="ERROR") as logs:
+            resultado = asyncio.run(self.sistema.anovaMensagem("a", "b", "oi"))
+
+        self.assertEqual(resultado, [False, True])
+        self.assertEqual(len(rapido.recebidas), 1)
+        self.assertIn("Falha ao notificar ObservadorQuebrado", "\n".join(logs.output))
+        metricas = self.sistema.metricas()
+        self.assertEqual((metricas['notificacoes_enviadas'], metricas['notificacoes_falhas']), (1, 1))
+
+    def test_aceita_observadores_sincronos(self):
+        """
+        Observadores síncronos continuam funcionando no sistema assíncrono.
+        """
+        self.sistema.attach(NotificadorWeb())
+
+        with self.assertLogs(LOGGER, level="DEBUG") as logs:
+            asyncio.run(self.sistema.anovaMensagem("remetente", "dest", "Olá mundo"))
+            output = "\n".join(logs.output)
+
+        self.assertIn("[WEB] Notificação Push", output)
+        self.assertIn("Notificando 1 observadores", output)
+
+if __name__ == "__main__":
+    unittest.main()